@@ -1,19 +1,23 @@
 # py modules
+from collections import OrderedDict
+from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
 from typing import Optional
-from fastapi import Depends, HTTPException, status, Cookie, Response
+from fastapi import HTTPException, status, Cookie, Request, Response
 from jose import JWTError, jwt
 from pydantic import BaseModel
-from sqlmodel import Session
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 import os
 
-# helpers
-from .db import get_session
-
 # Secret key for JWT
 SECRET_KEY = os.getenv("SECRET_KEY", "SUPER_SECRET_KEY_CHANGE_ME")
 ALGORITHM = os.getenv("ALGORITHM", "HS256")
 ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "30"))
+# Re-issue the token only once this fraction of its lifetime has elapsed
+ACCESS_TOKEN_REFRESH_THRESHOLD = float(os.getenv("ACCESS_TOKEN_REFRESH_THRESHOLD", "0.5"))
+# Verified tokens cached per process, so repeat requests skip the signature check
+TOKEN_CACHE_SIZE = int(os.getenv("TOKEN_CACHE_SIZE", "1024"))
 
 # Token payload schema
 class TokenData(BaseModel):
@@ -21,38 +25,105 @@ class TokenData(BaseModel):
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     to_encode = data.copy()
-    expire = datetime.now(timezone.utc) + (expires_delta or timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES))
-    to_encode.update({"exp": expire})
+    issued_at = datetime.now(timezone.utc)
+    expire = issued_at + (expires_delta or timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES))
+    to_encode.update({"exp": expire, "iat": issued_at})
     return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
 
+@dataclass(frozen=True)
+class _DecodedToken:
+    user_id: str
+    issued_at: float
+    expires_at: float
+
+_token_cache: OrderedDict[str, _DecodedToken] = OrderedDict()
+
+def _decode_token(token: str) -> _DecodedToken:
+    """
+    Verify and decode a token, caching the result in a small LRU keyed by the token.
+    Expiry is re-checked on every hit. Raises JWTError for invalid or expired tokens.
+    """
+    now = datetime.now(timezone.utc).timestamp()
+    cached = _token_cache.get(token)
+    if cached is not None:
+        if cached.expires_at <= now:
+            _token_cache.pop(token, None)
+            raise JWTError("Signature has expired.")
+        _token_cache.move_to_end(token)
+        return cached
+
+    payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+    user_id = payload.get("sub")
+    if not user_id:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token payload")
+
+    expires_at = float(payload["exp"])
+    # Tokens issued before `iat` was added are assumed to have the default lifetime
+    issued_at = float(payload.get("iat", expires_at - ACCESS_TOKEN_EXPIRE_MINUTES * 60))
+    decoded = _DecodedToken(user_id=str(user_id), issued_at=issued_at, expires_at=expires_at)
+
+    _token_cache[token] = decoded
+    while len(_token_cache) > TOKEN_CACHE_SIZE:
+        _token_cache.popitem(last=False)
+    return decoded
+
+def _needs_refresh(decoded: _DecodedToken) -> bool:
+    lifetime = decoded.expires_at - decoded.issued_at
+    elapsed = datetime.now(timezone.utc).timestamp() - decoded.issued_at
+    return lifetime <= 0 or elapsed >= lifetime * ACCESS_TOKEN_REFRESH_THRESHOLD
+
+# Key in the request state holding the refreshed token, or "" to delete the cookie
+SESSION_COOKIE_STATE_KEY = "access_token_cookie"
+
 # Dependency to get current user
-def get_current_user(response: Response, token: str = Cookie(None, alias="access_token"), session: Session = Depends(get_session)) -> TokenData:
+# Async so it runs on the event loop instead of taking a threadpool slot per request
+async def get_current_user(request: Request, token: str = Cookie(None, alias="access_token")) -> TokenData:
     if not token:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Unauthorized")
     try:
+        decoded = _decode_token(token)
 
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        user_id: str = payload.get("sub")
-
-        if not user_id:
-            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token payload")
-
-        new_token = create_access_token(data={
-            "sub": str(user_id),
-        })
-        response.set_cookie(
-            key="access_token",
-            value=new_token,
-            httponly=True,
-            secure=True,
-            samesite="strict",
-        )
-        return TokenData(user_id=user_id)
+        # Sliding session: only re-sign once the token is far enough into its lifetime.
+        # SessionCookieMiddleware sets the cookie, handlers may return their own Response.
+        if _needs_refresh(decoded):
+            request.state.access_token_cookie = create_access_token(data={
+                "sub": decoded.user_id,
+            })
+        return TokenData(user_id=decoded.user_id)
     except JWTError as e:
-        response.delete_cookie(
-            key="access_token",
-            path="/",
-            domain=None,
-        )
+        request.state.access_token_cookie = ""
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
 
+
+class SessionCookieMiddleware:
+    """
+    Writes the access token cookie get_current_user refreshed or invalidated onto the response.
+    Headers set on a dependency's injected Response are dropped when a handler returns a
+    Response itself (FastJSONResponse, 304s) or raises, this covers every response.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        # Shared with request.state of the route, which sees a copy of the scope
+        state = scope.setdefault("state", {})
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start" and SESSION_COOKIE_STATE_KEY in state:
+                cookie = Response()
+                token = state.pop(SESSION_COOKIE_STATE_KEY)
+                if token:
+                    cookie.set_cookie(key="access_token", value=token, httponly=True, secure=True, samesite="strict")
+                else:
+                    cookie.delete_cookie(key="access_token", path="/", domain=None)
+                headers = MutableHeaders(scope=message)
+                for value in cookie.headers.getlist("set-cookie"):
+                    headers.append("set-cookie", value)
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
@@ -0,0 +1,166 @@
+from collections import OrderedDict
+from typing import Hashable, Optional
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+import asyncio
+import gzip
+import os
+
+try:
+    import brotli
+except ImportError:  # brotli is optional, gzip is always available
+    brotli = None
+
+# Bodies smaller than this aren't worth the CPU or the extra header
+COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))
+# Levels for per-request compression; precompressed payloads use the maximum once
+GZIP_LEVEL = int(os.getenv("COMPRESSION_GZIP_LEVEL", "6"))
+BROTLI_QUALITY = int(os.getenv("COMPRESSION_BROTLI_QUALITY", "5"))
+# Bodies above this are compressed on a thread so the event loop keeps serving other requests
+COMPRESSION_THREAD_THRESHOLD = 256 * 1024
+
+COMPRESSIBLE_TYPES = ("application/json", "text/markdown", "text/plain", "text/html", "text/css", "application/javascript")
+
+def choose_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    """
+    Pick the best encoding the client accepts: br when brotli is installed, then gzip.
+    Honours q=0 to refuse an encoding.
+    """
+    if not accept_encoding:
+        return None
+    accepted = {}
+    for part in accept_encoding.lower().split(","):
+        name, _, params = part.strip().partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[name.strip()] = quality
+
+    wildcard = accepted.get("*", 0.0)
+    for encoding in (("br", "gzip") if brotli is not None else ("gzip",)):
+        if accepted.get(encoding, wildcard) > 0:
+            return encoding
+    return None
+
+def compress(body: bytes, encoding: str, maximum: bool = False) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=11 if maximum else BROTLI_QUALITY, mode=brotli.MODE_TEXT)
+    return gzip.compress(body, compresslevel=9 if maximum else GZIP_LEVEL)
+
+def encoded_etag(etag: str, encoding: Optional[str]) -> str:
+    """
+    ETag of one encoding of a resource. Each encoding is a different byte sequence, so the gzip
+    and br variants need their own strong validator: "abc" becomes "abc-gzip".
+    """
+    if not encoding:
+        return etag
+    return f'{etag[:-1]}-{encoding}"'
+
+def weak_etag(etag: str) -> str:
+    """Weak form of an ETag, still matched by If-None-Match but no longer claiming byte equality"""
+    return etag if etag.startswith("W/") else f"W/{etag}"
+
+async def compress_async(body: bytes, encoding: str, maximum: bool = False) -> bytes:
+    if len(body) >= COMPRESSION_THREAD_THRESHOLD:
+        return await asyncio.to_thread(compress, body, encoding, maximum)
+    return compress(body, encoding, maximum)
+
+
+class CompressionMiddleware:
+    """
+    Compresses complete (single message) responses with br or gzip when they are large enough
+    and of a text type. Streaming responses such as SSE and bodies that already carry a
+    Content-Encoding pass through untouched. A strong ETag becomes weak when the body is
+    compressed (and on the 304s revalidating it), the handler's identity ETag still matches
+    on revalidation. ETags already specific to the encoding are left alone.
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: int = COMPRESSION_MIN_SIZE):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = choose_encoding(Headers(scope=scope).get("accept-encoding"))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message: Optional[Message] = None
+        passthrough = False
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal start_message, passthrough
+            if message["type"] == "http.response.start":
+                start_message = message
+                if message["status"] == 304:
+                    # Validates the stored copy, which was compressed and got the weak ETag
+                    headers = MutableHeaders(raw=message["headers"])
+                    if "etag" in headers and not headers["etag"].endswith(f'-{encoding}"'):
+                        headers["ETag"] = weak_etag(headers["etag"])
+                return
+            if message["type"] != "http.response.body" or passthrough:
+                await send(message)
+                return
+
+            passthrough = True
+            headers = MutableHeaders(raw=start_message["headers"])
+            body = message.get("body", b"")
+            content_type = headers.get("content-type", "")
+            if (
+                message.get("more_body", False)
+                or len(body) < self.minimum_size
+                or "content-encoding" in headers
+                or not content_type.startswith(COMPRESSIBLE_TYPES)
+            ):
+                await send(start_message)
+                await send(message)
+                return
+
+            compressed = await compress_async(body, encoding)
+            headers["Content-Encoding"] = encoding
+            headers["Content-Length"] = str(len(compressed))
+            if "etag" in headers:
+                headers["ETag"] = weak_etag(headers["etag"])
+            headers.add_vary_header("Accept-Encoding")
+            await send(start_message)
+            await send({"type": "http.response.body", "body": compressed})
+
+        await self.app(scope, receive, send_wrapper)
+
+
+class PrecompressedCache:
+    """
+    LRU of rendered, already compressed bodies of immutable payloads, bounded by total size.
+    Keys should include the payload's version (e.g. its ETag) and the encoding.
+    """
+
+    def __init__(self, max_bytes: int):
+        self._max_bytes = max_bytes
+        self._size = 0
+        self._entries: OrderedDict[Hashable, bytes] = OrderedDict()
+
+    def get(self, key: Hashable) -> Optional[bytes]:
+        body = self._entries.get(key)
+        if body is not None:
+            self._entries.move_to_end(key)
+        return body
+
+    def put(self, key: Hashable, body: bytes) -> None:
+        if len(body) > self._max_bytes:
+            return
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self._size -= len(previous)
+        self._entries[key] = body
+        self._size += len(body)
+        while self._size > self._max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._size -= len(evicted)
@@ -1,5 +1,16 @@
-from sqlmodel import SQLModel, create_engine, Session
+from sqlmodel import create_engine, Session
+from sqlmodel.ext.asyncio.session import AsyncSession
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import create_async_engine
+import logging
 import os
+import random
+import time
+
+from .db_settings import DBSettings
+
+logger = logging.getLogger(__name__)
 
 DB_HOST = os.getenv("DB_HOST", "localhost")
 DB_PORT = os.getenv("DB_PORT", "5432")
@@ -7,13 +18,63 @@ DB_NAME = os.getenv("DB_NAME", "blox")
 DB_USER = os.getenv("DB_USER", "blox_user")
 DB_PASSWORD = os.getenv("DB_PASSWORD", "blox_password")
 
-DB_URL = f"postgresql+psycopg2://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
+# psycopg 3 serves both the sync and the async engine
+DB_URL = f"postgresql+psycopg://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
+
+# Pool and logging settings for this process (DB_PROCESS_ROLE=api|worker)
+db_settings = DBSettings.from_env()
+
+# Sync engine, only for migrations and the startup schema check
+engine = create_engine(DB_URL, **db_settings.engine_kwargs())
+
+# Async engine, used by async routes and temporal activities so the event loop never blocks on postgres
+async_engine = create_async_engine(DB_URL, **db_settings.engine_kwargs())
+
+def _install_query_logging(target: Engine, settings: DBSettings) -> None:
+    """
+    Log statements slower than `slow_query_ms`, plus a `query_log_sample_rate` fraction of the rest,
+    instead of echoing every statement.
+    """
+    @event.listens_for(target, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start_time", []).append(time.perf_counter())
 
-engine = create_engine(DB_URL, echo=True)
+    @event.listens_for(target, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        elapsed_ms = (time.perf_counter() - conn.info["query_start_time"].pop()) * 1000
+        if elapsed_ms >= settings.slow_query_ms:
+            logger.warning(
+                f"Slow query ({elapsed_ms:.1f} ms): {statement}",
+                extra={"db_role": settings.role, "elapsed_ms": elapsed_ms},
+            )
+        elif settings.query_log_sample_rate and random.random() < settings.query_log_sample_rate:
+            logger.info(
+                f"Sampled query ({elapsed_ms:.1f} ms): {statement}",
+                extra={"db_role": settings.role, "elapsed_ms": elapsed_ms},
+            )
+
+_install_query_logging(engine, db_settings)
+_install_query_logging(async_engine.sync_engine, db_settings)
 
 def init_db():
-    SQLModel.metadata.create_all(engine)
+    """
+    Verify the schema version. The schema itself is managed by `python -m common.migrations upgrade`,
+    or applied here when DB_MIGRATE_ON_STARTUP is set (local development).
+    """
+    from .migrations import check_schema_version, upgrade
+
+    if os.getenv("DB_MIGRATE_ON_STARTUP", "false").lower() in ("1", "true", "yes", "on"):
+        upgrade(engine)
+    check_schema_version(engine)
 
 def get_session():
     with Session(engine) as session:
         yield session
+
+def async_session() -> AsyncSession:
+    # Objects stay usable after commit, async sessions can't lazily refresh them
+    return AsyncSession(async_engine, expire_on_commit=False)
+
+async def get_async_session():
+    async with async_session() as session:
+        yield session
@@ -0,0 +1,71 @@
+from dataclasses import dataclass
+import os
+
+# The API serves many short requests while the worker runs few, longer activities
+ROLE_DEFAULTS = {
+    "api": {"pool_size": 10, "max_overflow": 20, "statement_timeout_ms": 15000},
+    "worker": {"pool_size": 5, "max_overflow": 5, "statement_timeout_ms": 60000},
+}
+
+def _env(role: str, name: str, default: str) -> str:
+    """Read `<ROLE>_<NAME>` first, then `<NAME>`, so each process can override shared settings."""
+    return os.getenv(f"{role.upper()}_{name}", os.getenv(name, default))
+
+def _env_bool(role: str, name: str, default: bool) -> bool:
+    return _env(role, name, str(default)).lower() in ("1", "true", "yes", "on")
+
+@dataclass
+class DBSettings:
+    """Connection pool and logging settings for one process role"""
+    role: str
+    pool_size: int
+    max_overflow: int
+    pool_timeout: int
+    pool_recycle: int
+    pool_pre_ping: bool
+    statement_timeout_ms: int
+    pgbouncer: bool
+    echo: bool
+    slow_query_ms: int
+    query_log_sample_rate: float
+
+    @classmethod
+    def from_env(cls, role: str | None = None) -> "DBSettings":
+        role = role or os.getenv("DB_PROCESS_ROLE", "api")
+        defaults = ROLE_DEFAULTS.get(role, ROLE_DEFAULTS["api"])
+        return cls(
+            role=role,
+            pool_size=int(_env(role, "DB_POOL_SIZE", str(defaults["pool_size"]))),
+            max_overflow=int(_env(role, "DB_MAX_OVERFLOW", str(defaults["max_overflow"]))),
+            pool_timeout=int(_env(role, "DB_POOL_TIMEOUT", "30")),
+            pool_recycle=int(_env(role, "DB_POOL_RECYCLE", "1800")),
+            pool_pre_ping=_env_bool(role, "DB_POOL_PRE_PING", True),
+            statement_timeout_ms=int(_env(role, "DB_STATEMENT_TIMEOUT_MS", str(defaults["statement_timeout_ms"]))),
+            pgbouncer=_env_bool(role, "DB_PGBOUNCER", False),
+            echo=_env_bool(role, "DB_ECHO", False),
+            slow_query_ms=int(_env(role, "DB_SLOW_QUERY_MS", "500")),
+            query_log_sample_rate=float(_env(role, "DB_QUERY_LOG_SAMPLE_RATE", "0")),
+        )
+
+    def engine_kwargs(self) -> dict:
+        """Keyword arguments for create_engine / create_async_engine"""
+        if self.pgbouncer:
+            from sqlalchemy.pool import NullPool
+
+            # pgbouncer owns pooling in transaction mode. It rejects startup options and can't keep
+            # server-side prepared statements, so set statement_timeout on the database role instead.
+            return {
+                "echo": self.echo,
+                "poolclass": NullPool,
+                "connect_args": {"prepare_threshold": None},
+            }
+
+        return {
+            "echo": self.echo,
+            "pool_size": self.pool_size,
+            "max_overflow": self.max_overflow,
+            "pool_timeout": self.pool_timeout,
+            "pool_recycle": self.pool_recycle,
+            "pool_pre_ping": self.pool_pre_ping,
+            "connect_args": {"options": f"-c statement_timeout={self.statement_timeout_ms}"},
+        }
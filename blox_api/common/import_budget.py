@@ -0,0 +1,64 @@
+from pathlib import Path
+import os
+import subprocess
+import sys
+
+# Modules that belong to the worker. Importing any of them in the API process is a regression.
+WORKER_ONLY_MODULES = (
+    "agents",
+    "openai",
+    "tavily",
+    "temporal.modules.blog.workflow",
+    "temporal.modules.blog.workflow_helper",
+    "temporal.modules.blog.activities",
+)
+
+# Cumulative import time allowed for the API entry modules
+IMPORT_BUDGET_MS = float(os.getenv("IMPORT_BUDGET_MS", "1500"))
+
+API_ENTRY_MODULES = ("main", "temporal.temporal_client")
+
+def measure_imports(modules: tuple[str, ...] = API_ENTRY_MODULES) -> dict[str, int]:
+    """
+    Import `modules` in a fresh interpreter with `-X importtime` and return the cumulative
+    import time in microseconds of every module that got imported.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "; ".join(f"import {module}" for module in modules)],
+        cwd=Path(__file__).resolve().parent.parent,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    timings = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        timings[name.strip()] = int(cumulative.strip())
+    return timings
+
+def worker_only_imports(timings: dict[str, int]) -> list[str]:
+    """Worker-only modules among the imported ones"""
+    return [module for module in WORKER_ONLY_MODULES if module in timings]
+
+def api_import_ms(timings: dict[str, int]) -> float:
+    """Cumulative import time of the API entry modules in milliseconds"""
+    return sum(timings.get(module, 0) for module in API_ENTRY_MODULES) / 1000
+
+def check_import_budget() -> list[str]:
+    """Returns the budget violations of the API entry modules, empty when within budget"""
+    timings = measure_imports()
+    violations = [f"{module} is imported by the API" for module in worker_only_imports(timings)]
+    total_ms = api_import_ms(timings)
+    if total_ms > IMPORT_BUDGET_MS:
+        violations.append(f"API imports take {total_ms:.0f} ms, budget is {IMPORT_BUDGET_MS:.0f} ms")
+    return violations
+
+if __name__ == "__main__":
+    # python -m common.import_budget
+    violations = check_import_budget()
+    for violation in violations:
+        print(violation)
+    print("ok" if not violations else f"{len(violations)} import budget violation(s)")
+    sys.exit(1 if violations else 0)
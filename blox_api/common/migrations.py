@@ -0,0 +1,277 @@
+from dataclasses import dataclass
+from sqlalchemy import text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.exc import ProgrammingError
+import logging
+import sys
+
+logger = logging.getLogger(__name__)
+
+SCHEMA_VERSION_TABLE = "schema_migrations"
+
+# Serializes concurrent `upgrade` runs (several replicas starting at once)
+MIGRATION_LOCK_ID = 7_301_202
+
+@dataclass(frozen=True)
+class Migration:
+    version: int
+    name: str
+    statements: tuple[str, ...]
+
+# Append-only. Never edit a migration that has shipped, add a new one instead.
+MIGRATIONS: tuple[Migration, ...] = (
+    Migration(1, "baseline", (
+        # Tables as SQLModel.metadata.create_all used to create them, so existing databases adopt cleanly
+        """
+        CREATE TABLE IF NOT EXISTS users (
+            id SERIAL PRIMARY KEY,
+            username VARCHAR NOT NULL,
+            email VARCHAR NOT NULL UNIQUE,
+            password VARCHAR NOT NULL,
+            created_at TIMESTAMP NOT NULL,
+            updated_at TIMESTAMP NOT NULL
+        )
+        """,
+        "CREATE UNIQUE INDEX IF NOT EXISTS ix_users_username ON users (username)",
+        """
+        CREATE TABLE IF NOT EXISTS blogs (
+            id SERIAL PRIMARY KEY,
+            title VARCHAR NOT NULL,
+            description VARCHAR,
+            desired_tone VARCHAR,
+            seo_keywords JSON,
+            target_audience VARCHAR,
+            blog_length_min INTEGER,
+            blog_length_max INTEGER,
+            content VARCHAR,
+            created_at TIMESTAMP NOT NULL,
+            updated_at TIMESTAMP NOT NULL,
+            user_id INTEGER REFERENCES users (id) ON DELETE CASCADE,
+            instructions VARCHAR
+        )
+        """,
+        "CREATE INDEX IF NOT EXISTS ix_blogs_title ON blogs (title)",
+        """
+        CREATE TABLE IF NOT EXISTS checkpoints (
+            id SERIAL PRIMARY KEY,
+            content VARCHAR,
+            created_at TIMESTAMP NOT NULL,
+            updated_at TIMESTAMP NOT NULL,
+            blog_id INTEGER REFERENCES blogs (id) ON DELETE CASCADE
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS messages (
+            id SERIAL PRIMARY KEY,
+            user_message VARCHAR NOT NULL,
+            ai_message VARCHAR NOT NULL,
+            updated_at TIMESTAMP NOT NULL,
+            blog_id INTEGER NOT NULL REFERENCES blogs (id) ON DELETE CASCADE,
+            checkpoint_id INTEGER REFERENCES checkpoints (id) ON DELETE SET NULL
+        )
+        """,
+    )),
+    Migration(2, "blog_listing_counters", (
+        "ALTER TABLE blogs ADD COLUMN IF NOT EXISTS word_count INTEGER NOT NULL DEFAULT 0",
+        "ALTER TABLE blogs ADD COLUMN IF NOT EXISTS message_count INTEGER NOT NULL DEFAULT 0",
+        # Same rule as models.blog.count_words (whitespace separated tokens)
+        r"""
+        UPDATE blogs SET word_count = (SELECT count(*) FROM regexp_matches(content, E'\\S+', 'g'))
+        WHERE content IS NOT NULL
+        """,
+        "UPDATE blogs SET message_count = (SELECT count(*) FROM messages WHERE messages.blog_id = blogs.id)",
+        "CREATE INDEX IF NOT EXISTS ix_blogs_user_id_updated_at_id ON blogs (user_id, updated_at, id)",
+    )),
+    Migration(3, "revision_log", (
+        "ALTER TABLE blogs ADD COLUMN IF NOT EXISTS current_revision INTEGER NOT NULL DEFAULT 0",
+        "ALTER TABLE checkpoints ADD COLUMN IF NOT EXISTS revision_number INTEGER",
+        """
+        CREATE TABLE IF NOT EXISTS revisions (
+            id SERIAL PRIMARY KEY,
+            blog_id INTEGER NOT NULL REFERENCES blogs (id) ON DELETE CASCADE,
+            revision_number INTEGER NOT NULL,
+            source VARCHAR NOT NULL,
+            snapshot VARCHAR,
+            delta JSON,
+            content_hash VARCHAR NOT NULL,
+            created_at TIMESTAMP NOT NULL,
+            CONSTRAINT uq_revisions_blog_id_revision_number UNIQUE (blog_id, revision_number)
+        )
+        """,
+    )),
+    Migration(4, "message_sequence", (
+        "ALTER TABLE messages ADD COLUMN IF NOT EXISTS sequence INTEGER NOT NULL DEFAULT 0",
+        "ALTER TABLE blogs ADD COLUMN IF NOT EXISTS last_message_sequence INTEGER NOT NULL DEFAULT 0",
+        # Number existing messages in the order they used to be listed in
+        """
+        UPDATE messages SET sequence = numbered.position
+        FROM (
+            SELECT id, row_number() OVER (PARTITION BY blog_id ORDER BY updated_at, id) AS position
+            FROM messages
+        ) AS numbered
+        WHERE messages.id = numbered.id
+        """,
+        """
+        UPDATE blogs SET last_message_sequence = COALESCE(
+            (SELECT max(sequence) FROM messages WHERE messages.blog_id = blogs.id), 0
+        )
+        """,
+        "CREATE INDEX IF NOT EXISTS ix_messages_blog_id_sequence ON messages (blog_id, sequence)",
+    )),
+    Migration(5, "hot_path_indexes", (
+        # Checkpoint listing/counting per blog
+        "CREATE INDEX IF NOT EXISTS ix_checkpoints_blog_id_created_at ON checkpoints (blog_id, created_at)",
+        # Checkpoint restore joins messages on checkpoint_id, and ON DELETE SET NULL looks them up on delete
+        "CREATE INDEX IF NOT EXISTS ix_messages_checkpoint_id ON messages (checkpoint_id)",
+    )),
+    Migration(6, "payload_blobs", (
+        # Claim-check store for large Temporal payloads (temporal/codec.py), keyed by sha256 of the data
+        """
+        CREATE TABLE IF NOT EXISTS payload_blobs (
+            key VARCHAR(64) PRIMARY KEY,
+            data BYTEA NOT NULL,
+            created_at TIMESTAMP NOT NULL DEFAULT now()
+        )
+        """,
+    )),
+    Migration(7, "payload_blobs_retention", (
+        # `python -m temporal.codec gc` deletes blobs by age, created_at is refreshed when a blob is written again
+        "CREATE INDEX IF NOT EXISTS ix_payload_blobs_created_at ON payload_blobs (created_at)",
+    )),
+)
+
+HEAD_VERSION = MIGRATIONS[-1].version
+
+# Hot queries and the index each must use, checked by `python -m common.migrations verify`
+HOT_QUERY_PLANS: tuple[tuple[str, str, str], ...] = (
+    (
+        "blog listing",
+        "SELECT id, title FROM blogs WHERE user_id = 1 ORDER BY updated_at DESC, id DESC LIMIT 21",
+        "ix_blogs_user_id_updated_at_id",
+    ),
+    (
+        "message history page",
+        "SELECT * FROM messages WHERE blog_id = 1 AND sequence < 100 ORDER BY sequence DESC LIMIT 21",
+        "ix_messages_blog_id_sequence",
+    ),
+    (
+        "checkpoints of a blog",
+        "SELECT * FROM checkpoints WHERE blog_id = 1 ORDER BY created_at",
+        "ix_checkpoints_blog_id_created_at",
+    ),
+    (
+        "checkpoint message",
+        "SELECT sequence FROM messages WHERE checkpoint_id = 1",
+        "ix_messages_checkpoint_id",
+    ),
+    (
+        "login by email",
+        "SELECT * FROM users WHERE email = 'user@example.com'",
+        "users_email_key",
+    ),
+)
+
+class SchemaVersionError(RuntimeError):
+    pass
+
+def _ensure_version_table(conn: Connection) -> None:
+    conn.execute(text(
+        f"CREATE TABLE IF NOT EXISTS {SCHEMA_VERSION_TABLE} ("
+        "version INTEGER PRIMARY KEY, name VARCHAR NOT NULL, applied_at TIMESTAMP NOT NULL DEFAULT now())"
+    ))
+
+def current_version(conn: Connection) -> int:
+    """Highest applied migration, 0 for an unmanaged database"""
+    try:
+        with conn.begin_nested():
+            return conn.execute(text(f"SELECT COALESCE(max(version), 0) FROM {SCHEMA_VERSION_TABLE}")).scalar_one()
+    except ProgrammingError:
+        return 0
+
+def upgrade(engine: Engine) -> int:
+    """
+    Apply every pending migration, each in its own transaction. Returns the resulting version.
+    """
+    with engine.connect() as conn:
+        with conn.begin():
+            _ensure_version_table(conn)
+
+        # Session-level lock, held across the per-migration transactions
+        conn.execute(text("SELECT pg_advisory_lock(:lock_id)"), {"lock_id": MIGRATION_LOCK_ID})
+        conn.commit()
+        try:
+            version = current_version(conn)
+            conn.commit()
+            for migration in MIGRATIONS:
+                if migration.version <= version:
+                    continue
+                logger.info(
+                    f"Applying migration {migration.version} ({migration.name})",
+                    extra={"migration_version": migration.version, "migration_name": migration.name},
+                )
+                with conn.begin():
+                    for statement in migration.statements:
+                        conn.execute(text(statement))
+                    conn.execute(
+                        text(f"INSERT INTO {SCHEMA_VERSION_TABLE} (version, name) VALUES (:version, :name)"),
+                        {"version": migration.version, "name": migration.name},
+                    )
+                version = migration.version
+            return version
+        finally:
+            conn.execute(text("SELECT pg_advisory_unlock(:lock_id)"), {"lock_id": MIGRATION_LOCK_ID})
+            conn.commit()
+
+def check_schema_version(engine: Engine) -> int:
+    """
+    Startup check: a single lookup of the applied version instead of introspecting every table.
+    Raises SchemaVersionError when the database is behind (or ahead of) this build.
+    """
+    with engine.connect() as conn:
+        version = current_version(conn)
+    if version != HEAD_VERSION:
+        raise SchemaVersionError(
+            f"Database schema is at version {version}, this build expects {HEAD_VERSION}. "
+            "Run `python -m common.migrations upgrade`."
+        )
+    return version
+
+def verify_hot_query_plans(engine: Engine) -> list[tuple[str, bool, str]]:
+    """
+    EXPLAIN each hot query and report whether its plan uses the expected index. Sequential scans
+    are disabled for the check so the result doesn't depend on how much data the database holds.
+    """
+    results = []
+    with engine.connect() as conn:
+        for name, query, index_name in HOT_QUERY_PLANS:
+            with conn.begin():
+                conn.execute(text("SET LOCAL enable_seqscan = off"))
+                plan = "\n".join(row[0] for row in conn.execute(text(f"EXPLAIN {query}")))
+            results.append((name, index_name in plan, plan))
+    return results
+
+def main(argv: list[str]) -> int:
+    from .db import engine
+
+    command = argv[0] if argv else "upgrade"
+    if command == "upgrade":
+        print(f"Schema at version {upgrade(engine)}")
+        return 0
+    if command == "current":
+        with engine.connect() as conn:
+            print(f"Schema at version {current_version(conn)} (head {HEAD_VERSION})")
+        return 0
+    if command == "verify":
+        failed = False
+        for name, uses_index, plan in verify_hot_query_plans(engine):
+            print(f"{'ok  ' if uses_index else 'FAIL'} {name}")
+            if not uses_index:
+                failed = True
+                print(plan)
+        return 1 if failed else 0
+    print("usage: python -m common.migrations [upgrade|current|verify]")
+    return 2
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    sys.exit(main(sys.argv[1:]))
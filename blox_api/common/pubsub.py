@@ -0,0 +1,56 @@
+import asyncio
+import hashlib
+import json
+from typing import Any, AsyncIterator, Optional
+
+import psycopg
+from sqlalchemy import text
+
+from .db import async_engine, DB_HOST, DB_PORT, DB_NAME, DB_USER, DB_PASSWORD
+
+# Postgres rejects NOTIFY payloads of 8000 bytes or more
+MAX_PAYLOAD_BYTES = 7900
+
+def channel_for(topic: str) -> str:
+    """
+    Map an arbitrary topic to a valid Postgres channel name (identifiers are capped at 63 chars).
+    """
+    return "pubsub_" + hashlib.sha1(topic.encode("utf-8")).hexdigest()
+
+async def publish(topic: str, message: dict[str, Any]) -> None:
+    """
+    Publish a JSON message to every subscriber of the topic using Postgres NOTIFY.
+    """
+    payload = json.dumps(message)
+    if len(payload.encode("utf-8")) > MAX_PAYLOAD_BYTES:
+        raise ValueError(f"Pub/sub payload too large: {len(payload)} bytes")
+    async with async_engine.connect() as conn:
+        await conn.execute(text("SELECT pg_notify(:channel, :payload)"), {"channel": channel_for(topic), "payload": payload})
+        await conn.commit()
+
+async def subscribe(topic: str, idle_timeout: float) -> AsyncIterator[Optional[dict[str, Any]]]:
+    """
+    Yield messages published to the topic. Yields None whenever no message arrived within
+    `idle_timeout` seconds so callers can check whether they should keep listening.
+    Uses a dedicated connection that is closed when the generator is closed.
+    """
+    conn = await psycopg.AsyncConnection.connect(
+        host=DB_HOST, port=DB_PORT, dbname=DB_NAME, user=DB_USER, password=DB_PASSWORD, autocommit=True
+    )
+    queue: asyncio.Queue = asyncio.Queue()
+
+    async def pump():
+        async for notify in conn.notifies():
+            queue.put_nowait(json.loads(notify.payload))
+
+    await conn.execute(f'LISTEN "{channel_for(topic)}"')
+    pump_task = asyncio.create_task(pump())
+    try:
+        while True:
+            try:
+                yield await asyncio.wait_for(queue.get(), idle_timeout)
+            except asyncio.TimeoutError:
+                yield None
+    finally:
+        pump_task.cancel()
+        await conn.close()
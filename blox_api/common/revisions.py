@@ -0,0 +1,124 @@
+from difflib import SequenceMatcher
+from typing import Any, Optional
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+import hashlib
+import os
+
+from models.blog import Blog
+from models.revision import Revision
+
+# A full snapshot is stored every N revisions so a restore never replays more than N deltas
+REVISION_SNAPSHOT_INTERVAL = int(os.getenv("REVISION_SNAPSHOT_INTERVAL", "20"))
+
+def content_hash(content: Optional[str]) -> str:
+    """SHA-256 of the blog content, used as its version"""
+    return hashlib.sha256((content or "").encode("utf-8")).hexdigest()
+
+def diff_operations(old: str, new: str) -> list[dict[str, Any]]:
+    """
+    Line-based diff of two documents as splice operations ({offset, delete, insert}) against `old`.
+    """
+    old_lines = old.splitlines(keepends=True)
+    new_lines = new.splitlines(keepends=True)
+
+    offsets = [0]
+    for line in old_lines:
+        offsets.append(offsets[-1] + len(line))
+
+    operations = []
+    for tag, i1, i2, j1, j2 in SequenceMatcher(None, old_lines, new_lines).get_opcodes():
+        if tag == "equal":
+            continue
+        operations.append({
+            "offset": offsets[i1],
+            "delete": offsets[i2] - offsets[i1],
+            "insert": "".join(new_lines[j1:j2]),
+        })
+    return operations
+
+def apply_operations(content: str, operations: list[dict[str, Any]]) -> str:
+    """
+    Apply splice operations to `content`. Offsets are Unicode code points in the base document,
+    operations must be sorted by offset and must not overlap.
+    """
+    parts = []
+    position = 0
+    for operation in operations:
+        offset, delete = operation["offset"], operation.get("delete", 0)
+        if offset < position or offset + delete > len(content):
+            raise ValueError("Operations must be sorted, non-overlapping and within the document")
+        parts.append(content[position:offset])
+        parts.append(operation.get("insert", ""))
+        position = offset + delete
+    parts.append(content[position:])
+    return "".join(parts)
+
+def append_revision(session: AsyncSession, blog: Blog, new_content: str, source: str) -> Revision:
+    """
+    Record `new_content` as the next revision of the blog. Must be called before blog.content is
+    overwritten, since the delta is computed against it. The caller commits.
+    """
+    revision_number = blog.current_revision + 1
+    revision = Revision(
+        blog_id=blog.id,
+        revision_number=revision_number,
+        source=source,
+        content_hash=content_hash(new_content),
+    )
+
+    # The first revision of a blog is always a snapshot
+    if blog.current_revision == 0 or revision_number % REVISION_SNAPSHOT_INTERVAL == 0:
+        revision.snapshot = new_content
+    else:
+        delta = diff_operations(blog.content or "", new_content)
+        # Rewrites of most of the document are cheaper to store and replay as a snapshot
+        delta_size = sum(len(operation["insert"]) for operation in delta)
+        if delta_size * 2 > len(new_content):
+            revision.snapshot = new_content
+        else:
+            revision.delta = delta
+
+    session.add(revision)
+    blog.current_revision = revision_number
+    return revision
+
+def ensure_head_revision(session: AsyncSession, blog: Blog) -> None:
+    """
+    Snapshot the current content of a blog without revisions, one that predates the revision log
+    or has no content yet, so there is a revision to point at. No content is snapshotted as empty.
+    """
+    if blog.current_revision == 0:
+        append_revision(session, blog, blog.content or "", "import")
+
+async def load_revision_content(session: AsyncSession, blog_id: int, revision_number: int) -> str:
+    """
+    Rebuild the content of a revision from the closest snapshot at or before it plus the deltas after it.
+    """
+    snapshot = (await session.exec(
+        select(Revision)
+        .where(
+            Revision.blog_id == blog_id,
+            Revision.revision_number <= revision_number,
+            Revision.snapshot.is_not(None),
+        )
+        .order_by(Revision.revision_number.desc())
+        .limit(1)
+    )).first()
+    if not snapshot:
+        raise LookupError(f"No snapshot found for revision {revision_number} of blog {blog_id}")
+
+    deltas = (await session.exec(
+        select(Revision.delta)
+        .where(
+            Revision.blog_id == blog_id,
+            Revision.revision_number > snapshot.revision_number,
+            Revision.revision_number <= revision_number,
+        )
+        .order_by(Revision.revision_number.asc())
+    )).all()
+
+    content = snapshot.snapshot
+    for delta in deltas:
+        content = apply_operations(content, delta)
+    return content
@@ -1,8 +1,13 @@
+import asyncio
 from fastapi import FastAPI
 from common.db import init_db
 from modules.auth.route import router as auth_router
 from modules.blog.route import router as blog_router
+from modules.health.route import router as health_router
+from modules.health.controller import warm_up, shut_down, install_drain_signal_handler
 from fastapi.middleware.cors import CORSMiddleware
+from common.compression import CompressionMiddleware
+from common.auth import SessionCookieMiddleware
 import os
 
 app = FastAPI()
@@ -15,12 +20,27 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],  # or ["GET", "POST", "PUT", "DELETE", "OPTIONS"]
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "ETag"],
 )
 
+# Blog content, checkpoints and message histories are large, highly compressible markdown
+app.add_middleware(CompressionMiddleware)
+
+# Refreshed access tokens, set here so responses returned directly by handlers carry them too
+app.add_middleware(SessionCookieMiddleware)
+
 @app.on_event("startup")
-def on_startup():
-    init_db()
+async def on_startup():
+    install_drain_signal_handler()
+    # init_db runs synchronous DDL/version checks, keep them off the event loop
+    await asyncio.to_thread(init_db)
+    await warm_up()
+
+@app.on_event("shutdown")
+async def on_shutdown():
+    await shut_down()
 
 # Register routers
 app.include_router(auth_router)
 app.include_router(blog_router)
+app.include_router(health_router)
@@ -1,7 +1,7 @@
 # from __future__ import annotations
 from datetime import datetime, timezone
 from typing import TYPE_CHECKING, List, Optional
-from sqlmodel import Field, Relationship, SQLModel, Column, JSON
+from sqlmodel import Field, Relationship, SQLModel, Column, JSON, Index
 
 # Use TYPE_CHECKING to prevent circular imports at runtime
 if TYPE_CHECKING:
@@ -9,8 +9,15 @@ if TYPE_CHECKING:
     from .message import Message
     from .checkpoint import Checkpoint
 
+def count_words(content: str | None) -> int:
+    return len(content.split()) if content else 0
+
 class Blog(SQLModel, table=True):
     __tablename__ = "blogs"
+    __table_args__ = (
+        # Backs the keyset-paginated blog listing, newest first
+        Index("ix_blogs_user_id_updated_at_id", "user_id", "updated_at", "id"),
+    )
 
     id: int | None = Field(default=None, primary_key=True)
     title: str = Field(index=True)
@@ -21,6 +28,13 @@ class Blog(SQLModel, table=True):
     blog_length_min: int | None = Field(default=None)
     blog_length_max: int | None = Field(default=None)
     content: str | None = Field(default=None)
+    # Denormalized so the blog listing doesn't read content or count messages
+    word_count: int = Field(default=0, sa_column_kwargs={"server_default": "0"})
+    message_count: int = Field(default=0, sa_column_kwargs={"server_default": "0"})
+    # Never decremented, so message sequence numbers are not reused after a restore
+    last_message_sequence: int = Field(default=0, sa_column_kwargs={"server_default": "0"})
+    # Latest revision in the append-only revision log (0 when the blog has no history yet)
+    current_revision: int = Field(default=0, sa_column_kwargs={"server_default": "0"})
     created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
     updated_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
     user_id: int | None = Field(default=None, foreign_key="users.id", ondelete="CASCADE")
@@ -31,7 +45,7 @@ class Blog(SQLModel, table=True):
         sa_relationship_kwargs={
             "cascade": "all, delete-orphan",
             "passive_deletes": True,
-            "order_by": "Message.updated_at.asc()"
+            "order_by": "Message.sequence.asc()"
         }
     )
     checkpoints: list["Checkpoint"] = Relationship(
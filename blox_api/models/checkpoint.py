@@ -1,7 +1,7 @@
 # py modules
 from datetime import datetime, timezone
 from typing import TYPE_CHECKING, List, Optional
-from sqlmodel import Field, Relationship, SQLModel
+from sqlmodel import Field, Relationship, SQLModel, Index
 
 # Use TYPE_CHECKING to prevent circular imports at runtime
 if TYPE_CHECKING:
@@ -9,9 +9,14 @@ if TYPE_CHECKING:
 
 class Checkpoint(SQLModel, table=True):
     __tablename__ = "checkpoints"
-    
+    __table_args__ = (
+        # Checkpoints of a blog in creation order
+        Index("ix_checkpoints_blog_id_created_at", "blog_id", "created_at"),
+    )
+
     id: int | None = Field(default=None, primary_key=True)
-    content: str | None = Field(default=None)
+    content: str | None = Field(default=None)  # Only set on checkpoints created before the revision log
+    revision_number: int | None = Field(default=None)  # Revision of the blog this checkpoint points to
     created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
     updated_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
     blog_id: int | None = Field(default=None, foreign_key="blogs.id", ondelete="CASCADE")
@@ -1,6 +1,6 @@
 from datetime import datetime, timezone
 from typing import TYPE_CHECKING, List, Optional
-from sqlmodel import Field, Relationship, SQLModel
+from sqlmodel import Field, Relationship, SQLModel, Index
 
 # Use TYPE_CHECKING to prevent circular imports at runtime
 if TYPE_CHECKING:
@@ -9,11 +9,19 @@ if TYPE_CHECKING:
 
 class Message(SQLModel, table=True):
     __tablename__ = "messages"
+    __table_args__ = (
+        # Backs the paginated message history and checkpoint restores
+        Index("ix_messages_blog_id_sequence", "blog_id", "sequence"),
+        # Checkpoint restores join on it, and deleting a checkpoint nulls it out
+        Index("ix_messages_checkpoint_id", "checkpoint_id"),
+    )
 
     id: int = Field(primary_key=True)
     user_message: str
     ai_message: str
     updated_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    # Per-blog monotonic position of the message, allocated from blogs.last_message_sequence
+    sequence: int = Field(default=0, sa_column_kwargs={"server_default": "0"})
     blog_id: int = Field(foreign_key="blogs.id", ondelete="CASCADE")
     checkpoint_id: int | None = Field(default=None, foreign_key="checkpoints.id", ondelete="SET NULL")
     blog: Optional["Blog"] = Relationship(back_populates="messages")
@@ -0,0 +1,23 @@
+# py modules
+from datetime import datetime, timezone
+from typing import Any, Optional
+from sqlmodel import Field, SQLModel, Column, JSON, UniqueConstraint
+
+class Revision(SQLModel, table=True):
+    """
+    Append-only history of a blog's content. Each revision stores either a full snapshot
+    or the operations that turn the previous revision into this one.
+    """
+    __tablename__ = "revisions"
+    __table_args__ = (
+        UniqueConstraint("blog_id", "revision_number", name="uq_revisions_blog_id_revision_number"),
+    )
+
+    id: int | None = Field(default=None, primary_key=True)
+    blog_id: int = Field(foreign_key="blogs.id", ondelete="CASCADE")
+    revision_number: int
+    source: str  # "ai", "user", "restore" or "import"
+    snapshot: str | None = Field(default=None)
+    delta: Optional[list[dict[str, Any]]] = Field(default=None, sa_column=Column(JSON))
+    content_hash: str
+    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
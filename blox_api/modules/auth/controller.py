@@ -1,11 +1,19 @@
 # py modules
-from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
 from fastapi import HTTPException, status, Response
 from sqlmodel import select
 import os
 
 # helpers
-from .helper import get_password_hash, verify_password
+from .helper import (
+    get_password_hash_async,
+    verify_password_async,
+    verified_credentials,
+    enforce_throttle,
+    login_ip_throttle,
+    login_email_throttle,
+    signup_ip_throttle,
+)
 from common.auth import create_access_token
 
 # models
@@ -14,16 +22,20 @@ from .models import AuthResponse
 
 ENV = os.getenv("ENV", "development")
 
-def signup_user_controller(response: Response, user: User, session: Session) -> AuthResponse:
+async def signup_user_controller(response: Response, user: User, session: AsyncSession, client_ip: str) -> AuthResponse:
+    # Throttle before anything spends bcrypt CPU
+    enforce_throttle(signup_ip_throttle, client_ip)
+    signup_ip_throttle.hit(client_ip)
+
     # Check if email already exists
-    existing = session.exec(select(User).where(User.email == user.email)).first()
+    existing = (await session.exec(select(User).where(User.email == user.email))).first()
     if existing:
         raise HTTPException(status_code=400, detail="Email already registered")
 
-    user.password = get_password_hash(user.password)
+    user.password = await get_password_hash_async(user.password)
     session.add(user)
-    session.commit()
-    session.refresh(user)
+    await session.commit()
+    await session.refresh(user)
 
     token = create_access_token(data={ "sub": str(user.id) })
     response.set_cookie(key="access_token", value=token, httponly=True, secure=ENV == "production", samesite="strict")
@@ -36,11 +48,26 @@ def signup_user_controller(response: Response, user: User, session: Session) ->
         }
     )
 
-def login_user_controller(response: Response, email: str, password: str, session: Session) -> AuthResponse:
-    user = session.exec(select(User).where(User.email == email)).first()
-    if not user or not verify_password(password, user.password):
+async def login_user_controller(response: Response, email: str, password: str, session: AsyncSession, client_ip: str) -> AuthResponse:
+    # Throttle before anything spends bcrypt CPU
+    email_key = email.strip().lower()
+    enforce_throttle(login_ip_throttle, client_ip)
+    enforce_throttle(login_email_throttle, email_key)
+    login_ip_throttle.hit(client_ip)
+
+    user = (await session.exec(select(User).where(User.email == email))).first()
+    if not user:
+        login_email_throttle.hit(email_key)
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials")
 
+    # Credentials verified moments ago skip bcrypt
+    if not verified_credentials.contains(user.password, password):
+        if not await verify_password_async(password, user.password):
+            login_email_throttle.hit(email_key)
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials")
+        verified_credentials.add(user.password, password)
+    login_email_throttle.reset(email_key)
+
     token = create_access_token(data={ "sub": str(user.id) })
     response.set_cookie(key="access_token", value=token, httponly=True, secure=ENV == "production", samesite="strict")
     return AuthResponse(
@@ -1,11 +1,154 @@
 # py modules
+import asyncio
+import hashlib
+import hmac
+import os
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+from fastapi import HTTPException, status
 from passlib.context import CryptContext
 
+# common
+from common.auth import SECRET_KEY
+
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+# bcrypt releases the GIL, so a small dedicated thread pool hashes in parallel without
+# touching the threadpool the rest of the API runs on
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", str(min(4, os.cpu_count() or 1))))
+# Hashes allowed to wait for a worker before new ones are turned away with a 503
+PASSWORD_HASH_QUEUE_LIMIT = int(os.getenv("PASSWORD_HASH_QUEUE_LIMIT", "32"))
+
+# Recently verified credentials skip bcrypt on repeated logins
+VERIFIED_CREDENTIAL_TTL_SECONDS = int(os.getenv("VERIFIED_CREDENTIAL_TTL_SECONDS", "300"))
+VERIFIED_CREDENTIAL_CACHE_SIZE = int(os.getenv("VERIFIED_CREDENTIAL_CACHE_SIZE", "10000"))
+
+# Login attempts per client IP, and failed logins per email, within the throttle window
+LOGIN_THROTTLE_WINDOW_SECONDS = int(os.getenv("LOGIN_THROTTLE_WINDOW_SECONDS", "300"))
+LOGIN_MAX_ATTEMPTS_PER_IP = int(os.getenv("LOGIN_MAX_ATTEMPTS_PER_IP", "30"))
+LOGIN_MAX_FAILURES_PER_EMAIL = int(os.getenv("LOGIN_MAX_FAILURES_PER_EMAIL", "5"))
+SIGNUP_MAX_ATTEMPTS_PER_IP = int(os.getenv("SIGNUP_MAX_ATTEMPTS_PER_IP", "10"))
+
+_hash_executor = ThreadPoolExecutor(max_workers=PASSWORD_HASH_WORKERS, thread_name_prefix="password-hash")
+_hash_slots: Optional[asyncio.Semaphore] = None
+
 def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
+async def _run_in_hash_pool(func, *args):
+    """
+    Run a bcrypt call on the dedicated pool. Callers beyond the workers plus the queue limit
+    get a 503 instead of piling up behind a burst.
+    """
+    global _hash_slots
+    if _hash_slots is None:
+        _hash_slots = asyncio.Semaphore(PASSWORD_HASH_WORKERS + PASSWORD_HASH_QUEUE_LIMIT)
+    if _hash_slots.locked():
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many authentication requests, try again shortly",
+            headers={"Retry-After": "1"},
+        )
+    async with _hash_slots:
+        return await asyncio.get_running_loop().run_in_executor(_hash_executor, func, *args)
+
+async def get_password_hash_async(password: str) -> str:
+    return await _run_in_hash_pool(get_password_hash, password)
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    return await _run_in_hash_pool(verify_password, plain_password, hashed_password)
+
+
+class VerifiedCredentialCache:
+    """
+    Remembers credentials that passed bcrypt recently. Entries are keyed by an HMAC of the stored
+    hash and the password, so no password is kept and a password change invalidates them.
+    """
+
+    def __init__(self, ttl_seconds: int, max_size: int):
+        self._ttl_seconds = ttl_seconds
+        self._max_size = max_size
+        self._entries: OrderedDict[str, float] = OrderedDict()
+
+    @staticmethod
+    def _key(hashed_password: str, plain_password: str) -> str:
+        message = f"{hashed_password}\0{plain_password}".encode("utf-8")
+        return hmac.new(SECRET_KEY.encode("utf-8"), message, hashlib.sha256).hexdigest()
+
+    def contains(self, hashed_password: str, plain_password: str) -> bool:
+        key = self._key(hashed_password, plain_password)
+        expires_at = self._entries.get(key)
+        if expires_at is None:
+            return False
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return False
+        return True
+
+    def add(self, hashed_password: str, plain_password: str) -> None:
+        key = self._key(hashed_password, plain_password)
+        self._entries[key] = time.monotonic() + self._ttl_seconds
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_size:
+            self._entries.popitem(last=False)
+
+
+class SlidingWindowThrottle:
+    """
+    In-process sliding window counter per key (client IP or email). Tracks at most `max_keys`
+    keys, evicting the least recently used, so a flood of distinct keys can't grow it unbounded.
+    """
+
+    def __init__(self, limit: int, window_seconds: int, max_keys: int = 100_000):
+        self._limit = limit
+        self._window_seconds = window_seconds
+        self._max_keys = max_keys
+        self._hits: OrderedDict[str, deque] = OrderedDict()
+
+    def _recent(self, key: str) -> deque:
+        hits = self._hits.get(key)
+        if hits is None:
+            return deque()
+        cutoff = time.monotonic() - self._window_seconds
+        while hits and hits[0] < cutoff:
+            hits.popleft()
+        return hits
+
+    def retry_after(self, key: str) -> Optional[int]:
+        """Seconds until `key` may try again, or None when it is under the limit"""
+        hits = self._recent(key)
+        if len(hits) < self._limit:
+            return None
+        return max(1, int(hits[0] + self._window_seconds - time.monotonic()) + 1)
+
+    def hit(self, key: str) -> None:
+        hits = self._recent(key)
+        hits.append(time.monotonic())
+        self._hits[key] = hits
+        self._hits.move_to_end(key)
+        while len(self._hits) > self._max_keys:
+            self._hits.popitem(last=False)
+
+    def reset(self, key: str) -> None:
+        self._hits.pop(key, None)
+
+
+verified_credentials = VerifiedCredentialCache(VERIFIED_CREDENTIAL_TTL_SECONDS, VERIFIED_CREDENTIAL_CACHE_SIZE)
+login_ip_throttle = SlidingWindowThrottle(LOGIN_MAX_ATTEMPTS_PER_IP, LOGIN_THROTTLE_WINDOW_SECONDS)
+login_email_throttle = SlidingWindowThrottle(LOGIN_MAX_FAILURES_PER_EMAIL, LOGIN_THROTTLE_WINDOW_SECONDS)
+signup_ip_throttle = SlidingWindowThrottle(SIGNUP_MAX_ATTEMPTS_PER_IP, LOGIN_THROTTLE_WINDOW_SECONDS)
+
+def enforce_throttle(throttle: SlidingWindowThrottle, key: str) -> None:
+    """Reject the request with a 429 when `key` is over its limit"""
+    retry_after = throttle.retry_after(key)
+    if retry_after is not None:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many attempts, try again later",
+            headers={"Retry-After": str(retry_after)},
+        )
@@ -1,9 +1,9 @@
 # py modules
-from fastapi import APIRouter, Depends, Form, Response
-from sqlmodel import Session
+from fastapi import APIRouter, Depends, Form, Request, Response
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 # helpers
-from common.db import get_session
+from common.db import get_async_session
 
 # controllers
 from .controller import signup_user_controller, login_user_controller
@@ -15,12 +15,12 @@ from .models import AuthResponse, LoginRequest
 router = APIRouter(tags=["auth"])
 
 @router.post("/signup", response_model=AuthResponse)
-def signup(response: Response, user: User, session: Session = Depends(get_session)):
-    return signup_user_controller(response, user, session)
+async def signup(request: Request, response: Response, user: User, session: AsyncSession = Depends(get_async_session)):
+    return await signup_user_controller(response, user, session, request.client.host if request.client else "unknown")
 
 @router.post("/login")
-def login(response: Response, payload: LoginRequest, session: Session = Depends(get_session), response_model=AuthResponse):
-    return login_user_controller(response, payload.email, payload.password, session)
+async def login(request: Request, response: Response, payload: LoginRequest, session: AsyncSession = Depends(get_async_session), response_model=AuthResponse):
+    return await login_user_controller(response, payload.email, payload.password, session, request.client.host if request.client else "unknown")
 
 @router.post("/logout")
 def logout(response: Response, response_model=AuthResponse):
@@ -1,25 +1,62 @@
 # py modules
-from fastapi import HTTPException
-from sqlmodel import Session, select
+import asyncio
+import os
+from dataclasses import asdict
+from fastapi import HTTPException, Response, status
+from fastapi.responses import StreamingResponse
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from sqlalchemy import delete, func, tuple_
 from datetime import datetime, timezone
 from typing import List
 from sqlalchemy.orm import selectinload
 
 # models
-from models.blog import Blog
+from models.blog import Blog, count_words
 from models.message import Message
 from models.checkpoint import Checkpoint
-from .models import BlogDataResponse, CreateBlogRequest, BlogSummary, CreateMessageRequest, MessageResponse, UpdateBlogRequest
+from .models import CreateBlogRequest, CreateMessageRequest, UpdateBlogRequest, PatchBlogRequest, RestoreCheckpointResponse, PatchBlogResponse, WorkflowJobResponse, WorkflowJobStatusResponse
 from common.auth import TokenData
 
+# helpers
+from .helper import format_sse_event, encode_cursor, decode_cursor, make_etag, etag_matches, apply_text_operations
+from common.revisions import content_hash, append_revision, ensure_head_revision, load_revision_content
+from common.compression import PrecompressedCache, choose_encoding, compress_async, encoded_etag
+from common.responses import FastJSONResponse
+
+PROGRESS_POLL_INTERVAL_SECONDS = float(os.getenv("PROGRESS_POLL_INTERVAL_SECONDS", "1"))
+DRAFT_STREAM_IDLE_SECONDS = float(os.getenv("DRAFT_STREAM_IDLE_SECONDS", "5"))
+DEFAULT_MESSAGE_PAGE_SIZE = 20
+# Route chat messages to a long-lived session workflow per blog instead of a new workflow per message
+BLOG_SESSION_WORKFLOWS = os.getenv("BLOG_SESSION_WORKFLOWS", "false").lower() in ("1", "true", "yes", "on")
+
+# Blogs change, so clients must revalidate. Checkpoint content never changes once created.
+BLOG_CACHE_CONTROL = "private, no-cache"
+CHECKPOINT_CACHE_CONTROL = "private, max-age=86400, immutable"
+TERMINAL_PROGRESS_STAGES = ("completed", "failed")
+
+# Rendered and compressed checkpoint bodies, keyed by ETag and encoding. Checkpoints are immutable,
+# so a hit skips the database and the revision replay as well as the compression.
+checkpoint_body_cache = PrecompressedCache(int(os.getenv("CHECKPOINT_BODY_CACHE_MAX_BYTES", str(32 * 1024 * 1024))))
+
 #commons
 
-async def create_blog_controller(blog: CreateBlogRequest, session: Session, current_user: TokenData) -> dict:
+def _workflow_job_response(workflow_id: str, job_status: str) -> WorkflowJobResponse:
+    return WorkflowJobResponse(
+        workflow_id=workflow_id,
+        status=job_status,
+        status_url=f"/blogs/jobs/{workflow_id}",
+        result_url=f"/blogs/jobs/{workflow_id}/result",
+    )
+
+async def create_blog_controller(response: Response, blog: CreateBlogRequest, session: AsyncSession, current_user: TokenData, wait: bool = True, idempotency_key: str | None = None) -> dict | WorkflowJobResponse:
     """
     Create a new blog by starting a temporal workflow and waiting for completion.
     Returns the workflow result containing the created blog data.
+    With wait=False the workflow is only submitted and a 202 job response is returned.
+    Retries carrying the same Idempotency-Key attach to the original workflow instead of starting another.
     """
-    from temporal.temporal_client import start_blog_creation_workflow
+    from temporal.temporal_client import start_blog_creation_workflow, submit_blog_creation_workflow, IdempotencyKeyConflictError
 
     try:
         # Prepare blog data for workflow
@@ -34,8 +71,13 @@ async def create_blog_controller(blog: CreateBlogRequest, session: Session, curr
             "user_id": current_user.user_id
         }
 
+        if not wait:
+            workflow_id = await submit_blog_creation_workflow(blog_data, idempotency_key)
+            response.status_code = status.HTTP_202_ACCEPTED
+            return _workflow_job_response(workflow_id, "running")
+
         # Start temporal workflow and wait for result
-        workflow_result = await start_blog_creation_workflow(blog_data)
+        workflow_result = await start_blog_creation_workflow(blog_data, idempotency_key)
 
         # Check if workflow completed successfully
         if "error" in workflow_result:
@@ -43,65 +85,199 @@ async def create_blog_controller(blog: CreateBlogRequest, session: Session, curr
 
         return workflow_result
 
+    except IdempotencyKeyConflictError as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to create blog: {str(e)}")
 
-def list_blogs_controller(current_user: TokenData, session: Session) -> list[BlogSummary]:
-    statement = select(Blog.id, Blog.title).where(Blog.user_id == current_user.user_id)
-    blogs = session.exec(statement).all()
-    return [BlogSummary(id=b[0], title=b[1]) for b in blogs]
+async def list_blogs_controller(current_user: TokenData, session: AsyncSession, limit: int, cursor: str | None = None) -> FastJSONResponse:
+    """
+    List the user's blogs, most recently updated first, one page at a time.
+    Pages are keyset-paginated on (updated_at, id); the cursor for the next page is sent in X-Next-Cursor.
+    """
+    statement = (
+        select(Blog.id, Blog.title, Blog.word_count, Blog.message_count, Blog.updated_at)
+        .where(Blog.user_id == current_user.user_id)
+    )
+    if cursor:
+        cursor_updated_at, cursor_id = decode_cursor(cursor)
+        statement = statement.where(tuple_(Blog.updated_at, Blog.id) < tuple_(cursor_updated_at, cursor_id))
+
+    # Fetch one extra row to know whether there is a next page
+    statement = statement.order_by(Blog.updated_at.desc(), Blog.id.desc()).limit(limit + 1)
+    blogs = (await session.exec(statement)).all()
+
+    headers = {}
+    if len(blogs) > limit:
+        blogs = blogs[:limit]
+        headers["X-Next-Cursor"] = encode_cursor(blogs[-1][4], blogs[-1][0])
+
+    # Shaped as BlogSummary and rendered as is, FastAPI would otherwise re-validate every row
+    return FastJSONResponse(
+        [
+            {"id": b[0], "title": b[1], "word_count": b[2], "message_count": b[3], "updated_at": b[4]}
+            for b in blogs
+        ],
+        headers=headers,
+    )
 
-def get_blog_controller(blog_id: int, session: Session) -> BlogDataResponse:
-    # Load blog with messages in a single query
-    blog = session.exec(
-        select(Blog)
-        .where(Blog.id == blog_id)
-        .options(selectinload(Blog.messages))
-    ).first()
+async def _get_message_page(blog_id: int, session: AsyncSession, limit: int, before: int | None = None) -> tuple[list[dict], int | None]:
+    """
+    Load up to `limit` messages with a sequence number below `before` (latest first when it is not given).
+    Returns them in chronological order with the cursor for the next older page, or None when there is none.
+    """
+    statement = select(Message).where(Message.blog_id == blog_id)
+    if before is not None:
+        statement = statement.where(Message.sequence < before)
+
+    # Fetch one extra row to know whether there are older messages
+    statement = statement.order_by(Message.sequence.desc()).limit(limit + 1)
+    messages = (await session.exec(statement)).all()
+
+    next_cursor = None
+    if len(messages) > limit:
+        messages = messages[:limit]
+        next_cursor = messages[-1].sequence
+
+    # Plain dicts shaped as MessageResponse, rows come straight from the database and need no validation
+    messages_response = []
+    for msg in reversed(messages):
+        messages_response.append({"id": "user_" + str(msg.id), "role": "user", "message": msg.user_message, "checkpoint_id": None, "timestamp": msg.updated_at})
+        messages_response.append({"id": "assistant_" + str(msg.id), "role": "assistant", "message": msg.ai_message, "checkpoint_id": msg.checkpoint_id, "timestamp": msg.updated_at})
+
+    return messages_response, next_cursor
+
+async def get_blog_controller(blog_id: int, session: AsyncSession, messages_limit: int = DEFAULT_MESSAGE_PAGE_SIZE) -> dict:
+    """
+    Load a blog with its latest `messages_limit` messages, as a dict shaped as BlogDataResponse.
+    Older messages are fetched page by page from /blogs/{blog_id}/messages using `messages_cursor`.
+    """
+    blog = (await session.exec(select(Blog).where(Blog.id == blog_id))).first()
 
     if not blog:
         raise HTTPException(status_code=404, detail="Blog not found")
 
-    print(f"afaq: blog.messages: {blog.messages}")
+    messages_response, messages_cursor = await _get_message_page(blog_id, session, messages_limit)
+
+    return {
+        "id": blog.id,
+        "title": blog.title,
+        "description": blog.description,
+        "desired_tone": blog.desired_tone,
+        "seo_keywords": blog.seo_keywords,
+        "target_audience": blog.target_audience,
+        "blog_length_min": blog.blog_length_min,
+        "blog_length_max": blog.blog_length_max,
+        # Declared as str in BlogDataResponse, blogs created before their first generation have none
+        "content": blog.content or "",
+        "content_hash": content_hash(blog.content),
+        "user_id": blog.user_id,
+        "messages": messages_response,
+        "messages_cursor": messages_cursor,
+        "created_at": blog.created_at,
+        "updated_at": blog.updated_at,
+    }
+
+async def list_messages_controller(blog_id: int, session: AsyncSession, limit: int, before: int | None = None) -> FastJSONResponse:
+    blog_exists = (await session.exec(select(Blog.id).where(Blog.id == blog_id))).first()
+    if not blog_exists:
+        raise HTTPException(status_code=404, detail="Blog not found")
 
-    # Messages are already sorted by updated_at ascending thanks to relationship
-    messages_response = []
-    for msg in blog.messages:
-        messages_response.append(MessageResponse(id="user_" + str(msg.id), role="user", message=msg.user_message, timestamp=msg.updated_at))
-        messages_response.append(MessageResponse(id="assistant_" + str(msg.id), role="assistant", message=msg.ai_message, timestamp=msg.updated_at, checkpoint_id=msg.checkpoint_id))
-
-    return BlogDataResponse(
-        id=blog.id,
-        title=blog.title,
-        description=blog.description,
-        desired_tone=blog.desired_tone,
-        seo_keywords=blog.seo_keywords,
-        target_audience=blog.target_audience,
-        blog_length_min=blog.blog_length_min,
-        blog_length_max=blog.blog_length_max,
-        content=blog.content,
-        user_id=blog.user_id,
-        messages=messages_response,
-        created_at=blog.created_at,
-        updated_at=blog.updated_at
-    )
+    messages_response, next_cursor = await _get_message_page(blog_id, session, limit, before)
+    return FastJSONResponse({"messages": messages_response, "next_cursor": next_cursor})
+
+async def _blog_etag(blog_id: int, session: AsyncSession, messages_limit: int) -> str:
+    """
+    ETag for GET /blogs/{blog_id} computed from version markers only, without loading content or messages.
+    updated_at and message_count cover content and new messages, the checkpoint aggregates cover
+    checkpoints being created or deleted (which change the messages' checkpoint_id).
+    """
+    checkpoint_count = select(func.count(Checkpoint.id)).where(Checkpoint.blog_id == Blog.id).scalar_subquery()
+    latest_checkpoint_id = select(func.max(Checkpoint.id)).where(Checkpoint.blog_id == Blog.id).scalar_subquery()
+    version = (await session.exec(
+        select(Blog.updated_at, Blog.message_count, checkpoint_count, latest_checkpoint_id)
+        .where(Blog.id == blog_id)
+    )).first()
+
+    if not version:
+        raise HTTPException(status_code=404, detail="Blog not found")
+
+    return make_etag(blog_id, messages_limit, *version)
+
+async def get_blog_conditional_controller(blog_id: int, session: AsyncSession, messages_limit: int, if_none_match: str | None) -> Response:
+    """
+    Serve GET /blogs/{blog_id} with an ETag, answering 304 Not Modified when the client's copy is current.
+    """
+    etag = await _blog_etag(blog_id, session, messages_limit)
+    headers = {"ETag": etag, "Cache-Control": BLOG_CACHE_CONTROL}
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    return FastJSONResponse(await get_blog_controller(blog_id, session, messages_limit), headers=headers)
 
-def update_blog_controller(blog_id: int, blog: UpdateBlogRequest, session: Session, current_user: TokenData) -> BlogDataResponse:
-    blog_db = session.exec(select(Blog).where(Blog.id == blog_id)).first()
+async def update_blog_controller(blog_id: int, blog: UpdateBlogRequest, session: AsyncSession, current_user: TokenData) -> FastJSONResponse:
+    # Lock the row so the revision number is allocated once
+    blog_db = (await session.exec(select(Blog).where(Blog.id == blog_id).with_for_update())).first()
     print(f"afaq: blog: {blog.content}")
     if not blog_db:
         raise HTTPException(status_code=404, detail="Blog not found")
+    append_revision(session, blog_db, blog.content, "user")
     blog_db.content = blog.content
-    session.commit()
-    session.refresh(blog_db)
-    return blog_db
+    blog_db.word_count = count_words(blog.content)
+    blog_db.updated_at = datetime.now(timezone.utc)
+    await session.commit()
+
+    # Relationships can't be lazy loaded on an async session, reload with messages for the response
+    return FastJSONResponse(await get_blog_controller(blog_id, session))
+
+async def patch_blog_controller(blog_id: int, patch: PatchBlogRequest, session: AsyncSession, current_user: TokenData) -> PatchBlogResponse:
+    """
+    Apply editor operations to the stored content instead of uploading the whole document.
+    Responds 409 with the current hash when `base_hash` is stale; the client then falls back to a full PUT.
+    """
+    # Lock the row so concurrent patches are applied one after the other against the right base
+    blog_db = (await session.exec(select(Blog).where(Blog.id == blog_id).with_for_update())).first()
+    if not blog_db:
+        raise HTTPException(status_code=404, detail="Blog not found")
+
+    current_hash = content_hash(blog_db.content)
+    if patch.base_hash != current_hash:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail={"message": "Blog content has changed", "content_hash": current_hash},
+        )
 
-async def create_message_controller(message: CreateMessageRequest, session: Session, current_user: TokenData) -> dict:
+    new_content = apply_text_operations(blog_db.content or "", patch.operations)
+    append_revision(session, blog_db, new_content, "user")
+    blog_db.content = new_content
+    blog_db.word_count = count_words(blog_db.content)
+    blog_db.updated_at = datetime.now(timezone.utc)
+    await session.commit()
+
+    return PatchBlogResponse(
+        id=blog_db.id,
+        content_hash=content_hash(blog_db.content),
+        word_count=blog_db.word_count,
+        updated_at=blog_db.updated_at,
+    )
+
+async def create_message_controller(response: Response, message: CreateMessageRequest, session: AsyncSession, current_user: TokenData, wait: bool = True, idempotency_key: str | None = None) -> dict | WorkflowJobResponse:
     """
     Create a message for an existing blog by starting a temporal workflow and waiting for completion.
     Returns the workflow result containing the updated blog data and new message.
+    With wait=False the workflow is only submitted and a 202 job response is returned.
+    Retries carrying the same Idempotency-Key attach to the original workflow instead of starting another.
+    With BLOG_SESSION_WORKFLOWS enabled, waiting requests go to the blog's session workflow as an update.
     """
-    from temporal.temporal_client import start_message_workflow
+    from temporal.temporal_client import start_message_workflow, submit_message_workflow, send_blog_session_message, IdempotencyKeyConflictError
+
+    use_session = wait and BLOG_SESSION_WORKFLOWS
+    revision = None
+    if use_session:
+        # The session keeps the blog in memory, the revision tells it whether that copy is current
+        revision = (await session.exec(select(Blog.current_revision).where(Blog.id == message.blog_id))).first()
+        if revision is None:
+            raise HTTPException(status_code=404, detail="Blog not found")
 
     try:
         # Prepare message data for workflow
@@ -119,8 +295,16 @@ async def create_message_controller(message: CreateMessageRequest, session: Sess
             "user_selected_context": message.selected_context
         }
 
-        # Start temporal workflow and wait for result
-        workflow_result = await start_message_workflow(message_data)
+        if not wait:
+            workflow_id = await submit_message_workflow(message_data, idempotency_key)
+            response.status_code = status.HTTP_202_ACCEPTED
+            return _workflow_job_response(workflow_id, "running")
+
+        if use_session:
+            workflow_result = await send_blog_session_message(message_data, revision, idempotency_key)
+        else:
+            # Start temporal workflow and wait for result
+            workflow_result = await start_message_workflow(message_data, idempotency_key)
 
         # Check if workflow completed successfully
         if "error" in workflow_result:
@@ -128,21 +312,152 @@ async def create_message_controller(message: CreateMessageRequest, session: Sess
 
         return workflow_result
 
+    except IdempotencyKeyConflictError as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to create message: {str(e)}")
 
+async def _describe_owned_workflow(workflow_id: str, current_user: TokenData) -> dict:
+    """Describe a workflow, hiding it from everyone except the user who started it."""
+    from temporal.temporal_client import describe_blog_workflow
+    from temporalio.service import RPCError, RPCStatusCode
+
+    try:
+        description = await describe_blog_workflow(workflow_id)
+    except RPCError as e:
+        if e.status == RPCStatusCode.NOT_FOUND:
+            raise HTTPException(status_code=404, detail="Job not found")
+        raise HTTPException(status_code=500, detail=f"Failed to fetch job: {str(e)}")
+
+    if description["user_id"] != current_user.user_id:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    return description
+
+async def get_workflow_job_controller(workflow_id: str, current_user: TokenData) -> WorkflowJobStatusResponse:
+    description = await _describe_owned_workflow(workflow_id, current_user)
+    return WorkflowJobStatusResponse(
+        workflow_id=workflow_id,
+        status=description["status"],
+        started_at=description["started_at"],
+        closed_at=description["closed_at"],
+    )
+
+async def get_workflow_job_result_controller(response: Response, workflow_id: str, current_user: TokenData) -> dict | WorkflowJobStatusResponse:
+    """
+    Return the workflow result once it has completed.
+    While the workflow is still running a 202 with the current job status is returned instead.
+    """
+    from temporal.temporal_client import get_blog_workflow_result
+
+    description = await _describe_owned_workflow(workflow_id, current_user)
+    if description["status"] == "running":
+        response.status_code = status.HTTP_202_ACCEPTED
+        return WorkflowJobStatusResponse(
+            workflow_id=workflow_id,
+            status=description["status"],
+            started_at=description["started_at"],
+            closed_at=description["closed_at"],
+        )
+    if description["status"] != "completed":
+        raise HTTPException(status_code=500, detail=f"Workflow {description['status']}")
 
-def create_checkpoint_controller(message_id: int, session: Session) -> Checkpoint:
-    """Create a checkpoint for a blog. Keep max 3 checkpoints per blog."""
+    workflow_result = await get_blog_workflow_result(workflow_id)
+    if "error" in workflow_result:
+        raise HTTPException(status_code=500, detail=f"Workflow failed: {workflow_result['error']}")
 
-    # Load message and its blog + existing checkpoints
-    message = session.exec(
+    return workflow_result
+
+async def stream_workflow_job_events_controller(workflow_id: str, current_user: TokenData, last_event_id: int = 0) -> StreamingResponse:
+    """
+    Stream workflow progress events (stage transitions and tool calls) as Server-Sent Events.
+    Polls the workflow progress query and ends with a `done` event once the workflow closes.
+    """
+    from temporal.temporal_client import describe_blog_workflow, get_blog_workflow_progress
+
+    await _describe_owned_workflow(workflow_id, current_user)
+
+    async def event_stream():
+        after = last_event_id
+        try:
+            while True:
+                progress = await get_blog_workflow_progress(workflow_id, after)
+                for event in progress.events:
+                    after = event.sequence
+                    yield format_sse_event("progress", asdict(event), event_id=event.sequence)
+
+                if progress.stage in TERMINAL_PROGRESS_STAGES:
+                    yield format_sse_event("done", {"status": progress.stage})
+                    return
+
+                if not progress.events:
+                    # Nothing new, make sure the workflow was not terminated or timed out
+                    description = await describe_blog_workflow(workflow_id)
+                    if description["status"] != "running":
+                        yield format_sse_event("done", {"status": description["status"]})
+                        return
+                    yield ": keep-alive\n\n"
+
+                await asyncio.sleep(PROGRESS_POLL_INTERVAL_SECONDS)
+        except Exception as e:
+            yield format_sse_event("error", {"detail": f"Failed to fetch job progress: {str(e)}"})
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+async def stream_workflow_draft_controller(workflow_id: str, current_user: TokenData) -> StreamingResponse:
+    """
+    Relay the partial blog draft published by the model activity as Server-Sent Events.
+    A `start` event marks a new draft (the client should clear its buffer), `delta` events carry text.
+    """
+    from temporal.temporal_client import describe_blog_workflow
+    from temporal.modules.blog.topics import draft_topic
+    from common.pubsub import subscribe
+
+    await _describe_owned_workflow(workflow_id, current_user)
+    topic = draft_topic(workflow_id)
+
+    async def draft_stream():
+        messages = subscribe(topic, idle_timeout=DRAFT_STREAM_IDLE_SECONDS)
+        try:
+            async for message in messages:
+                if message is not None:
+                    yield format_sse_event(message["type"], message)
+                    continue
+
+                # Idle, stop once the workflow has closed
+                description = await describe_blog_workflow(workflow_id)
+                if description["status"] != "running":
+                    yield format_sse_event("done", {"status": description["status"]})
+                    return
+                yield ": keep-alive\n\n"
+        except Exception as e:
+            yield format_sse_event("error", {"detail": f"Failed to stream draft: {str(e)}"})
+        finally:
+            await messages.aclose()
+
+    return StreamingResponse(
+        draft_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+async def create_checkpoint_controller(message_id: int, session: AsyncSession) -> Checkpoint:
+    """
+    Create a checkpoint for a blog. Checkpoints point at a revision in the revision log
+    instead of copying the content, so there is no limit on how many a blog keeps.
+    """
+
+    # Load message and its blog
+    message = (await session.exec(
         select(Message)
         .where(Message.id == message_id)
-        .options(
-            selectinload(Message.blog).selectinload(Blog.checkpoints)
-        )
-    ).first()
+        .options(selectinload(Message.blog))
+    )).first()
 
     if not message:
         raise HTTPException(status_code=404, detail="Message not found")
@@ -151,15 +466,13 @@ def create_checkpoint_controller(message_id: int, session: Session) -> Checkpoin
 
     blog = message.blog
 
-    # Delete oldest checkpoint if there are already 3 or more
-    if len(blog.checkpoints) >= 3:
-        oldest_checkpoint = blog.checkpoints[0]  # already sorted by created_at
-        session.delete(oldest_checkpoint)
+    # Blogs written before the revision log, or without content yet, need a revision to point at
+    ensure_head_revision(session, blog)
 
     # Create new checkpoint
-    new_checkpoint = Checkpoint(blog_id=blog.id, content=blog.content)
+    new_checkpoint = Checkpoint(blog_id=blog.id, revision_number=blog.current_revision)
     session.add(new_checkpoint)
-    session.flush()
+    await session.flush()
 
     # Update message to point to the new checkpoint
     message.checkpoint_id = new_checkpoint.id
@@ -168,76 +481,142 @@ def create_checkpoint_controller(message_id: int, session: Session) -> Checkpoin
     session.add(message)
 
     # Commit everything in a single transaction
-    session.commit()
+    await session.commit()
 
     # Refresh objects to get IDs and timestamps
-    session.refresh(new_checkpoint)
-    session.refresh(message)
+    await session.refresh(new_checkpoint)
+    await session.refresh(message)
 
     return new_checkpoint
 
-def get_checkpoint_controller(checkpoint_id: int, session: Session) -> Checkpoint:
+async def get_checkpoint_controller(checkpoint_id: int, session: AsyncSession) -> Checkpoint:
     statement = select(Checkpoint).where(Checkpoint.id == checkpoint_id)
-    checkpoint = session.exec(statement).first()
+    checkpoint = (await session.exec(statement)).first()
     if not checkpoint:
         raise HTTPException(status_code=404, detail="Checkpoint not found")
+
+    if checkpoint.revision_number is not None:
+        # Fill in the content for the response only, it is never written back
+        session.expunge(checkpoint)
+        checkpoint.content = await _load_checkpoint_content(session, checkpoint.blog_id, checkpoint.revision_number)
     return checkpoint
 
-def restore_checkpoint_controller(checkpoint_id: int, session: Session) -> BlogDataResponse:
-    # Get the checkpoint to be restored
-    checkpoint = session.get(Checkpoint, checkpoint_id)
-    if not checkpoint:
+async def _load_checkpoint_content(session: AsyncSession, blog_id: int, revision_number: int) -> str:
+    """Content of the revision a checkpoint points at, 409 when the revision log can't rebuild it"""
+    try:
+        return await load_revision_content(session, blog_id, revision_number)
+    except LookupError:
+        raise HTTPException(status_code=409, detail="Checkpoint content is not available in the revision history")
+
+async def get_checkpoint_conditional_controller(checkpoint_id: int, session: AsyncSession, if_none_match: str | None, accept_encoding: str | None) -> Response:
+    """
+    Serve GET /blogs/checkpoint/{checkpoint_id} with an ETag, answering 304 Not Modified without loading the content.
+    Bodies are served precompressed from checkpoint_body_cache when possible.
+    """
+    version = (await session.exec(
+        select(Checkpoint.id, Checkpoint.updated_at).where(Checkpoint.id == checkpoint_id)
+    )).first()
+    if not version:
+        raise HTTPException(status_code=404, detail="Checkpoint not found")
+
+    # Each encoding is its own representation with its own ETag, compare against the one served
+    encoding = choose_encoding(accept_encoding)
+    etag = encoded_etag(make_etag(*version), encoding)
+    headers = {"ETag": etag, "Cache-Control": CHECKPOINT_CACHE_CONTROL, "Vary": "Accept-Encoding"}
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    cache_key = (etag, encoding or "identity")
+    body = checkpoint_body_cache.get(cache_key)
+    if body is None:
+        checkpoint = await get_checkpoint_controller(checkpoint_id, session)
+        body = FastJSONResponse(checkpoint.model_dump()).body
+        if encoding:
+            body = await compress_async(body, encoding, maximum=True)
+        checkpoint_body_cache.put(cache_key, body)
+
+    if encoding:
+        headers["Content-Encoding"] = encoding
+    return Response(content=body, media_type="application/json", headers=headers)
+
+async def restore_checkpoint_controller(checkpoint_id: int, session: AsyncSession) -> RestoreCheckpointResponse:
+    """
+    Restore a blog to a checkpoint and drop the conversation after the checkpoint's message.
+    Later messages and their checkpoints are removed set-based with DELETE ... RETURNING in one
+    transaction, so the number of round-trips doesn't depend on the conversation length.
+    """
+    # Get the checkpoint to be restored together with the position of the message that created it
+    restore_point = (await session.exec(
+        select(Checkpoint, Message.sequence)
+        .join(Message, Message.checkpoint_id == Checkpoint.id)
+        .where(Checkpoint.id == checkpoint_id)
+    )).first()
+    if not restore_point:
         raise HTTPException(status_code=404, detail="Checkpoint not found")
+    checkpoint, message_sequence = restore_point
 
-    # Get the parent blog
-    blog = session.get(Blog, checkpoint.blog_id)
+    # Get the parent blog, locked so the restore revision number is allocated once
+    blog = await session.get(Blog, checkpoint.blog_id, with_for_update=True)
     if not blog:
         raise HTTPException(status_code=404, detail="Blog not found")
 
-    # Update blog content with the checkpoint's content
-    blog.content = checkpoint.content
-    blog.updated_at = datetime.now(timezone.utc)
-    session.add(blog)
+    # Checkpoints created before the revision log carry their own copy of the content
+    if checkpoint.revision_number is not None:
+        restored_content = await _load_checkpoint_content(session, blog.id, checkpoint.revision_number)
+    else:
+        # Legacy checkpoints taken before the first generation have no content
+        restored_content = checkpoint.content or ""
 
-    # Find the message that created this checkpoint with
-    message_statement = select(Message).where(Message.checkpoint_id == checkpoint_id)
-    checkpoint_message = session.exec(message_statement).first()
-    if not checkpoint_message:
-        raise HTTPException(status_code=404, detail="Message not found")
+    # Restoring always appends a revision, even when the content is unchanged: later messages are
+    # deleted below and a live session workflow only reloads its history on a newer revision.
+    # History after the checkpoint stays in the log.
+    append_revision(session, blog, restored_content, "restore")
 
-    # Delete subsequent message history
-    messages_to_delete_statement = select(Message).where(
-        Message.blog_id == blog.id,
-        Message.updated_at > checkpoint_message.updated_at
-    )
-    messages_to_delete = session.exec(messages_to_delete_statement).all()
+    # Update blog content with the checkpoint's content
+    blog.content = restored_content
+    blog.word_count = count_words(restored_content)
+    blog.updated_at = datetime.now(timezone.utc)
 
-    if messages_to_delete:
-        message_ids = [item.id for item in messages_to_delete]
-        checkpoint_ids_to_delete = [item.checkpoint_id for item in messages_to_delete if item.checkpoint_id]
-        session.query(Message).filter(Message.id.in_(message_ids)).delete(synchronize_session=False)
-        if checkpoint_ids_to_delete:
-            session.query(Checkpoint).filter(Checkpoint.id.in_(checkpoint_ids_to_delete)).delete(synchronize_session=False)
+    # Delete subsequent message history and the checkpoints it created
+    deleted_messages = (await session.execute(
+        delete(Message)
+        .where(Message.blog_id == blog.id, Message.sequence > message_sequence)
+        .returning(Message.id, Message.checkpoint_id)
+        .execution_options(synchronize_session=False)
+    )).all()
+    deleted_checkpoint_ids = [row.checkpoint_id for row in deleted_messages if row.checkpoint_id]
+    if deleted_checkpoint_ids:
+        await session.execute(
+            delete(Checkpoint)
+            .where(Checkpoint.id.in_(deleted_checkpoint_ids))
+            .execution_options(synchronize_session=False)
+        )
+    blog.message_count = max(blog.message_count - len(deleted_messages), 0)
 
     # Commit all changes to the database
-    session.commit()
-    session.refresh(blog)
+    await session.commit()
 
     # todo(afaq): dessummarize the instructions
 
-    # Return the updated blog and its message data
-    return get_blog_controller(blog.id, session)
+    return RestoreCheckpointResponse(
+        blog_id=blog.id,
+        content=blog.content,
+        content_hash=content_hash(blog.content),
+        updated_at=blog.updated_at,
+        deleted_message_ids=[row.id for row in deleted_messages],
+        deleted_checkpoint_ids=deleted_checkpoint_ids,
+    )
 
 
-def delete_checkpoint_controller(checkpoint_id: int, session: Session) -> dict:
+async def delete_checkpoint_controller(checkpoint_id: int, session: AsyncSession) -> dict:
     # Get the checkpoint
-    checkpoint = session.get(Checkpoint, checkpoint_id)
+    checkpoint = await session.get(Checkpoint, checkpoint_id)
     
     if not checkpoint:
         raise HTTPException(status_code=404, detail="Checkpoint not found")
 
     # Delete the checkpoint object.
-    session.delete(checkpoint)
-    session.commit()
+    await session.delete(checkpoint)
+    await session.commit()
 
     return {"message": f"Checkpoint {checkpoint_id} was deleted successfully."}
@@ -0,0 +1,54 @@
+# py modules
+import base64
+import hashlib
+import json
+from datetime import datetime
+from typing import Any, Optional
+from fastapi import HTTPException
+
+# common
+from common.revisions import apply_operations
+
+def format_sse_event(event: str, data: Any, event_id: Optional[int] = None) -> str:
+    """
+    Format a single Server-Sent Events frame. `event_id` lets clients resume with Last-Event-ID.
+    """
+    frame = f"id: {event_id}\n" if event_id is not None else ""
+    frame += f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+    return frame
+
+def encode_cursor(updated_at: datetime, item_id: int) -> str:
+    """
+    Opaque keyset pagination cursor for the (updated_at, id) position of the last returned row.
+    """
+    raw = f"{updated_at.isoformat()}|{item_id}"
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii")
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    try:
+        updated_at, item_id = base64.urlsafe_b64decode(cursor.encode("ascii")).decode("utf-8").split("|")
+        return datetime.fromisoformat(updated_at), int(item_id)
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+def make_etag(*parts: Any) -> str:
+    """Strong ETag derived from the given version markers"""
+    digest = hashlib.sha1(":".join(str(part) for part in parts).encode("utf-8")).hexdigest()
+    return f'"{digest}"'
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Whether an If-None-Match header value matches the current ETag"""
+    if not if_none_match:
+        return False
+    candidates = [candidate.strip() for candidate in if_none_match.split(",")]
+    # Weak comparison is what If-None-Match asks for, so ignore a W/ prefix
+    return "*" in candidates or etag in [candidate.removeprefix("W/") for candidate in candidates]
+
+def apply_text_operations(content: str, operations: list) -> str:
+    """
+    Apply PATCH operations to `content`, see common.revisions.apply_operations.
+    """
+    try:
+        return apply_operations(content, [operation.model_dump() for operation in operations])
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
@@ -1,5 +1,5 @@
 from datetime import datetime
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import Optional
 from models.message import Message
 
@@ -15,6 +15,9 @@ class CreateBlogRequest(BaseModel):
 class BlogSummary(BaseModel):
     id: int
     title: str
+    word_count: Optional[int] = None
+    message_count: Optional[int] = None
+    updated_at: Optional[datetime] = None
 
 class MessageResponse(BaseModel):
     id: str
@@ -23,6 +26,10 @@ class MessageResponse(BaseModel):
     checkpoint_id: Optional[int] = None
     timestamp: datetime
 
+class MessagePageResponse(BaseModel):
+    messages: list[MessageResponse]
+    next_cursor: Optional[int] = None
+
 class BlogDataResponse(BaseModel):
     id: int
     title: str
@@ -33,13 +40,31 @@ class BlogDataResponse(BaseModel):
     blog_length_min: int
     blog_length_max: int
     content: str
+    content_hash: Optional[str] = None  # Base version for PATCH /blogs/{id}
     messages: list[MessageResponse]
+    messages_cursor: Optional[int] = None  # Cursor for the next older page of messages
     created_at: datetime
     updated_at: datetime
 
 class UpdateBlogRequest(BaseModel):
     content: str
 
+class TextOperation(BaseModel):
+    """Replace `delete` characters at `offset` of the base document with `insert`"""
+    offset: int = Field(ge=0)
+    delete: int = Field(default=0, ge=0)
+    insert: str = ""
+
+class PatchBlogRequest(BaseModel):
+    base_hash: str  # content_hash of the document the operations were computed against
+    operations: list[TextOperation]
+
+class PatchBlogResponse(BaseModel):
+    id: int
+    content_hash: str
+    word_count: int
+    updated_at: datetime
+
 class CreateMessageRequest(BaseModel):
     title: str
     description: str
@@ -51,3 +76,23 @@ class CreateMessageRequest(BaseModel):
     user_message: str
     selected_context: list[str]
     blog_id: int
+
+class WorkflowJobResponse(BaseModel):
+    workflow_id: str
+    status: str
+    status_url: str
+    result_url: str
+
+class WorkflowJobStatusResponse(BaseModel):
+    workflow_id: str
+    status: str
+    started_at: Optional[datetime] = None
+    closed_at: Optional[datetime] = None
+
+class RestoreCheckpointResponse(BaseModel):
+    blog_id: int
+    content: Optional[str] = None
+    content_hash: str
+    updated_at: datetime
+    deleted_message_ids: list[int]
+    deleted_checkpoint_ids: list[int]
@@ -1,66 +1,109 @@
 # py modules
 import datetime
-from fastapi import APIRouter, Depends
-from sqlmodel import Session
+from typing import Optional
+from fastapi import APIRouter, Depends, Header, Query, Response
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 # controllers
 from .controller import (
     create_blog_controller,
     create_message_controller,
     list_blogs_controller,
-    get_blog_controller,
+    get_blog_conditional_controller,
+    list_messages_controller,
     create_checkpoint_controller,
-    get_checkpoint_controller,
+    get_checkpoint_conditional_controller,
     restore_checkpoint_controller,
     delete_checkpoint_controller,
-    update_blog_controller
+    update_blog_controller,
+    patch_blog_controller,
+    get_workflow_job_controller,
+    get_workflow_job_result_controller,
+    stream_workflow_job_events_controller,
+    stream_workflow_draft_controller
 )
 
 # commons
 from common.auth import TokenData, get_current_user
-from common.db import get_session
+from common.db import get_async_session
+from common.responses import FastJSONResponse
 
 # models
 from models.user import User
 from models.checkpoint import Checkpoint
 from models.message import Message
-from .models import CreateBlogRequest, BlogSummary, BlogDataResponse, UpdateBlogRequest, CreateMessageRequest
+from .models import CreateBlogRequest, BlogSummary, BlogDataResponse, UpdateBlogRequest, PatchBlogRequest, PatchBlogResponse, RestoreCheckpointResponse, CreateMessageRequest, WorkflowJobStatusResponse, MessagePageResponse
 
-router = APIRouter(prefix="/blogs", tags=["blogs"])
+# Blog payloads carry large markdown bodies and message lists, render them with orjson
+router = APIRouter(prefix="/blogs", tags=["blogs"], default_response_class=FastJSONResponse)
 
 @router.post("/")
-async def create_blog(blog: CreateBlogRequest, session: Session = Depends(get_session), current_user: TokenData = Depends(get_current_user)):
-    return await create_blog_controller(blog, session, current_user)
+async def create_blog(response: Response, blog: CreateBlogRequest, wait: bool = True, idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key", max_length=255), session: AsyncSession = Depends(get_async_session), current_user: TokenData = Depends(get_current_user)):
+    """Create a blog. Pass wait=false to get a 202 with the workflow ID instead of blocking until it completes. Supports Idempotency-Key."""
+    return await create_blog_controller(response, blog, session, current_user, wait, idempotency_key)
 
-@router.get("/", response_model=list[BlogSummary])
-def list_blogs(session: Session = Depends(get_session), current_user: TokenData = Depends(get_current_user)):
-    return list_blogs_controller(current_user, session)
+@router.get("/jobs/{workflow_id}", response_model=WorkflowJobStatusResponse)
+async def get_workflow_job(workflow_id: str, current_user: TokenData = Depends(get_current_user)):
+    return await get_workflow_job_controller(workflow_id, current_user)
 
-@router.get("/{blog_id}", response_model=BlogDataResponse)
-def get_blog(blog_id: int, session: Session = Depends(get_session), current_user: TokenData = Depends(get_current_user)):
-    return get_blog_controller(blog_id, session)
+@router.get("/jobs/{workflow_id}/result")
+async def get_workflow_job_result(response: Response, workflow_id: str, current_user: TokenData = Depends(get_current_user)):
+    return await get_workflow_job_result_controller(response, workflow_id, current_user)
 
-@router.put("/{blog_id}", response_model=BlogDataResponse)
-def update_blog(blog_id: int, blog: UpdateBlogRequest, session: Session = Depends(get_session), current_user: TokenData = Depends(get_current_user)):
-    return update_blog_controller(blog_id, blog, session, current_user)
+@router.get("/jobs/{workflow_id}/events")
+async def stream_workflow_job_events(workflow_id: str, last_event_id: int = Header(0, alias="Last-Event-ID"), current_user: TokenData = Depends(get_current_user)):
+    """Server-Sent Events stream of the workflow's stages and tool calls."""
+    return await stream_workflow_job_events_controller(workflow_id, current_user, last_event_id)
+
+@router.get("/jobs/{workflow_id}/draft")
+async def stream_workflow_draft(workflow_id: str, current_user: TokenData = Depends(get_current_user)):
+    """Server-Sent Events stream of the blog draft while the writing agent generates it."""
+    return await stream_workflow_draft_controller(workflow_id, current_user)
+
+# Read paths return FastJSONResponse directly so FastAPI skips response validation, the models document the body
+@router.get("/", response_model=None, responses={200: {"model": list[BlogSummary]}})
+async def list_blogs(limit: int = Query(50, ge=1, le=200), cursor: Optional[str] = None, session: AsyncSession = Depends(get_async_session), current_user: TokenData = Depends(get_current_user)):
+    """List blogs newest first. Pass the X-Next-Cursor response header back as `cursor` for the next page."""
+    return await list_blogs_controller(current_user, session, limit, cursor)
+
+@router.get("/{blog_id}", response_model=None, responses={200: {"model": BlogDataResponse}})
+async def get_blog(blog_id: int, messages_limit: int = Query(20, ge=1, le=100), if_none_match: Optional[str] = Header(None), session: AsyncSession = Depends(get_async_session), current_user: TokenData = Depends(get_current_user)):
+    """Get a blog with its latest messages. Older messages are paged through /blogs/{blog_id}/messages. Supports If-None-Match."""
+    return await get_blog_conditional_controller(blog_id, session, messages_limit, if_none_match)
+
+@router.get("/{blog_id}/messages", response_model=None, responses={200: {"model": MessagePageResponse}})
+async def list_messages(blog_id: int, before: Optional[int] = None, limit: int = Query(20, ge=1, le=100), session: AsyncSession = Depends(get_async_session), current_user: TokenData = Depends(get_current_user)):
+    """Page backwards through a blog's messages. Pass the previous page's cursor as `before`."""
+    return await list_messages_controller(blog_id, session, limit, before)
+
+@router.put("/{blog_id}", response_model=None, responses={200: {"model": BlogDataResponse}})
+async def update_blog(blog_id: int, blog: UpdateBlogRequest, session: AsyncSession = Depends(get_async_session), current_user: TokenData = Depends(get_current_user)):
+    return await update_blog_controller(blog_id, blog, session, current_user)
+
+@router.patch("/{blog_id}", response_model=PatchBlogResponse)
+async def patch_blog(blog_id: int, patch: PatchBlogRequest, session: AsyncSession = Depends(get_async_session), current_user: TokenData = Depends(get_current_user)):
+    """Apply text operations against `base_hash`. On 409 the client should resend the full document with PUT."""
+    return await patch_blog_controller(blog_id, patch, session, current_user)
 
 @router.post("/message")
-async def create_message(message: CreateMessageRequest, session: Session = Depends(get_session), current_user: TokenData = Depends(get_current_user)):
-    return await create_message_controller(message, session, current_user)
+async def create_message(response: Response, message: CreateMessageRequest, wait: bool = True, idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key", max_length=255), session: AsyncSession = Depends(get_async_session), current_user: TokenData = Depends(get_current_user)):
+    """Send a chat message. Pass wait=false to get a 202 with the workflow ID instead of blocking until it completes. Supports Idempotency-Key."""
+    return await create_message_controller(response, message, session, current_user, wait, idempotency_key)
 
 @router.post("/checkpoint/{message_id}", response_model=Checkpoint)
-def create_checkpoint(message_id: int, session: Session = Depends(get_session), current_user: TokenData = Depends(get_current_user)):
-    return create_checkpoint_controller(message_id, session)
+async def create_checkpoint(message_id: int, session: AsyncSession = Depends(get_async_session), current_user: TokenData = Depends(get_current_user)):
+    return await create_checkpoint_controller(message_id, session)
 
 @router.get("/checkpoint/{checkpoint_id}", response_model=Checkpoint)
-def get_checkpoint(checkpoint_id: int, session: Session = Depends(get_session), current_user: TokenData = Depends(get_current_user)):
-    return get_checkpoint_controller(checkpoint_id, session)
+async def get_checkpoint(checkpoint_id: int, if_none_match: Optional[str] = Header(None), accept_encoding: Optional[str] = Header(None), session: AsyncSession = Depends(get_async_session), current_user: TokenData = Depends(get_current_user)):
+    """Get a checkpoint. Supports If-None-Match, the body is served precompressed."""
+    return await get_checkpoint_conditional_controller(checkpoint_id, session, if_none_match, accept_encoding)
 
-@router.post("/checkpoint/{checkpoint_id}/restore", response_model=BlogDataResponse)
-def restore_checkpoint(checkpoint_id: int, session: Session = Depends(get_session), current_user: TokenData = Depends(get_current_user)):
-    return restore_checkpoint_controller(checkpoint_id, session)
+@router.post("/checkpoint/{checkpoint_id}/restore", response_model=RestoreCheckpointResponse)
+async def restore_checkpoint(checkpoint_id: int, session: AsyncSession = Depends(get_async_session), current_user: TokenData = Depends(get_current_user)):
+    return await restore_checkpoint_controller(checkpoint_id, session)
 
 @router.delete("/checkpoint/{checkpoint_id}")
-def delete_checkpoint(checkpoint_id: int, session: Session = Depends(get_session), current_user: TokenData = Depends(get_current_user)):
+async def delete_checkpoint(checkpoint_id: int, session: AsyncSession = Depends(get_async_session), current_user: TokenData = Depends(get_current_user)):
     """Delete checkpoint and remove references from messages."""
-    return delete_checkpoint_controller(checkpoint_id, session)
+    return await delete_checkpoint_controller(checkpoint_id, session)
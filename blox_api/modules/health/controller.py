@@ -0,0 +1,102 @@
+# py modules
+import asyncio
+import logging
+import os
+import signal
+import threading
+from fastapi import Response, status
+from sqlalchemy import text
+
+# common
+from common.db import async_engine
+
+logger = logging.getLogger(__name__)
+
+# Connections opened at startup so the first requests don't pay for the postgres handshake
+WARMUP_DB_CONNECTIONS = int(os.getenv("WARMUP_DB_CONNECTIONS", "4"))
+WARMUP_TIMEOUT_SECONDS = float(os.getenv("WARMUP_TIMEOUT_SECONDS", "20"))
+# After SIGTERM /health/ready reports draining for this long before uvicorn stops accepting
+# connections, long enough for the load balancer to take the process out of rotation
+PRE_STOP_SECONDS = float(os.getenv("SERVER_PRE_STOP_SECONDS", "5"))
+
+class ProcessState:
+    """Readiness of this API process: ready once warmed up, not ready again while draining"""
+    warmed_up: bool = False
+    draining: bool = False
+
+process_state = ProcessState()
+
+async def _warm_db_pool() -> None:
+    async def ping():
+        async with async_engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+
+    # Checked out concurrently so the pool ends up holding that many open connections
+    await asyncio.gather(*(ping() for _ in range(WARMUP_DB_CONNECTIONS)))
+
+async def _warm_temporal_client() -> None:
+    from temporal.temporal_client import temporal_client_manager
+
+    await temporal_client_manager.get_client()
+
+async def warm_up() -> None:
+    """
+    Open database connections and the Temporal client before the process reports ready.
+    The database is required; Temporal is best effort since reads don't need it and the
+    client reconnects lazily on the first workflow request.
+    """
+    await asyncio.wait_for(_warm_db_pool(), WARMUP_TIMEOUT_SECONDS)
+    try:
+        await asyncio.wait_for(_warm_temporal_client(), WARMUP_TIMEOUT_SECONDS)
+    except Exception as e:
+        logger.warning(
+            f"Temporal client warm-up failed: {e}",
+            extra={"error_type": type(e).__name__},
+        )
+    process_state.warmed_up = True
+    logger.info("API process warmed up", extra={"db_connections": WARMUP_DB_CONNECTIONS})
+
+def install_drain_signal_handler() -> None:
+    """
+    Chain a SIGTERM handler in front of uvicorn's: mark the process as draining straight away,
+    hand the signal to uvicorn after PRE_STOP_SECONDS. Called from the startup hook, which runs
+    in every worker process after uvicorn has installed its own handlers.
+    """
+    uvicorn_handler = signal.getsignal(signal.SIGTERM)
+    if not callable(uvicorn_handler):
+        return
+
+    def handle_sigterm(signum, frame):
+        if process_state.draining or PRE_STOP_SECONDS <= 0:
+            process_state.draining = True
+            uvicorn_handler(signum, frame)
+            return
+        process_state.draining = True
+        logger.info("SIGTERM received, draining", extra={"pre_stop_seconds": PRE_STOP_SECONDS})
+        timer = threading.Timer(PRE_STOP_SECONDS, uvicorn_handler, (signum, frame))
+        timer.daemon = True
+        timer.start()
+
+    signal.signal(signal.SIGTERM, handle_sigterm)
+
+async def shut_down() -> None:
+    """Report not ready from here on and close pooled database connections cleanly"""
+    process_state.draining = True
+    await async_engine.dispose()
+
+def temporal_metrics_controller() -> dict:
+    from temporal.temporal_client import get_temporal_client_metrics
+
+    return get_temporal_client_metrics()
+
+def liveness_controller() -> dict:
+    return {"status": "alive"}
+
+def readiness_controller(response: Response) -> dict:
+    if process_state.draining:
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+        return {"status": "draining"}
+    if not process_state.warmed_up:
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+        return {"status": "warming_up"}
+    return {"status": "ready"}
@@ -0,0 +1,25 @@
+# py modules
+from fastapi import APIRouter, Depends, Response
+
+# commons
+from common.auth import TokenData, get_current_user
+
+# controllers
+from .controller import liveness_controller, readiness_controller, temporal_metrics_controller
+
+router = APIRouter(prefix="/health", tags=["health"])
+
+@router.get("/live")
+async def liveness():
+    """The process is up and its event loop responds."""
+    return liveness_controller()
+
+@router.get("/ready")
+async def readiness(response: Response):
+    """503 until warm-up finished and again once shutdown started."""
+    return readiness_controller(response)
+
+@router.get("/temporal")
+async def temporal_metrics(current_user: TokenData = Depends(get_current_user)):
+    """Connection metrics of this process's Temporal client pool, for authenticated users only."""
+    return temporal_metrics_controller()
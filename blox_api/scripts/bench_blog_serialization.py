@@ -0,0 +1,87 @@
+"""
+Times GET /blogs/{id} response serialization for a synthetic 5k-word post with 200 messages
+(Message rows, each a user and an assistant entry in the response).
+
+    python scripts/bench_blog_serialization.py [rounds]
+
+before: the controller returns a BlogDataResponse and FastAPI's serialize_response dumps it,
+        validates it against response_model and renders it with JSONResponse (json.dumps)
+after:  the controller builds the orjson-ready dict and returns FastJSONResponse directly
+"""
+import asyncio
+import random
+import string
+import sys
+import timeit
+from datetime import datetime, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from fastapi import utils as fastapi_utils
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+
+from common.responses import FastJSONResponse
+from modules.blog.models import BlogDataResponse, MessageResponse
+
+WORDS = 5000
+# Message rows, the response has two entries per row
+MESSAGES = 200
+
+# Renamed between FastAPI releases
+_create_field = getattr(fastapi_utils, "create_model_field", None) or getattr(fastapi_utils, "create_response_field")
+RESPONSE_FIELD = _create_field(name="Response_get_blog", type_=BlogDataResponse, mode="serialization")
+
+def _text(words: int) -> str:
+    rng = random.Random(words)
+    return " ".join("".join(rng.choices(string.ascii_lowercase, k=rng.randint(2, 10))) for _ in range(words))
+
+def synthetic_blog() -> dict:
+    """Same shape get_blog_controller returns"""
+    now = datetime.now(timezone.utc)
+    messages = []
+    for index in range(MESSAGES):
+        messages.append({"id": f"user_{index}", "role": "user", "message": _text(40), "checkpoint_id": None, "timestamp": now})
+        messages.append({"id": f"assistant_{index}", "role": "assistant", "message": _text(120), "checkpoint_id": index, "timestamp": now})
+    return {
+        "id": 1,
+        "title": "Synthetic post",
+        "description": _text(30),
+        "desired_tone": "friendly",
+        "seo_keywords": ["alpha", "beta", "gamma"],
+        "target_audience": "developers",
+        "blog_length_min": 4000,
+        "blog_length_max": 6000,
+        "content": _text(WORDS),
+        "content_hash": "0" * 64,
+        "user_id": 1,
+        "messages": messages,
+        "messages_cursor": None,
+        "created_at": now,
+        "updated_at": now,
+    }
+
+# One loop for all rounds, so "before" isn't charged for creating event loops
+_loop = asyncio.new_event_loop()
+
+def before(data: dict) -> bytes:
+    # As the controller used to build it
+    messages = [MessageResponse.model_construct(**message) for message in data["messages"]]
+    model = BlogDataResponse.model_construct(**{**data, "messages": messages})
+    content = _loop.run_until_complete(serialize_response(field=RESPONSE_FIELD, response_content=model, is_coroutine=True))
+    return JSONResponse(content).body
+
+def after(data: dict) -> bytes:
+    return FastJSONResponse(data).body
+
+if __name__ == "__main__":
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    data = synthetic_blog()
+    print(f"body: {len(after(data)) / 1024:.0f} KB, {WORDS} words, {MESSAGES} messages ({len(data['messages'])} entries), {rounds} rounds")
+    results = {}
+    for name, function in (("before", before), ("after", after)):
+        seconds = min(timeit.repeat(lambda: function(data), number=rounds, repeat=3))
+        results[name] = seconds / rounds * 1000
+        print(f"{name:>6}: {results[name]:.3f} ms per response")
+    print(f"speedup: {results['before'] / results['after']:.1f}x")
@@ -0,0 +1,73 @@
+from dataclasses import dataclass
+import importlib.util
+import os
+
+import uvicorn
+
+def _env_bool(name: str, default: bool) -> bool:
+    return os.getenv(name, str(default)).lower() in ("1", "true", "yes", "on")
+
+@dataclass
+class ServerSettings:
+    """uvicorn settings for the API process, read from the environment"""
+    host: str
+    port: int
+    workers: int
+    loop: str
+    http: str
+    backlog: int
+    keep_alive_seconds: int
+    graceful_shutdown_seconds: int
+    limit_concurrency: int | None
+    proxy_headers: bool
+    forwarded_allow_ips: str
+    log_level: str
+
+    @classmethod
+    def from_env(cls) -> "ServerSettings":
+        limit_concurrency = os.getenv("SERVER_LIMIT_CONCURRENCY")
+        return cls(
+            host=os.getenv("SERVER_HOST", "0.0.0.0"),
+            port=int(os.getenv("SERVER_PORT", "8000")),
+            # The app is async, so one worker per core keeps every core busy
+            workers=int(os.getenv("WEB_CONCURRENCY", str(os.cpu_count() or 1))),
+            # uvloop and httptools come with uvicorn[standard]; fall back where they don't build
+            loop="uvloop" if importlib.util.find_spec("uvloop") else "asyncio",
+            http="httptools" if importlib.util.find_spec("httptools") else "h11",
+            backlog=int(os.getenv("SERVER_BACKLOG", "2048")),
+            # Longer than the load balancer's idle timeout, so the proxy closes idle connections first
+            keep_alive_seconds=int(os.getenv("SERVER_KEEP_ALIVE_SECONDS", "75")),
+            graceful_shutdown_seconds=int(os.getenv("SERVER_GRACEFUL_SHUTDOWN_SECONDS", "30")),
+            limit_concurrency=int(limit_concurrency) if limit_concurrency else None,
+            proxy_headers=_env_bool("SERVER_PROXY_HEADERS", True),
+            forwarded_allow_ips=os.getenv("FORWARDED_ALLOW_IPS", "127.0.0.1"),
+            log_level=os.getenv("SERVER_LOG_LEVEL", "info"),
+        )
+
+def main() -> None:
+    """
+    Production entry point: `python server.py`. Each worker warms up its database pool and
+    Temporal client on startup and only then reports ready on /health/ready. On SIGTERM a
+    worker reports draining for SERVER_PRE_STOP_SECONDS before uvicorn's graceful shutdown
+    starts (see modules/health/controller.py).
+    """
+    settings = ServerSettings.from_env()
+    uvicorn.run(
+        "main:app",
+        host=settings.host,
+        port=settings.port,
+        workers=settings.workers,
+        loop=settings.loop,
+        http=settings.http,
+        backlog=settings.backlog,
+        timeout_keep_alive=settings.keep_alive_seconds,
+        timeout_graceful_shutdown=settings.graceful_shutdown_seconds,
+        limit_concurrency=settings.limit_concurrency,
+        proxy_headers=settings.proxy_headers,
+        forwarded_allow_ips=settings.forwarded_allow_ips,
+        log_level=settings.log_level,
+        access_log=_env_bool("SERVER_ACCESS_LOG", False),
+    )
+
+if __name__ == "__main__":
+    main()
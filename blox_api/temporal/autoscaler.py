@@ -0,0 +1,346 @@
+"""
+Scales local worker processes per role on the backlog of the role's task queue.
+
+    python temporal/autoscaler.py run                  # control loop, bounds from AUTOSCALER_<ROLE>_* env
+    python temporal/autoscaler.py run --dry-run        # log decisions without starting or stopping workers
+    python temporal/autoscaler.py probe --workflows 500 --hold-seconds 60
+                                                       # synthetic workflow-queue backlog for trying it out
+    python temporal/autoscaler.py simulate             # replay a made-up backlog through the scaling rules
+
+Every AUTOSCALER_POLL_SECONDS the backlog of each queue is read with DescribeTaskQueue. A role
+wants ceil(backlog / target backlog per process) processes, clamped to its min/max. Hysteresis:
+scaling up needs that for AUTOSCALER_SCALE_UP_POLLS consecutive polls, scaling down needs the
+backlog to stay under the low watermark for AUTOSCALER_SCALE_DOWN_SECONDS, one process at a time.
+Retired workers get SIGTERM and drain their in-flight tasks (see temporal/worker.py).
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import math
+import os
+import signal
+import subprocess
+import sys
+import time
+import uuid
+from dataclasses import dataclass, field
+from datetime import timedelta
+from pathlib import Path
+from typing import Dict, List, Optional
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from temporalio.api.enums.v1 import TaskQueueType
+from temporalio.api.taskqueue.v1 import TaskQueue
+from temporalio.api.workflowservice.v1 import DescribeTaskQueueRequest
+from temporalio.client import Client
+
+from temporal.client_settings import TemporalSettings
+from temporal.launcher import SHUTDOWN_GRACE_SECONDS, start_worker
+from temporal.modules.blog.constants import constants
+from temporal.worker_settings import WORKER_ROLES
+
+logger = logging.getLogger("temporal.autoscaler")
+
+POLL_SECONDS = float(os.getenv("AUTOSCALER_POLL_SECONDS", "10"))
+SCALE_UP_POLLS = int(os.getenv("AUTOSCALER_SCALE_UP_POLLS", "2"))
+SCALE_DOWN_SECONDS = float(os.getenv("AUTOSCALER_SCALE_DOWN_SECONDS", "120"))
+# Scale down only once the backlog per process (after removing one) is under this share of the target
+SCALE_DOWN_WATERMARK = float(os.getenv("AUTOSCALER_SCALE_DOWN_WATERMARK", "0.5"))
+
+# Task queue and task type each role polls
+ROLE_QUEUES = {
+    "workflow": (constants.get("task_queue"), TaskQueueType.TASK_QUEUE_TYPE_WORKFLOW),
+    "llm": (constants.get("llm_task_queue"), TaskQueueType.TASK_QUEUE_TYPE_ACTIVITY),
+    "search": (constants.get("search_task_queue"), TaskQueueType.TASK_QUEUE_TYPE_ACTIVITY),
+    "db": (constants.get("db_task_queue"), TaskQueueType.TASK_QUEUE_TYPE_ACTIVITY),
+}
+
+# Backlog one process is expected to keep up with, roughly its concurrency
+_DEFAULT_TARGET_BACKLOG = {"workflow": 50, "llm": 8, "search": 8, "db": 20}
+
+# Registered by the workflow role (temporal/modules/probe/workflow.py)
+PROBE_WORKFLOW_TYPE = "AutoscalerProbe"
+
+@dataclass
+class RoleScalingSettings:
+    """Bounds and target of one role"""
+    role: str
+    min_processes: int
+    max_processes: int
+    target_backlog_per_process: int
+    scale_up_polls: int = SCALE_UP_POLLS
+    scale_down_seconds: float = SCALE_DOWN_SECONDS
+    scale_down_watermark: float = SCALE_DOWN_WATERMARK
+
+    @classmethod
+    def from_env(cls, role: str) -> "RoleScalingSettings":
+        prefix = f"AUTOSCALER_{role.upper()}"
+        min_processes = max(0, int(os.getenv(f"{prefix}_MIN", "1")))
+        return cls(
+            role=role,
+            min_processes=min_processes,
+            max_processes=max(min_processes, int(os.getenv(f"{prefix}_MAX", "4"))),
+            target_backlog_per_process=max(1, int(os.getenv(f"{prefix}_TARGET_BACKLOG", str(_DEFAULT_TARGET_BACKLOG[role])))),
+        )
+
+@dataclass
+class RoleState:
+    """Processes of one role and the hysteresis counters"""
+    settings: RoleScalingSettings
+    processes: List[subprocess.Popen] = field(default_factory=list)
+    # SIGTERM sent, waiting for them to drain: (process, kill deadline)
+    retiring: List[tuple[subprocess.Popen, float]] = field(default_factory=list)
+    polls_above: int = 0
+    below_since: Optional[float] = None
+
+def desired_processes(backlog: int, settings: RoleScalingSettings) -> int:
+    desired = math.ceil(backlog / settings.target_backlog_per_process)
+    return min(settings.max_processes, max(settings.min_processes, desired))
+
+def scaling_decision(state: RoleState, backlog: int, now: float) -> int:
+    """
+    Change in process count for this poll (positive to start, negative to retire), updating the
+    hysteresis counters. Kept free of I/O so it can be exercised with made-up backlogs.
+    """
+    settings = state.settings
+    current = len(state.processes)
+
+    # Bounds apply immediately, whatever the backlog
+    if current < settings.min_processes:
+        return settings.min_processes - current
+    if current > settings.max_processes:
+        return settings.max_processes - current
+
+    desired = desired_processes(backlog, settings)
+    if desired > current:
+        state.below_since = None
+        state.polls_above += 1
+        if state.polls_above >= settings.scale_up_polls:
+            state.polls_above = 0
+            return desired - current
+        return 0
+    state.polls_above = 0
+
+    low_watermark = settings.target_backlog_per_process * settings.scale_down_watermark
+    if current > settings.min_processes and backlog <= (current - 1) * low_watermark:
+        if state.below_since is None:
+            state.below_since = now
+        elif now - state.below_since >= settings.scale_down_seconds:
+            state.below_since = now
+            return -1
+        return 0
+    state.below_since = None
+    return 0
+
+async def queue_backlog(client: Client, namespace: str, role: str) -> int:
+    """Approximate backlog of the role's task queue"""
+    task_queue, task_queue_type = ROLE_QUEUES[role]
+    response = await client.workflow_service.describe_task_queue(
+        DescribeTaskQueueRequest(
+            namespace=namespace,
+            task_queue=TaskQueue(name=task_queue),
+            task_queue_type=task_queue_type,
+            report_stats=True,
+        )
+    )
+    return response.stats.approximate_backlog_count
+
+class Autoscaler:
+    def __init__(self, client: Client, namespace: str, roles: tuple[str, ...], dry_run: bool = False):
+        self.client = client
+        self.namespace = namespace
+        self.dry_run = dry_run
+        self.states: Dict[str, RoleState] = {role: RoleState(RoleScalingSettings.from_env(role)) for role in roles}
+
+    def _reap(self, state: RoleState) -> None:
+        """Drop exited processes, kill retiring ones past their grace period"""
+        for process in state.processes:
+            if process.poll() is not None:
+                logger.warning(
+                    "Worker process exited",
+                    extra={"role": state.settings.role, "pid": process.pid, "returncode": process.returncode},
+                )
+        state.processes = [process for process in state.processes if process.poll() is None]
+
+        still_retiring = []
+        for process, deadline in state.retiring:
+            if process.poll() is None:
+                if time.monotonic() >= deadline:
+                    process.kill()
+                still_retiring.append((process, deadline))
+        state.retiring = still_retiring
+
+    def _apply(self, state: RoleState, change: int) -> None:
+        role = state.settings.role
+        if self.dry_run:
+            # Track the count as if it had happened so the decisions stay meaningful
+            for _ in range(change):
+                state.processes.append(_DryRunProcess())
+            for _ in range(-change):
+                state.processes.pop()
+            return
+        for _ in range(change):
+            state.processes.append(start_worker(role))
+        for _ in range(-change):
+            # Newest first, older processes have the warmest caches
+            process = state.processes.pop()
+            process.terminate()
+            state.retiring.append((process, time.monotonic() + SHUTDOWN_GRACE_SECONDS))
+
+    async def poll_once(self) -> None:
+        now = time.monotonic()
+        for role, state in self.states.items():
+            self._reap(state)
+            try:
+                backlog = await queue_backlog(self.client, self.namespace, role)
+            except Exception as e:
+                # Don't scale on a missing reading, but keep the minimum running
+                logger.warning(f"Reading backlog failed: {e}", extra={"role": role, "error_type": type(e).__name__})
+                if len(state.processes) < state.settings.min_processes:
+                    self._apply(state, state.settings.min_processes - len(state.processes))
+                continue
+
+            change = scaling_decision(state, backlog, now)
+            if change:
+                logger.info(
+                    f"Scaling {role} workers {len(state.processes)} -> {len(state.processes) + change} (backlog {backlog})",
+                    extra={
+                        "role": role,
+                        "backlog": backlog,
+                        "processes_before": len(state.processes),
+                        "processes_after": len(state.processes) + change,
+                        "dry_run": self.dry_run,
+                    },
+                )
+                self._apply(state, change)
+
+    def stop(self) -> None:
+        for state in self.states.values():
+            self._apply(state, -len(state.processes))
+        deadline = time.monotonic() + SHUTDOWN_GRACE_SECONDS
+        for state in self.states.values():
+            for process, _ in state.retiring:
+                try:
+                    process.wait(timeout=max(0.0, deadline - time.monotonic()))
+                except subprocess.TimeoutExpired:
+                    process.kill()
+
+    async def run(self) -> None:
+        try:
+            while True:
+                await self.poll_once()
+                await asyncio.sleep(POLL_SECONDS)
+        finally:
+            self.stop()
+
+class _DryRunProcess:
+    """Stands in for a worker process in --dry-run"""
+    pid = None
+    returncode = None
+
+    def poll(self) -> None:
+        return None
+
+async def connect() -> tuple[Client, TemporalSettings]:
+    settings = TemporalSettings.from_env()
+    return await Client.connect(**settings.connect_kwargs()), settings
+
+async def run_autoscaler(roles: tuple[str, ...], dry_run: bool) -> None:
+    client, settings = await connect()
+    # Retire the workers on SIGTERM too, not only on Ctrl-C
+    asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, asyncio.current_task().cancel)
+    await Autoscaler(client, settings.namespace, roles, dry_run).run()
+
+async def start_probe_load(workflows: int, hold_seconds: float) -> None:
+    """
+    Start `workflows` probe runs on the workflow queue. Each holds a workflow task slot for
+    `hold_seconds`, so whatever the running workers can't take stays in the backlog until the
+    workflow role scales up. The runs complete on their own.
+    """
+    client, _ = await connect()
+    batch = uuid.uuid4().hex[:8]
+    await asyncio.gather(*(
+        client.start_workflow(
+            PROBE_WORKFLOW_TYPE,
+            hold_seconds,
+            id=f"autoscaler-probe-{batch}-{index}",
+            task_queue=constants.get("task_queue"),
+            execution_timeout=timedelta(seconds=hold_seconds * 10 + 300),
+        )
+        for index in range(workflows)
+    ))
+    logger.info("Probe workflows started", extra={"batch": batch, "workflows": workflows, "hold_seconds": hold_seconds})
+
+# (backlog, seconds since start, process count expected after the poll) with the settings below:
+# min 1, max 4, target 20 per process, 2 polls to scale up, 120 s below half the target to scale down
+SIMULATED_POLLS = (
+    (0, 0, 1),      # minimum started straight away
+    (100, 10, 1),   # first poll above target, waits for a second one
+    (100, 20, 4),   # second poll, straight to ceil(100 / 20) clamped to the max
+    (100, 30, 4),
+    (5, 40, 4),     # under the low watermark, timer starts
+    (60, 50, 4),    # back above it, timer resets
+    (5, 60, 4),
+    (5, 170, 4),    # 110 s below, not yet
+    (5, 180, 3),    # 120 s below, one process retired
+    (5, 240, 3),    # next retirement needs another full window
+    (5, 300, 2),
+    (5, 420, 1),
+    (0, 600, 1),    # never below the minimum
+    (30, 610, 1),   # a single poll above target doesn't scale up
+    (0, 620, 1),
+)
+
+def simulate() -> bool:
+    """Run SIMULATED_POLLS through scaling_decision, print each step, return whether all matched"""
+    state = RoleState(RoleScalingSettings(
+        role="db", min_processes=1, max_processes=4, target_backlog_per_process=20,
+        scale_up_polls=2, scale_down_seconds=120, scale_down_watermark=0.5,
+    ))
+    ok = True
+    for backlog, now, expected in SIMULATED_POLLS:
+        change = scaling_decision(state, backlog, now)
+        for _ in range(change):
+            state.processes.append(_DryRunProcess())
+        for _ in range(-change):
+            state.processes.pop()
+        matched = len(state.processes) == expected
+        ok = ok and matched
+        print(f"t={now:>4}s backlog={backlog:>4} change={change:>+3} processes={len(state.processes)} expected={expected} {'ok' if matched else 'MISMATCH'}")
+    return ok
+
+def main() -> None:
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(description="Scale worker processes on task-queue backlog")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run")
+    run_parser.add_argument("--roles", default=",".join(WORKER_ROLES))
+    run_parser.add_argument("--dry-run", action="store_true")
+
+    probe_parser = commands.add_parser("probe")
+    probe_parser.add_argument("--workflows", type=int, default=500)
+    probe_parser.add_argument("--hold-seconds", type=float, default=60)
+
+    commands.add_parser("simulate")
+
+    args = parser.parse_args()
+    if args.command == "run":
+        roles = tuple(role.strip() for role in args.roles.split(",") if role.strip())
+        unknown = [role for role in roles if role not in WORKER_ROLES]
+        if unknown:
+            parser.error(f"unknown roles: {', '.join(unknown)}")
+        try:
+            asyncio.run(run_autoscaler(roles, args.dry_run))
+        except (KeyboardInterrupt, asyncio.CancelledError):
+            pass
+    elif args.command == "probe":
+        asyncio.run(start_probe_load(args.workflows, args.hold_seconds))
+    else:
+        sys.exit(0 if simulate() else 1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+def _env_bool(name: str, default: bool) -> bool:
+    return os.getenv(name, str(default)).lower() in ("1", "true", "yes", "on")
+
+def _read_file(path: Optional[str]) -> Optional[bytes]:
+    return Path(path).read_bytes() if path else None
+
+@dataclass
+class TemporalSettings:
+    """Temporal server endpoint and connection behaviour, shared by the API and the worker"""
+    address: str
+    namespace: str
+    tls: bool
+    tls_server_root_ca_path: Optional[str]
+    tls_client_cert_path: Optional[str]
+    tls_client_key_path: Optional[str]
+    tls_server_name: Optional[str]
+    api_key: Optional[str]
+    # Clients (gRPC channels) the API keeps open, requests are spread over them round-robin
+    pool_size: int
+    connect_max_attempts: int
+    connect_initial_backoff_seconds: float
+    connect_max_backoff_seconds: float
+    health_check_interval_seconds: float
+
+    @classmethod
+    def from_env(cls) -> "TemporalSettings":
+        return cls(
+            address=os.getenv("TEMPORAL_ADDRESS", "localhost:7233"),
+            namespace=os.getenv("TEMPORAL_NAMESPACE", "default"),
+            tls=_env_bool("TEMPORAL_TLS", False),
+            tls_server_root_ca_path=os.getenv("TEMPORAL_TLS_SERVER_ROOT_CA"),
+            tls_client_cert_path=os.getenv("TEMPORAL_TLS_CLIENT_CERT"),
+            tls_client_key_path=os.getenv("TEMPORAL_TLS_CLIENT_KEY"),
+            tls_server_name=os.getenv("TEMPORAL_TLS_SERVER_NAME"),
+            api_key=os.getenv("TEMPORAL_API_KEY"),
+            pool_size=max(1, int(os.getenv("TEMPORAL_CLIENT_POOL_SIZE", "1"))),
+            connect_max_attempts=int(os.getenv("TEMPORAL_CONNECT_MAX_ATTEMPTS", "5")),
+            connect_initial_backoff_seconds=float(os.getenv("TEMPORAL_CONNECT_INITIAL_BACKOFF_SECONDS", "0.5")),
+            connect_max_backoff_seconds=float(os.getenv("TEMPORAL_CONNECT_MAX_BACKOFF_SECONDS", "10")),
+            health_check_interval_seconds=float(os.getenv("TEMPORAL_HEALTH_CHECK_INTERVAL_SECONDS", "30")),
+        )
+
+    def connect_kwargs(self) -> Dict[str, Any]:
+        """Keyword arguments for Client.connect, without the data converter and plugins"""
+        from temporalio.service import TLSConfig
+
+        tls: bool | TLSConfig = False
+        if self.tls or self.tls_client_cert_path:
+            tls = TLSConfig(
+                server_root_ca_cert=_read_file(self.tls_server_root_ca_path),
+                client_cert=_read_file(self.tls_client_cert_path),
+                client_private_key=_read_file(self.tls_client_key_path),
+                domain=self.tls_server_name,
+            )
+
+        kwargs: Dict[str, Any] = {
+            "target_host": self.address,
+            "namespace": self.namespace,
+            "tls": tls,
+        }
+        if self.api_key:
+            kwargs["api_key"] = self.api_key
+        return kwargs
@@ -0,0 +1,244 @@
+from __future__ import annotations
+
+import dataclasses
+import hashlib
+import os
+import sys
+import time
+import zlib
+from datetime import timedelta
+from pathlib import Path
+from typing import Iterable, List
+
+from temporalio.api.common.v1 import Payload
+from temporalio.client import ClientConfig, Plugin
+from temporalio.service import ConnectConfig, ServiceClient
+from temporalio.converter import DataConverter, PayloadCodec
+from temporalio.contrib.pydantic import pydantic_data_converter
+
+# Payloads at least this large are compressed
+PAYLOAD_COMPRESSION_THRESHOLD = int(os.getenv("PAYLOAD_COMPRESSION_THRESHOLD", str(4 * 1024)))
+# Compressed payloads at least this large are moved to the blob store and passed by reference
+PAYLOAD_CLAIM_CHECK_THRESHOLD = int(os.getenv("PAYLOAD_CLAIM_CHECK_THRESHOLD", str(128 * 1024)))
+# zlib ships with python; zstd needs the zstandard package in both the API and the worker
+PAYLOAD_COMPRESSION = os.getenv("PAYLOAD_COMPRESSION", "zlib")
+# "postgres" works wherever the database is reachable, "filesystem" needs a directory shared by all processes
+PAYLOAD_BLOB_STORE = os.getenv("PAYLOAD_BLOB_STORE", "postgres")
+PAYLOAD_BLOB_DIR = os.getenv("PAYLOAD_BLOB_DIR", "/tmp/blox-payload-blobs")
+# Blobs not written for this long are deleted by `python -m temporal.codec gc`, run it daily (cron).
+# Must exceed the namespace retention plus the longest a workflow run stays open, since replaying
+# a run decodes every payload in its history.
+PAYLOAD_BLOB_RETENTION_DAYS = int(os.getenv("PAYLOAD_BLOB_RETENTION_DAYS", "30"))
+
+ENCODING_ZLIB = b"binary/zlib"
+ENCODING_ZSTD = b"binary/zstd"
+ENCODING_CLAIM_CHECK = b"binary/claim-check"
+
+
+class PostgresBlobStore:
+    """Content-addressed blobs in the payload_blobs table"""
+
+    async def put(self, key: str, data: bytes) -> None:
+        from sqlalchemy import text
+        from common.db import async_engine
+
+        async with async_engine.begin() as conn:
+            # A blob written again is referenced by a newer history, its retention starts over
+            await conn.execute(
+                text("INSERT INTO payload_blobs (key, data) VALUES (:key, :data) ON CONFLICT (key) DO UPDATE SET created_at = now()"),
+                {"key": key, "data": data},
+            )
+
+    async def get(self, key: str) -> bytes:
+        from sqlalchemy import text
+        from common.db import async_engine
+
+        async with async_engine.connect() as conn:
+            data = (await conn.execute(text("SELECT data FROM payload_blobs WHERE key = :key"), {"key": key})).scalar_one_or_none()
+        if data is None:
+            raise KeyError(f"Payload blob {key} not found")
+        return bytes(data)
+
+    async def delete_expired(self, retention: timedelta) -> int:
+        """Delete blobs not written within `retention`, returns how many were deleted"""
+        from sqlalchemy import text
+        from common.db import async_engine
+
+        async with async_engine.begin() as conn:
+            result = await conn.execute(
+                text("DELETE FROM payload_blobs WHERE created_at < now() - :retention"),
+                {"retention": retention},
+            )
+        return result.rowcount
+
+
+class FilesystemBlobStore:
+    """Content-addressed blobs as files in a directory shared by the API and the workers"""
+
+    def __init__(self, directory: str):
+        self._directory = Path(directory)
+
+    def _path(self, key: str) -> Path:
+        return self._directory / key[:2] / key
+
+    async def put(self, key: str, data: bytes) -> None:
+        path = self._path(key)
+        if path.exists():
+            # A blob written again is referenced by a newer history, its retention starts over
+            path.touch()
+            return
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Write then rename so readers never see a partial blob
+        tmp_path = path.with_suffix(".tmp")
+        tmp_path.write_bytes(data)
+        tmp_path.replace(path)
+
+    async def get(self, key: str) -> bytes:
+        return self._path(key).read_bytes()
+
+    async def delete_expired(self, retention: timedelta) -> int:
+        """Delete blobs not written within `retention`, returns how many were deleted"""
+        cutoff = time.time() - retention.total_seconds()
+        deleted = 0
+        for path in self._directory.glob("*/*"):
+            if path.stat().st_mtime < cutoff:
+                path.unlink(missing_ok=True)
+                deleted += 1
+        return deleted
+
+
+def default_blob_store():
+    """The blob store selected by PAYLOAD_BLOB_STORE"""
+    return FilesystemBlobStore(PAYLOAD_BLOB_DIR) if PAYLOAD_BLOB_STORE == "filesystem" else PostgresBlobStore()
+
+
+def _compress(data: bytes) -> tuple[bytes, bytes]:
+    if PAYLOAD_COMPRESSION == "zstd":
+        import zstandard
+
+        return ENCODING_ZSTD, zstandard.ZstdCompressor(level=3).compress(data)
+    return ENCODING_ZLIB, zlib.compress(data, 6)
+
+def _decompress(encoding: bytes, data: bytes) -> bytes:
+    if encoding == ENCODING_ZSTD:
+        import zstandard
+
+        return zstandard.ZstdDecompressor().decompress(data)
+    return zlib.decompress(data)
+
+
+class BlogPayloadCodec(PayloadCodec):
+    """
+    Compresses large payloads, and replaces those still large after compression with a reference
+    to the blob store (claim check). Blog content and message history then stay out of workflow
+    history, which keeps replays fast and payloads under the server's size limits.
+    Payloads that this codec didn't produce are passed through unchanged.
+    """
+
+    def __init__(self, blob_store=None):
+        self._blob_store = blob_store or default_blob_store()
+
+    async def encode(self, payloads: Iterable[Payload]) -> List[Payload]:
+        encoded = []
+        for payload in payloads:
+            data = payload.SerializeToString()
+            if len(data) < PAYLOAD_COMPRESSION_THRESHOLD:
+                encoded.append(payload)
+                continue
+
+            encoding, compressed = _compress(data)
+            if len(compressed) < PAYLOAD_CLAIM_CHECK_THRESHOLD:
+                encoded.append(Payload(metadata={"encoding": encoding}, data=compressed))
+                continue
+
+            key = hashlib.sha256(compressed).hexdigest()
+            await self._blob_store.put(key, compressed)
+            encoded.append(Payload(
+                metadata={"encoding": ENCODING_CLAIM_CHECK, "blob-encoding": encoding},
+                data=key.encode("ascii"),
+            ))
+        return encoded
+
+    async def decode(self, payloads: Iterable[Payload]) -> List[Payload]:
+        decoded = []
+        for payload in payloads:
+            encoding = payload.metadata.get("encoding", b"")
+            if encoding == ENCODING_CLAIM_CHECK:
+                key = payload.data.decode("ascii")
+                compressed = await self._blob_store.get(key)
+                if hashlib.sha256(compressed).hexdigest() != key:
+                    raise ValueError(f"Payload blob {key} is corrupted")
+                data = _decompress(payload.metadata["blob-encoding"], compressed)
+            elif encoding in (ENCODING_ZLIB, ENCODING_ZSTD):
+                data = _decompress(encoding, payload.data)
+            else:
+                decoded.append(payload)
+                continue
+
+            original = Payload()
+            original.ParseFromString(data)
+            decoded.append(original)
+        return decoded
+
+
+def build_data_converter(blob_store=None) -> DataConverter:
+    """pydantic data converter with the blog payload codec, used by both the API and the worker"""
+    return dataclasses.replace(pydantic_data_converter, payload_codec=BlogPayloadCodec(blob_store))
+
+
+def build_agents_data_converter(blob_store=None) -> DataConverter:
+    """
+    The OpenAI agents payload converter with the blog payload codec, what the worker's client ends up
+    with once its plugins ran. The agents plugin rejects any other payload converter.
+    """
+    # Worker only, the API must not import the agents stack
+    try:
+        from temporalio.contrib.openai_agents import OpenAIPayloadConverter
+    except ImportError:
+        # temporalio 1.17 doesn't export it yet
+        from temporalio.contrib.openai_agents._temporal_openai_agents import _OpenAIPayloadConverter as OpenAIPayloadConverter
+    return DataConverter(payload_converter_class=OpenAIPayloadConverter, payload_codec=BlogPayloadCodec(blob_store))
+
+
+class PayloadCodecPlugin(Plugin):
+    """
+    Sets the blog payload codec on the client's data converter. The OpenAI agents plugin replaces
+    the worker client's data converter with its own, list this plugin after it so the worker
+    decodes what the API encodes and the other way around.
+    """
+
+    def __init__(self, blob_store=None):
+        self._codec = BlogPayloadCodec(blob_store)
+
+    def init_client_plugin(self, next: Plugin) -> None:
+        self.next_client_plugin = next
+
+    def configure_client(self, config: ClientConfig) -> ClientConfig:
+        config["data_converter"] = dataclasses.replace(config["data_converter"], payload_codec=self._codec)
+        return self.next_client_plugin.configure_client(config)
+
+    async def connect_service_client(self, config: ConnectConfig) -> ServiceClient:
+        return await self.next_client_plugin.connect_service_client(config)
+
+
+async def collect_expired_blobs(blob_store=None, retention: timedelta = timedelta(days=PAYLOAD_BLOB_RETENTION_DAYS)) -> int:
+    """
+    Delete claim-check blobs that no workflow history within the retention can reference anymore.
+    Returns how many were deleted.
+    """
+    return await (blob_store or default_blob_store()).delete_expired(retention)
+
+
+def main(argv: list[str]) -> int:
+    import asyncio
+
+    if argv[:1] != ["gc"]:
+        print("usage: python -m temporal.codec gc")
+        return 2
+    deleted = asyncio.run(collect_expired_blobs())
+    print(f"Deleted {deleted} payload blobs older than {PAYLOAD_BLOB_RETENTION_DAYS} days")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,102 @@
+"""
+Starts worker processes per role, WORKER_<ROLE>_PROCESSES of each (see temporal/worker_settings.py).
+
+    python temporal/launcher.py                  # every role, process counts from env
+    python temporal/launcher.py llm=4 db=2       # override counts, roles not listed aren't started
+
+Each process runs temporal/worker.py with WORKER_ROLES set to its role. When one process exits
+the others are stopped and the launcher exits with its code, leaving restarts to the supervisor.
+"""
+from __future__ import annotations
+
+import logging
+import os
+import signal
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from temporal.worker_settings import WORKER_ROLES, WorkerRoleSettings
+
+logger = logging.getLogger("temporal.launcher")
+
+WORKER_SCRIPT = Path(__file__).parent / "worker.py"
+# Workers get WORKER_SHUTDOWN_GRACE_SECONDS to finish in-flight tasks after SIGTERM, killed a little after that
+SHUTDOWN_GRACE_SECONDS = float(os.getenv("WORKER_SHUTDOWN_GRACE_SECONDS", "30")) + 5
+
+def parse_counts(args: List[str]) -> Dict[str, int]:
+    """Process count per role from role=count arguments, or from env when none are given"""
+    if not args:
+        return {role: WorkerRoleSettings.from_env(role).processes for role in WORKER_ROLES}
+
+    counts = {}
+    for arg in args:
+        role, _, count = arg.partition("=")
+        if role not in WORKER_ROLES or not count.isdigit():
+            raise SystemExit(f"Invalid argument {arg!r}, expected role=count with role one of {', '.join(WORKER_ROLES)}")
+        counts[role] = int(count)
+    return counts
+
+def start_worker(role: str) -> subprocess.Popen:
+    env = {**os.environ, "WORKER_ROLES": role}
+    return subprocess.Popen([sys.executable, str(WORKER_SCRIPT)], env=env)
+
+def stop_workers(processes: List[subprocess.Popen]) -> None:
+    for process in processes:
+        if process.poll() is None:
+            process.terminate()
+
+    deadline = time.monotonic() + SHUTDOWN_GRACE_SECONDS
+    for process in processes:
+        try:
+            process.wait(timeout=max(0.0, deadline - time.monotonic()))
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+
+def main() -> int:
+    logging.basicConfig(level=logging.INFO)
+    counts = parse_counts(sys.argv[1:])
+
+    processes: List[subprocess.Popen] = []
+    for role, count in counts.items():
+        for _ in range(count):
+            processes.append(start_worker(role))
+        logger.info("Started worker processes", extra={"role": role, "processes": count})
+
+    if not processes:
+        logger.error("No worker processes to start")
+        return 1
+
+    stopping = False
+
+    def handle_signal(signum, frame):
+        nonlocal stopping
+        stopping = True
+
+    signal.signal(signal.SIGTERM, handle_signal)
+    signal.signal(signal.SIGINT, handle_signal)
+
+    exit_code = 0
+    try:
+        while not stopping:
+            exited = [process for process in processes if process.poll() is not None]
+            if exited:
+                exit_code = exited[0].returncode or 1
+                logger.error(
+                    "Worker process exited, stopping the others",
+                    extra={"pid": exited[0].pid, "returncode": exited[0].returncode},
+                )
+                break
+            time.sleep(1)
+    finally:
+        stop_workers(processes)
+
+    return exit_code
+
+if __name__ == "__main__":
+    sys.exit(main())
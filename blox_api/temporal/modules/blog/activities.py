@@ -5,8 +5,8 @@ from temporalio import activity
 from datetime import datetime, timezone
 from sqlalchemy.orm import selectinload
 from temporalio.exceptions import ApplicationError
-from sqlmodel import Session, select
-from sqlalchemy import desc
+from sqlmodel import select
+from sqlalchemy import desc, update
 import asyncio
 
 # Import activity logger
@@ -14,7 +14,7 @@ from temporalio import activity as activity_module
 
 # models
 from .models import OpenAIMessage, WebSearchToolResponse, BlogDetails, MessageResponse
-from models.blog import Blog
+from models.blog import Blog, count_words
 from models.message import Message
 from models.user import User  # Import User to ensure SQLAlchemy can resolve relationships
 from models.checkpoint import Checkpoint  # Import Checkpoint to ensure SQLAlchemy can resolve relationships
@@ -23,7 +23,8 @@ from models.checkpoint import Checkpoint  # Import Checkpoint to ensure SQLAlche
 from .constants import constants
 
 # common
-from common.db import get_session
+from common.db import async_session
+from common.revisions import append_revision
 
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 TAVILY_API_KEY = os.getenv("TAVILY_API_KEY")
@@ -117,12 +118,12 @@ async def get_blog_details(blog_id: int) -> BlogDetails:
             },
         )
 
-        with next(get_session()) as session:
+        async with async_session() as session:
             # Get blog data
-            blog = session.exec(
+            blog = (await session.exec(
                 select(Blog)
                 .where(Blog.id == blog_id)
-            ).first()
+            )).first()
 
             if blog is None:
                 activity_module.logger.error(
@@ -136,8 +137,8 @@ async def get_blog_details(blog_id: int) -> BlogDetails:
                 raise ApplicationError(f"Blog with id {blog_id} not found", non_retryable=True)
 
             # Get last 10 messages
-            messages_query = select(Message).where(Message.blog_id == blog_id).order_by(Message.updated_at.asc()).limit(10)
-            messages_db = session.exec(messages_query).all()
+            messages_query = select(Message).where(Message.blog_id == blog_id).order_by(Message.sequence.desc()).limit(10)
+            messages_db = list(reversed((await session.exec(messages_query)).all()))
 
             # Convert to OpenAI Message format
             messages = []
@@ -161,7 +162,8 @@ async def get_blog_details(blog_id: int) -> BlogDetails:
                 user_message=None,  # Will be set from workflow input
                 general_instructions=blog.instructions,  # General instructions from DB
                 user_prompt=None,  # Will be set by instruction agent
-                tool_call_counters={}
+                tool_call_counters={},
+                revision=blog.current_revision
             )
 
             activity_module.logger.info(
@@ -194,9 +196,10 @@ async def get_blog_details(blog_id: int) -> BlogDetails:
 
 
 @activity.defn
-async def save_blog_content(blog_id: int, content: Optional[str] = None, instructions: Optional[str] = None) -> None:
+async def save_blog_content(blog_id: int, content: Optional[str] = None, instructions: Optional[str] = None) -> int:
     """
     Saves blog content and optionally instructions to database.
+    Returns the blog's current revision after the save.
     """
     try:
         activity_module.logger.info(
@@ -211,8 +214,9 @@ async def save_blog_content(blog_id: int, content: Optional[str] = None, instruc
             },
         )
 
-        with next(get_session()) as session:
-            blog = session.get(Blog, blog_id)
+        async with async_session() as session:
+            # Lock the row so the revision number is allocated once
+            blog = await session.get(Blog, blog_id, with_for_update=True)
             if not blog:
                 activity_module.logger.error(
                     f"Blog with id {blog_id} not found",
@@ -225,13 +229,15 @@ async def save_blog_content(blog_id: int, content: Optional[str] = None, instruc
                 raise ApplicationError(f"Blog with id {blog_id} not found", non_retryable=True)
 
             if content:
+                append_revision(session, blog, content, "ai")
                 blog.content = content
+                blog.word_count = count_words(content)
             blog.updated_at = datetime.now(timezone.utc)
             if instructions:
                 blog.instructions = instructions
 
             session.add(blog)
-            session.commit()
+            await session.commit()
 
             activity_module.logger.info(
                 "Save blog content activity completed successfully",
@@ -243,6 +249,8 @@ async def save_blog_content(blog_id: int, content: Optional[str] = None, instruc
                     "updated_at": blog.updated_at.isoformat() if blog.updated_at else None,
                 },
             )
+
+            return blog.current_revision
     except Exception as e:
         if isinstance(e, ApplicationError):
             raise
@@ -275,16 +283,28 @@ async def save_messages(blog_id: int, user_message: str, ai_message: str) -> Mes
             },
         )
 
-        with next(get_session()) as session:
+        async with async_session() as session:
+            # Allocate the next per-blog sequence number atomically
+            sequence = (await session.execute(
+                update(Blog)
+                .where(Blog.id == blog_id)
+                .values(
+                    message_count=Blog.message_count + 1,
+                    last_message_sequence=Blog.last_message_sequence + 1,
+                )
+                .returning(Blog.last_message_sequence)
+            )).scalar_one()
+
             message = Message(
                 user_message=user_message,
                 ai_message=ai_message,
                 blog_id=blog_id,
+                sequence=sequence,
                 updated_at=datetime.now(timezone.utc)
             )
             session.add(message)
-            session.commit()
-            session.refresh(message)
+            await session.commit()
+            await session.refresh(message)
 
             activity_module.logger.info(
                 "Save messages activity completed successfully",
@@ -343,7 +363,7 @@ async def create_new_blog(title: str, description: str, desired_tone: str, seo_k
             },
         )
 
-        with next(get_session()) as session:
+        async with async_session() as session:
             blog = Blog(
                 title=title,
                 description=description,
@@ -355,8 +375,8 @@ async def create_new_blog(title: str, description: str, desired_tone: str, seo_k
                 user_id=user_id
             )
             session.add(blog)
-            session.commit()
-            session.refresh(blog)
+            await session.commit()
+            await session.refresh(blog)
 
             activity_module.logger.info(
                 "Create new blog activity completed successfully",
@@ -16,8 +16,25 @@ from .activities import web_search
 # policies
 from ..policies import DEFAULT_ACTIVITY_OPTS
 
+# Task queue per activity, everything not listed here talks to the database
+ACTIVITY_TASK_QUEUES = {
+    "web_search": constants.get("search_task_queue"),
+}
+
+def activity_task_queue(activity_name: str) -> str:
+    return ACTIVITY_TASK_QUEUES.get(activity_name, constants.get("db_task_queue"))
+
+def record_progress(stage: str, detail: str | None = None) -> None:
+    """
+    Record a progress event on the running workflow, if it tracks progress.
+    """
+    instance = workflow.instance()
+    if hasattr(instance, "record_progress"):
+        instance.record_progress(stage, detail)
+
 async def exec_activity(name_or_fn, *post_args):
     activity_name = name_or_fn.__name__ if hasattr(name_or_fn, '__name__') else str(name_or_fn)
+    record_progress(activity_name)
 
     workflow.logger.info(
         "Executing activity",
@@ -31,6 +48,7 @@ async def exec_activity(name_or_fn, *post_args):
     result = await workflow.execute_activity(
         name_or_fn,
         args=post_args,
+        task_queue=activity_task_queue(activity_name),
         **DEFAULT_ACTIVITY_OPTS,
     )
 
@@ -91,6 +109,8 @@ def create_agent_tool(
                 )
                 return f"Max calls exceeded for tool: {tool_name}"
 
+            record_progress(tool_name, input)
+
             # identical to SDK's as_tool implementation
             output = await Runner.run(
                 starting_agent=agent,
@@ -171,6 +191,8 @@ def create_web_search_tool():
                 )
                 return "Max search calls exceeded. Summarize the results now."
 
+            record_progress(web_search_tool_name, query)
+
             # Call the web search activity
             results, updated_count = await exec_activity(
                 web_search,
@@ -1,4 +1,20 @@
 constants = {
+    # The API starts and queries the workflow by these names so it never imports the workflow code
+    "blog_workflow_name": "BlogWorkflow",
+    "blog_workflow_progress_query": "get_progress",
+    "task_queue": "openai-agents-task-queue",
+    # Activities run on their own queues so each workload class gets its own workers (see temporal/worker.py)
+    "llm_task_queue": "blog-llm-task-queue",
+    "search_task_queue": "blog-search-task-queue",
+    "db_task_queue": "blog-db-task-queue",
+    "blog_session_workflow_name": "BlogSessionWorkflow",
+    "blog_session_message_update": "send_message",
+    # A session with no messages for this long completes, the next message starts a new one
+    "session_idle_timeout_minutes": 30,
+    # Continue-as-new after this many messages even if the server hasn't suggested it yet
+    "session_max_messages_per_run": 25,
+    # Conversation pairs kept in session state, same as get_blog_details loads
+    "session_history_pairs": 10,
     "max_web_search_calls": 2,
     "max_agent_tool_calls": 2,
     "web_search_tool_name": "web_search",
@@ -7,4 +23,9 @@ constants = {
     "outline_agent_tool_name": "outline_agent",
     "writing_agent_tool_name": "writing_agent",
     "tavily_search_depth": "advanced",
+    "progress_detail_max_length": 200,
+    "draft_stream_topic_prefix": "blog-draft:",
+    "draft_stream_min_chunk_chars": 120,
+    "draft_stream_max_chunk_chars": 600,
+    "draft_stream_flush_interval_seconds": 0.25,
 }
\ No newline at end of file
@@ -0,0 +1,186 @@
+# py modules
+import json
+import re
+import time
+from typing import Any, AsyncIterator, Optional
+from agents import Model, ModelProvider, ModelResponse, OpenAIProvider, Usage
+from temporalio import activity
+
+# constants
+from .constants import constants
+from .topics import draft_topic
+
+# common
+from common.pubsub import publish
+
+_JSON_ESCAPES = {'"': '"', '\\': '\\', '/': '/', 'b': '\b', 'f': '\f', 'n': '\n', 'r': '\r', 't': '\t'}
+
+class PartialJsonStringReader:
+    """
+    Incrementally decodes the string value of `key` from a JSON document that is still being generated.
+    Each call to feed() returns only the newly decoded text, so the document is scanned once overall.
+    """
+
+    def __init__(self, key: str):
+        self._key_pattern = re.compile(r'"%s"\s*:\s*"' % re.escape(key))
+        self._raw = ""
+        self._pos: Optional[int] = None
+        self.started = False
+        self.finished = False
+
+    def feed(self, chunk: str) -> str:
+        self._raw += chunk
+        if self.finished:
+            return ""
+        if self._pos is None:
+            match = self._key_pattern.search(self._raw)
+            if not match:
+                return ""
+            self._pos = match.end()
+            self.started = True
+
+        decoded = []
+        raw, i = self._raw, self._pos
+        while i < len(raw):
+            char = raw[i]
+            if char == '"':
+                self.finished = True
+                break
+            if char != '\\':
+                decoded.append(char)
+                i += 1
+                continue
+            # Escape sequences may be split across chunks, wait for the rest
+            if i + 1 >= len(raw):
+                break
+            escaped = raw[i + 1]
+            if escaped != 'u':
+                decoded.append(_JSON_ESCAPES.get(escaped, escaped))
+                i += 2
+                continue
+            if i + 6 > len(raw):
+                break
+            code = int(raw[i + 2:i + 6], 16)
+            if 0xD800 <= code <= 0xDBFF:
+                # Surrogate pair, decode both halves together
+                if i + 12 > len(raw):
+                    break
+                low = int(raw[i + 8:i + 12], 16)
+                decoded.append(chr(0x10000 + ((code - 0xD800) << 10) + (low - 0xDC00)))
+                i += 12
+                continue
+            decoded.append(chr(code))
+            i += 6
+
+        self._pos = i
+        return "".join(decoded)
+
+
+class DraftPublisher:
+    """
+    Batches decoded draft text and publishes it so the API can relay it to the browser.
+    Publishing is best effort, a failure is logged and never fails the model call.
+    """
+
+    def __init__(self, workflow_id: str):
+        self._workflow_id = workflow_id
+        self._topic = draft_topic(workflow_id)
+        self._pending = ""
+        self._last_flush = time.monotonic()
+
+    async def _publish(self, message: dict) -> None:
+        try:
+            await publish(self._topic, message)
+        except Exception as e:
+            activity.logger.warning(
+                f"Failed to publish draft chunk: {e}",
+                extra={
+                    "activity_name": "draft_stream",
+                    "workflow_id": self._workflow_id,
+                    "error_type": type(e).__name__,
+                },
+            )
+
+    async def start(self) -> None:
+        await self._publish({"type": "start"})
+
+    async def feed(self, text: str) -> None:
+        self._pending += text
+        elapsed = time.monotonic() - self._last_flush
+        if len(self._pending) >= constants.get("draft_stream_min_chunk_chars") or elapsed >= constants.get("draft_stream_flush_interval_seconds"):
+            await self.flush()
+
+    async def flush(self) -> None:
+        max_chars = constants.get("draft_stream_max_chunk_chars")
+        while self._pending:
+            chunk, self._pending = self._pending[:max_chars], self._pending[max_chars:]
+            await self._publish({"type": "delta", "text": chunk})
+        self._last_flush = time.monotonic()
+
+
+class DraftStreamingModel(Model):
+    """
+    Wraps a model so that responses whose structured output carries a `blog_post` are streamed
+    from the provider. Partial blog content is published as it arrives; the assembled response
+    is returned to the model activity exactly like a non-streamed call.
+    """
+
+    def __init__(self, model: Model):
+        self._model = model
+
+    @staticmethod
+    def _streams_blog_post(output_schema) -> bool:
+        if output_schema is None or output_schema.is_plain_text():
+            return False
+        return "blog_post" in json.dumps(output_schema.json_schema())
+
+    async def get_response(self, system_instructions, input, model_settings, tools, output_schema, handoffs, tracing, **kwargs) -> ModelResponse:
+        if not activity.in_activity() or not self._streams_blog_post(output_schema):
+            return await self._model.get_response(system_instructions, input, model_settings, tools, output_schema, handoffs, tracing, **kwargs)
+
+        reader = PartialJsonStringReader("blog_post")
+        publisher = DraftPublisher(activity.info().workflow_id)
+        response = None
+
+        async for event in self._model.stream_response(system_instructions, input, model_settings, tools, output_schema, handoffs, tracing, **kwargs):
+            if event.type == "response.output_text.delta":
+                was_started = reader.started
+                text = reader.feed(event.delta)
+                if reader.started and not was_started:
+                    await publisher.start()
+                if text:
+                    await publisher.feed(text)
+            elif event.type == "response.completed":
+                response = event.response
+
+        await publisher.flush()
+
+        if response is None:
+            raise RuntimeError("Model stream ended without a completed response")
+
+        usage = (
+            Usage(
+                requests=1,
+                input_tokens=response.usage.input_tokens,
+                output_tokens=response.usage.output_tokens,
+                total_tokens=response.usage.total_tokens,
+                input_tokens_details=response.usage.input_tokens_details,
+                output_tokens_details=response.usage.output_tokens_details,
+            )
+            if response.usage
+            else Usage()
+        )
+        return ModelResponse(output=response.output, usage=usage, response_id=response.id)
+
+    def stream_response(self, *args, **kwargs) -> AsyncIterator[Any]:
+        return self._model.stream_response(*args, **kwargs)
+
+
+class DraftStreamingModelProvider(ModelProvider):
+    """Model provider for the OpenAI agents plugin that hands out DraftStreamingModel wrappers"""
+
+    def __init__(self, provider: Optional[ModelProvider] = None):
+        self._provider = provider or OpenAIProvider()
+
+    def get_model(self, model_name: Optional[str]) -> Model:
+        return DraftStreamingModel(self._provider.get_model(model_name))
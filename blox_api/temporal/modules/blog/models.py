@@ -33,6 +33,7 @@ class BlogDetails:
     user_prompt: Optional[str] = None  # Enhanced user message for multi-agent system
     # Consolidated tool call counters for workflow determinism - track usage per workflow execution
     tool_call_counters: dict[str, int] = None  # Track calls to all tools (agents and simple tools)
+    revision: Optional[int] = None  # blogs.current_revision the details were loaded at
 
     def __post_init__(self):
         if self.tool_call_counters is None:
@@ -53,6 +54,9 @@ class BlogWorkflowInput:
     user_message: Optional[str] = None
     blog_id: Optional[int] = None  # None for new blogs, ID for existing blogs
     user_selected_context: Optional[list[str]] = None
+    # Set for requests with an idempotency key: the run fails instead of completing with an
+    # error result, so the key's workflow ID can be reused by a retry
+    fail_on_error: bool = False
 
 @dataclass
 class BlogInstructions:
@@ -68,3 +72,31 @@ class MessageResponse:
     updated_at: datetime
     blog_id: int
     checkpoint_id: Optional[int] = None
+
+@dataclass
+class WorkflowProgressEvent:
+    """A single stage transition or tool call recorded by BlogWorkflow"""
+    sequence: int
+    stage: str
+    detail: Optional[str] = None
+    timestamp: Optional[datetime] = None
+
+@dataclass
+class WorkflowProgress:
+    """Progress snapshot returned by the BlogWorkflow progress query"""
+    stage: str
+    events: list[WorkflowProgressEvent]
+
+@dataclass
+class BlogSessionInput:
+    """Input of a per-blog session workflow, carried over on continue-as-new"""
+    blog_id: int
+    user_id: int
+    blog_details: Optional[BlogDetails] = None  # None until the first message loads it
+
+@dataclass
+class BlogSessionMessage:
+    """A chat message delivered to a session workflow as an update"""
+    user_message: str
+    user_selected_context: Optional[list[str]] = None
+    revision: Optional[int] = None  # blogs.current_revision as seen by the API, a newer one reloads the details
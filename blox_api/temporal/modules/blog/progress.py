@@ -0,0 +1,39 @@
+# py modules
+from temporalio import workflow
+
+# models
+from .models import WorkflowProgress, WorkflowProgressEvent
+
+# constants
+from .constants import constants
+
+class ProgressTrackingWorkflow:
+    """
+    Base class of the blog workflows. Keeps the stage transitions and tool calls recorded during
+    a run and serves them through the progress query.
+    """
+
+    def __init__(self) -> None:
+        self._stage = "started"
+        self._progress_events: list[WorkflowProgressEvent] = []
+
+    def record_progress(self, stage: str, detail: str | None = None) -> None:
+        """
+        Record a stage transition or tool call so clients can follow the run through the progress query.
+        """
+        self._stage = stage
+        self._progress_events.append(
+            WorkflowProgressEvent(
+                sequence=len(self._progress_events) + 1,
+                stage=stage,
+                detail=detail[:constants.get("progress_detail_max_length")] if detail else None,
+                timestamp=workflow.now(),
+            )
+        )
+
+    @workflow.query(name=constants.get("blog_workflow_progress_query"))
+    def get_progress(self, after: int = 0) -> WorkflowProgress:
+        """
+        Returns the current stage and every progress event with a sequence number greater than `after`.
+        """
+        return WorkflowProgress(stage=self._stage, events=self._progress_events[after:])
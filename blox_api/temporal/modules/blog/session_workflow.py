@@ -0,0 +1,133 @@
+# py modules
+import asyncio
+from dataclasses import replace
+from datetime import timedelta
+from typing import Optional
+from temporalio import workflow
+
+# models
+from .models import BlogDetails, BlogSessionInput, BlogSessionMessage, OpenAIMessage
+from .progress import ProgressTrackingWorkflow
+
+# constants
+from .constants import constants
+
+# helpers
+from .workflow_helper import process_blog_message
+from .activity_helper import exec_activity
+
+# activities
+from .activities import get_blog_details
+
+@workflow.defn(name=constants.get("blog_session_workflow_name"))
+class BlogSessionWorkflow(ProgressTrackingWorkflow):
+    """
+    Long-lived workflow per blog. Chat messages arrive as updates and are processed one at a time,
+    against blog details kept in workflow state instead of re-read from the database per message.
+    Completes after a period without messages and continues-as-new when its history grows.
+    """
+
+    @workflow.init
+    def __init__(self, session_input: BlogSessionInput) -> None:
+        # Set from the input here so update handlers can rely on it before run() starts
+        super().__init__()
+        self._blog_id = session_input.blog_id
+        self._blog_details: Optional[BlogDetails] = session_input.blog_details
+        self._messages_this_run = 0
+        self._lock = asyncio.Lock()
+
+    def _should_continue_as_new(self) -> bool:
+        return (
+            workflow.info().is_continue_as_new_suggested()
+            or self._messages_this_run >= constants.get("session_max_messages_per_run")
+        )
+
+    @workflow.run
+    async def run(self, session_input: BlogSessionInput) -> None:
+        workflow.logger.info(
+            "BlogSessionWorkflow started",
+            extra={
+                "workflow_name": "BlogSessionWorkflow",
+                "blog_id": session_input.blog_id,
+                "has_blog_details": self._blog_details is not None,
+            },
+        )
+
+        idle_timeout = timedelta(minutes=constants.get("session_idle_timeout_minutes"))
+        while True:
+            messages_seen = self._messages_this_run
+            try:
+                await workflow.wait_condition(self._should_continue_as_new, timeout=idle_timeout)
+            except asyncio.TimeoutError:
+                if self._messages_this_run == messages_seen and not self._lock.locked():
+                    break
+                continue
+
+            # Let in-flight messages finish, then hand the state to a fresh run
+            await workflow.wait_condition(lambda: workflow.all_handlers_finished() and not self._lock.locked())
+            workflow.logger.info(
+                "BlogSessionWorkflow continuing as new",
+                extra={
+                    "workflow_name": "BlogSessionWorkflow",
+                    "blog_id": session_input.blog_id,
+                    "messages_this_run": self._messages_this_run,
+                    "history_length": workflow.info().get_current_history_length(),
+                },
+            )
+            workflow.continue_as_new(replace(session_input, blog_details=self._blog_details))
+
+        await workflow.wait_condition(workflow.all_handlers_finished)
+        workflow.logger.info(
+            "BlogSessionWorkflow idle, completing",
+            extra={"workflow_name": "BlogSessionWorkflow", "blog_id": session_input.blog_id},
+        )
+
+    @workflow.update(name=constants.get("blog_session_message_update"))
+    async def send_message(self, message: BlogSessionMessage) -> dict:
+        """
+        Process one chat message. Concurrent messages for the blog are serialized by the lock.
+        """
+        async with self._lock:
+            self._messages_this_run += 1
+
+            # Edits made outside the session (PUT/PATCH, checkpoint restores) bump the revision.
+            # A message that queued behind another read the revision before that one saved, so
+            # only a newer revision than the one held here means the details are stale.
+            if (
+                self._blog_details is None
+                or message.revision is None
+                or self._blog_details.revision is None
+                or message.revision > self._blog_details.revision
+            ):
+                self._blog_details = await exec_activity(get_blog_details, self._blog_id)
+
+            history = list(self._blog_details.messages)
+            working = replace(self._blog_details, messages=list(history), tool_call_counters={})
+
+            try:
+                result, revision = await process_blog_message(working, self._blog_id, message.user_message, message.user_selected_context)
+            except Exception as e:
+                # Agents may have mutated state half-way, reload on the next message
+                self._blog_details = None
+                self.record_progress("failed", str(e))
+                return {"error": str(e)}
+
+            # Mirror what was just saved, as get_blog_details would load it
+            history_messages = constants.get("session_history_pairs") * 2
+            self._blog_details = replace(
+                self._blog_details,
+                content=result["content"],
+                general_instructions=working.instructions or working.general_instructions,
+                messages=(history + [
+                    OpenAIMessage(role="user", content=message.user_message),
+                    OpenAIMessage(role="assistant", content=result["message"].ai_message),
+                ])[-history_messages:],
+                revision=revision,
+            )
+            self.record_progress("completed")
+            return result
+
+    @send_message.validator
+    def validate_send_message(self, message: BlogSessionMessage) -> None:
+        if not message.user_message:
+            raise ValueError("Message must not be empty")
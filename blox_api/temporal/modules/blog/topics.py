@@ -0,0 +1,9 @@
+# constants
+from .constants import constants
+
+# Pub/sub topics shared by the worker and the API, kept apart from draft_stream so the API
+# doesn't import the agents SDK
+
+def draft_topic(workflow_id: str) -> str:
+    """Pub/sub topic carrying the partial blog draft of a workflow"""
+    return f"{constants.get('draft_stream_topic_prefix')}{workflow_id}"
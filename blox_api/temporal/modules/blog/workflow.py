@@ -1,14 +1,19 @@
 # py modules
 from temporalio import workflow
+from temporalio.exceptions import ApplicationError
 
 # models
 from .models import BlogWorkflowInput
+from .progress import ProgressTrackingWorkflow
+
+# constants
+from .constants import constants
 
 # helpers
 from .workflow_helper import handle_new_blog, handle_existing_blog
 
-@workflow.defn
-class BlogWorkflow:
+@workflow.defn(name=constants.get("blog_workflow_name"))
+class BlogWorkflow(ProgressTrackingWorkflow):
 
     @workflow.run
     async def run(self, workflow_input: BlogWorkflowInput) -> dict:
@@ -67,6 +72,7 @@ class BlogWorkflow:
                 },
             )
 
+            self.record_progress("completed")
             return result
 
         except Exception as e:
@@ -80,6 +86,9 @@ class BlogWorkflow:
                     "is_new_blog": workflow_input.blog_id is None,
                 },
             )
+            self.record_progress("failed", str(e))
+            if workflow_input.fail_on_error:
+                raise ApplicationError(str(e), type=type(e).__name__, non_retryable=True) from e
             return { "error": str(e) }
 
 
@@ -2,6 +2,7 @@
 from temporalio import workflow
 from agents import RunConfig, Runner
 from datetime import timedelta
+from typing import Optional
 import json
 
 # models
@@ -16,7 +17,7 @@ from .blog_agents.instruction_agent import instruction_agent
 from .activities import get_blog_details, save_blog_content, save_messages, create_new_blog
 
 # activity helper
-from .activity_helper import exec_activity
+from .activity_helper import exec_activity, record_progress
 
 async def generate_first_blog_prompt(blog: BlogDetails) -> str:
     """
@@ -181,6 +182,7 @@ async def handle_new_blog(workflow_input: BlogWorkflowInput) -> dict:
         model="gpt-4o-mini",
         tracing_disabled=True,
     )
+    record_progress("orchestrator_agent")
     result = await Runner.run(
         orchestrator_agent,
         input=blog_details.instructions,
@@ -292,9 +294,23 @@ async def handle_existing_blog(workflow_input: BlogWorkflowInput) -> dict:
         },
     )
 
+    result, _ = await process_blog_message(
+        blog_details,
+        workflow_input.blog_id,
+        workflow_input.user_message,
+        workflow_input.user_selected_context,
+    )
+    return result
+
+
+async def process_blog_message(blog_details: BlogDetails, blog_id: int, user_message: str, user_selected_context: Optional[list[str]]) -> tuple[dict, Optional[int]]:
+    """
+    Run the agents for one chat message against already loaded blog details, then save the
+    new content and the message pair. Returns the result dict and the blog's revision after the save.
+    """
     # Set workflow input data
-    blog_details.user_selected_context = workflow_input.user_selected_context
-    blog_details.user_message = workflow_input.user_message
+    blog_details.user_selected_context = user_selected_context
+    blog_details.user_message = user_message
 
     workflow.logger.info(
         "Workflow input data set in blog details",
@@ -302,9 +318,9 @@ async def handle_existing_blog(workflow_input: BlogWorkflowInput) -> dict:
             "workflow_name": "BlogWorkflow",
             "flow_type": "existing_blog",
             "step": "input_data_set",
-            "blog_id": workflow_input.blog_id,
-            "user_message_length": len(workflow_input.user_message) if workflow_input.user_message else 0,
-            "has_selected_context": workflow_input.user_selected_context is not None,
+            "blog_id": blog_id,
+            "user_message_length": len(user_message) if user_message else 0,
+            "has_selected_context": user_selected_context is not None,
         },
     )
 
@@ -315,7 +331,7 @@ async def handle_existing_blog(workflow_input: BlogWorkflowInput) -> dict:
             "workflow_name": "BlogWorkflow",
             "flow_type": "existing_blog",
             "step": "summary_agent",
-            "blog_id": workflow_input.blog_id,
+            "blog_id": blog_id,
             "agent_type": "summary",
             "model": "gpt-4o-mini",
         },
@@ -327,6 +343,7 @@ async def handle_existing_blog(workflow_input: BlogWorkflowInput) -> dict:
     )
 
     # Call summary agent to update general instructions
+    record_progress("summary_agent")
     summary_result = await Runner.run(
         summary_agent,
         input="Summarize general instructions based on new user message",
@@ -340,7 +357,7 @@ async def handle_existing_blog(workflow_input: BlogWorkflowInput) -> dict:
             "workflow_name": "BlogWorkflow",
             "flow_type": "existing_blog",
             "step": "summary_agent",
-            "blog_id": workflow_input.blog_id,
+            "blog_id": blog_id,
             "agent_type": "summary",
             "has_final_output": summary_result.final_output is not None,
         },
@@ -356,13 +373,13 @@ async def handle_existing_blog(workflow_input: BlogWorkflowInput) -> dict:
                 "workflow_name": "BlogWorkflow",
                 "flow_type": "existing_blog",
                 "step": "update_general_instructions",
-                "blog_id": workflow_input.blog_id,
+                "blog_id": blog_id,
                 "new_instructions_length": len(new_general_instructions),
             },
         )
         await exec_activity(
             save_blog_content,
-            workflow_input.blog_id,
+            blog_id,
             None,  # Keep existing content
             new_general_instructions,
         )
@@ -374,7 +391,7 @@ async def handle_existing_blog(workflow_input: BlogWorkflowInput) -> dict:
                 "workflow_name": "BlogWorkflow",
                 "flow_type": "existing_blog",
                 "step": "summary_parsing",
-                "blog_id": workflow_input.blog_id,
+                "blog_id": blog_id,
                 "update_required": False,
             },
         )
@@ -386,12 +403,13 @@ async def handle_existing_blog(workflow_input: BlogWorkflowInput) -> dict:
             "workflow_name": "BlogWorkflow",
             "flow_type": "existing_blog",
             "step": "instruction_agent",
-            "blog_id": workflow_input.blog_id,
+            "blog_id": blog_id,
             "agent_type": "instruction",
             "model": "gpt-4o-mini",
             "max_turns": 10,
         },
     )
+    record_progress("instruction_agent")
     instruction_result = await Runner.run(
         instruction_agent,
         input="Generate detailed instructions for blog editing",
@@ -406,7 +424,7 @@ async def handle_existing_blog(workflow_input: BlogWorkflowInput) -> dict:
             "workflow_name": "BlogWorkflow",
             "flow_type": "existing_blog",
             "step": "instruction_agent",
-            "blog_id": workflow_input.blog_id,
+            "blog_id": blog_id,
             "agent_type": "instruction",
             "has_final_output": instruction_result.final_output is not None,
         },
@@ -414,8 +432,8 @@ async def handle_existing_blog(workflow_input: BlogWorkflowInput) -> dict:
 
     # Parse the instruction result JSON
     instruction_data = instruction_result.final_output
-    blog_details.instructions = instruction_data.strict_instructions or workflow_input.user_message
-    blog_details.user_prompt = instruction_data.user_prompt or workflow_input.user_message
+    blog_details.instructions = instruction_data.strict_instructions or user_message
+    blog_details.user_prompt = instruction_data.user_prompt or user_message
 
     contexts = []
     if instruction_data.selected_context:
@@ -423,11 +441,11 @@ async def handle_existing_blog(workflow_input: BlogWorkflowInput) -> dict:
             contexts.extend(instruction_data.selected_context)
         else:
             contexts.append(instruction_data.selected_context)
-    if workflow_input.user_selected_context:
-        if isinstance(workflow_input.user_selected_context, list):
-            contexts.extend(workflow_input.user_selected_context)
+    if user_selected_context:
+        if isinstance(user_selected_context, list):
+            contexts.extend(user_selected_context)
         else:
-            contexts.append(workflow_input.user_selected_context)
+            contexts.append(user_selected_context)
 
     blog_details.user_selected_context = " ".join(contexts) if contexts else None
 
@@ -437,7 +455,7 @@ async def handle_existing_blog(workflow_input: BlogWorkflowInput) -> dict:
             "workflow_name": "BlogWorkflow",
             "flow_type": "existing_blog",
             "step": "instruction_parsing",
-            "blog_id": workflow_input.blog_id,
+            "blog_id": blog_id,
             "has_strict_instructions": instruction_data.strict_instructions is not None,
             "has_user_prompt": instruction_data.user_prompt is not None,
             "has_selected_context": instruction_data.selected_context is not None,
@@ -445,7 +463,7 @@ async def handle_existing_blog(workflow_input: BlogWorkflowInput) -> dict:
     )
 
     # Format conversation history + current message + strict instructions
-    orchestrator_input = format_orchestrator_input(blog_details, workflow_input.user_message)
+    orchestrator_input = format_orchestrator_input(blog_details, user_message)
 
     workflow.logger.info(
         "Orchestrator input formatted",
@@ -453,7 +471,7 @@ async def handle_existing_blog(workflow_input: BlogWorkflowInput) -> dict:
             "workflow_name": "BlogWorkflow",
             "flow_type": "existing_blog",
             "step": "orchestrator_input_format",
-            "blog_id": workflow_input.blog_id,
+            "blog_id": blog_id,
             "message_count": len(orchestrator_input),
         },
     )
@@ -465,12 +483,13 @@ async def handle_existing_blog(workflow_input: BlogWorkflowInput) -> dict:
             "workflow_name": "BlogWorkflow",
             "flow_type": "existing_blog",
             "step": "orchestrator_agent",
-            "blog_id": workflow_input.blog_id,
+            "blog_id": blog_id,
             "agent_type": "orchestrator",
             "model": "gpt-4o-mini",
             "max_turns": 20,
         },
     )
+    record_progress("orchestrator_agent")
     result = await Runner.run(
         orchestrator_agent,
         input=orchestrator_input,
@@ -485,7 +504,7 @@ async def handle_existing_blog(workflow_input: BlogWorkflowInput) -> dict:
             "workflow_name": "BlogWorkflow",
             "flow_type": "existing_blog",
             "step": "orchestrator_agent",
-            "blog_id": workflow_input.blog_id,
+            "blog_id": blog_id,
             "agent_type": "orchestrator",
             "has_final_output": result.final_output is not None,
         },
@@ -498,14 +517,14 @@ async def handle_existing_blog(workflow_input: BlogWorkflowInput) -> dict:
             "workflow_name": "BlogWorkflow",
             "flow_type": "existing_blog",
             "step": "content_save",
-            "blog_id": workflow_input.blog_id,
+            "blog_id": blog_id,
             "content_length": len(result.final_output.blog_post) if result.final_output and result.final_output.blog_post else 0,
             "instructions_length": len(blog_details.instructions) if blog_details.instructions else 0,
         },
     )
-    await exec_activity(
+    revision = await exec_activity(
         save_blog_content,
-        workflow_input.blog_id,
+        blog_id,
         result.final_output.blog_post, #todo(afaq): json handling
         blog_details.instructions,
     )
@@ -516,7 +535,7 @@ async def handle_existing_blog(workflow_input: BlogWorkflowInput) -> dict:
             "workflow_name": "BlogWorkflow",
             "flow_type": "existing_blog",
             "step": "content_save",
-            "blog_id": workflow_input.blog_id,
+            "blog_id": blog_id,
         },
     )
 
@@ -527,15 +546,15 @@ async def handle_existing_blog(workflow_input: BlogWorkflowInput) -> dict:
             "workflow_name": "BlogWorkflow",
             "flow_type": "existing_blog",
             "step": "message_save",
-            "blog_id": workflow_input.blog_id,
-            "user_message_length": len(workflow_input.user_message),
+            "blog_id": blog_id,
+            "user_message_length": len(user_message),
             "ai_message_length": len(result.final_output.action_summary) if result.final_output and result.final_output.action_summary else 0,
         },
     )
     message = await exec_activity(
         save_messages,
-        workflow_input.blog_id,
-        workflow_input.user_message,
+        blog_id,
+        user_message,
         result.final_output.action_summary,
     )
 
@@ -545,13 +564,13 @@ async def handle_existing_blog(workflow_input: BlogWorkflowInput) -> dict:
         extra={
             "workflow_name": "BlogWorkflow",
             "flow_type": "existing_blog",
-            "blog_id": workflow_input.blog_id,
+            "blog_id": blog_id,
             "content_length": len(result.final_output.blog_post) if result.final_output and result.final_output.blog_post else 0,
             "action_summary_length": len(result.final_output.action_summary) if result.final_output and result.final_output.action_summary else 0,
         },
     )
     return {
-        "blog_id": workflow_input.blog_id,
+        "blog_id": blog_id,
         "content": result.final_output.blog_post,
         "message": message,
-    }
+    }, revision
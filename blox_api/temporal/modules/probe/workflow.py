@@ -0,0 +1,27 @@
+# py modules
+import asyncio
+from datetime import timedelta
+from temporalio import activity, workflow
+
+PROBE_WORKFLOW_NAME = "AutoscalerProbe"
+
+@activity.defn(name="autoscaler_probe_hold")
+async def probe_hold(seconds: float) -> None:
+    """Keep the workflow task that runs this local activity busy for `seconds`"""
+    await asyncio.sleep(seconds)
+
+@workflow.defn(name=PROBE_WORKFLOW_NAME)
+class AutoscalerProbeWorkflow:
+    """
+    Synthetic load for temporal/autoscaler.py. A local activity runs inside the workflow task, so
+    each probe holds one of the worker's workflow task slots for `hold_seconds` and the rest of
+    a batch waits in the workflow queue's backlog, like workflows behind a saturated worker.
+    """
+
+    @workflow.run
+    async def run(self, hold_seconds: float) -> None:
+        await workflow.execute_local_activity(
+            probe_hold,
+            hold_seconds,
+            start_to_close_timeout=timedelta(seconds=hold_seconds + 30),
+        )
@@ -0,0 +1,192 @@
+"""
+Workflow sandbox configuration for the worker.
+
+Temporal's sandbox re-imports every non-passthrough module for each workflow run it creates,
+which includes replays after a sticky cache eviction. Without passthrough that is the agents SDK,
+openai, pydantic, SQLAlchemy/SQLModel and our own models and db modules, on every new run.
+The modules passed through here are imported once by the worker and shared by every run.
+
+    python temporal/sandbox.py [rounds]     # first-activation times, default vs passthrough restrictions
+"""
+from __future__ import annotations
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+from statistics import median
+from typing import Any, Dict, List, Sequence, Tuple, Type
+
+from google.protobuf.timestamp_pb2 import Timestamp
+from temporalio.api.common.v1 import Payloads, WorkflowType
+from temporalio.api.enums.v1 import EventType
+from temporalio.api.history.v1 import (
+    HistoryEvent,
+    WorkflowExecutionStartedEventAttributes,
+    WorkflowTaskScheduledEventAttributes,
+    WorkflowTaskStartedEventAttributes,
+)
+from temporalio.api.taskqueue.v1 import TaskQueue
+from temporalio.client import WorkflowHistory
+from temporalio.converter import DataConverter
+from temporalio.worker import Plugin, Replayer, WorkflowRunner
+from temporalio.worker.workflow_sandbox import SandboxedWorkflowRunner, SandboxRestrictions
+
+# Deterministic at import time and not workflow code: only definitions, no I/O or clocks
+# read when imported. Workflow modules themselves must stay sandboxed.
+SANDBOX_PASSTHROUGH_MODULES = (
+    # third-party
+    "pydantic",
+    "pydantic_core",
+    "annotated_types",
+    "typing_inspection",
+    "agents",
+    "openai",
+    "httpx",
+    "sqlalchemy",
+    "sqlmodel",
+    "psycopg",
+    "orjson",
+    # first-party modules the workflow imports only for types, constants and activity stubs.
+    # common.db creates the connection pool at import, it must not be re-created per run.
+    "models",
+    "common",
+    "modules.blog.models",
+    "modules.blog.constants",
+    "modules.blog.activities",
+    "modules.blog.draft_stream",
+)
+
+def build_workflow_runner(passthrough: bool = True) -> SandboxedWorkflowRunner:
+    restrictions = SandboxRestrictions.default
+    if passthrough:
+        restrictions = restrictions.with_passthrough_modules(*SANDBOX_PASSTHROUGH_MODULES)
+    return SandboxedWorkflowRunner(restrictions=restrictions)
+
+def _first_task_history(workflow_id: str, workflow_name: str, task_queue: str, input_payloads: Payloads) -> WorkflowHistory:
+    """History of a run that was just started: its first workflow task has been handed to a worker"""
+    now = Timestamp()
+    now.GetCurrentTime()
+    events = [
+        HistoryEvent(
+            event_id=1,
+            event_time=now,
+            event_type=EventType.EVENT_TYPE_WORKFLOW_EXECUTION_STARTED,
+            workflow_execution_started_event_attributes=WorkflowExecutionStartedEventAttributes(
+                workflow_type=WorkflowType(name=workflow_name),
+                task_queue=TaskQueue(name=task_queue),
+                input=input_payloads,
+                original_execution_run_id=workflow_id,
+                first_execution_run_id=workflow_id,
+                attempt=1,
+            ),
+        ),
+        HistoryEvent(
+            event_id=2,
+            event_time=now,
+            event_type=EventType.EVENT_TYPE_WORKFLOW_TASK_SCHEDULED,
+            workflow_task_scheduled_event_attributes=WorkflowTaskScheduledEventAttributes(
+                task_queue=TaskQueue(name=task_queue),
+                attempt=1,
+            ),
+        ),
+        HistoryEvent(
+            event_id=3,
+            event_time=now,
+            event_type=EventType.EVENT_TYPE_WORKFLOW_TASK_STARTED,
+            workflow_task_started_event_attributes=WorkflowTaskStartedEventAttributes(scheduled_event_id=2),
+        ),
+    ]
+    return WorkflowHistory(workflow_id, events)
+
+async def measure_first_activations(
+    workflow_runner: WorkflowRunner,
+    workflows: Sequence[Type],
+    samples: Sequence[Tuple[str, Any]],
+    data_converter: DataConverter = DataConverter.default,
+    plugins: Sequence[Plugin] = (),
+    task_queue: str = "sandbox-measurement",
+    rounds: int = 5,
+) -> Dict[str, Dict[str, float]]:
+    """
+    Replay `rounds` freshly started runs of each (workflow name, input) sample through the given
+    runner: every run gets a new sandbox and executes its first activation, up to the first
+    command, as a worker would for a new run or after a cache eviction. Returns cold (first run)
+    and warm (median of the rest) milliseconds per workflow. Raises if a run fails to activate.
+    """
+    replayer = Replayer(
+        workflows=workflows,
+        workflow_runner=workflow_runner,
+        data_converter=data_converter,
+        plugins=plugins,
+    )
+    # Plugins may replace the converter, encode inputs with the one the replayer decodes with
+    data_converter = replayer.config()["data_converter"]
+
+    timings: Dict[str, Dict[str, float]] = {}
+    for workflow_name, workflow_input in samples:
+        input_payloads = Payloads(payloads=await data_converter.encode([workflow_input]))
+        samples_ms: List[float] = []
+        for index in range(max(1, rounds)):
+            history = _first_task_history(f"sandbox-measurement-{workflow_name}-{index}", workflow_name, task_queue, input_payloads)
+            started = time.perf_counter()
+            result = await replayer.replay_workflow(history, raise_on_replay_failure=False)
+            samples_ms.append((time.perf_counter() - started) * 1000)
+            if result.replay_failure:
+                raise RuntimeError(f"First activation of {workflow_name} failed") from result.replay_failure
+        timings[workflow_name] = {
+            "cold_ms": round(samples_ms[0], 1),
+            "warm_ms": round(median(samples_ms[1:]) if len(samples_ms) > 1 else samples_ms[0], 1),
+        }
+    return timings
+
+def sample_inputs() -> List[Tuple[str, Any]]:
+    """One new-blog request and one session start, enough to reach each workflow's first command"""
+    from modules.blog.constants import constants
+    from modules.blog.models import BlogSessionInput, BlogWorkflowInput
+
+    return [
+        (constants.get("blog_workflow_name"), BlogWorkflowInput(
+            title="Sandbox measurement",
+            description="Synthetic input",
+            desired_tone="neutral",
+            seo_keywords=["temporal"],
+            target_audience="developers",
+            blog_length_min=500,
+            blog_length_max=800,
+            user_id=1,
+        )),
+        (constants.get("blog_session_workflow_name"), BlogSessionInput(blog_id=1, user_id=1)),
+    ]
+
+async def _compare(rounds: int) -> None:
+    from temporalio.contrib.openai_agents import OpenAIAgentsPlugin
+    from temporal.codec import build_agents_data_converter
+    from modules.blog.workflow import BlogWorkflow
+    from modules.blog.session_workflow import BlogSessionWorkflow
+
+    # Each configuration in its own process, so the first one doesn't warm the imports of the second
+    if len(sys.argv) > 2:
+        passthrough = sys.argv[2] == "passthrough"
+        report = await measure_first_activations(
+            build_workflow_runner(passthrough),
+            [BlogWorkflow, BlogSessionWorkflow],
+            sample_inputs(),
+            # The worker's converter, the agents plugin rejects the API's pydantic one
+            build_agents_data_converter(),
+            plugins=[OpenAIAgentsPlugin()],
+            rounds=rounds,
+        )
+        label = "passthrough" if passthrough else "default restrictions"
+        for name, timing in report.items():
+            print(f"{label:>20}  {name:<20} cold {timing['cold_ms']:>8.1f} ms  warm {timing['warm_ms']:>8.1f} ms", flush=True)
+        return
+
+    import subprocess
+    for configuration in ("default", "passthrough"):
+        subprocess.run([sys.executable, __file__, str(rounds), configuration], check=True)
+
+if __name__ == "__main__":
+    sys.path.insert(0, str(Path(__file__).parent.parent))
+    sys.path.insert(0, str(Path(__file__).parent))
+    asyncio.run(_compare(int(sys.argv[1]) if len(sys.argv) > 1 else 5))
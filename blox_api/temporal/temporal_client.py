@@ -1,103 +1,393 @@
 from __future__ import annotations
 
 import asyncio
+import hashlib
+import json
 import logging
+import random
+import time
+import uuid
+from dataclasses import asdict, replace
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 
-from temporalio.client import Client
-from temporalio.contrib.pydantic import pydantic_data_converter
+from temporalio.client import Client, WithStartWorkflowOperation, WorkflowFailureError, WorkflowHandle
+from temporalio.common import WorkflowIDConflictPolicy, WorkflowIDReusePolicy
+from temporalio.exceptions import WorkflowAlreadyStartedError
 
-from temporal.modules.blog.workflow import BlogWorkflow
-from temporal.modules.blog.models import BlogWorkflowInput
+from temporal.client_settings import TemporalSettings
+from temporal.codec import build_data_converter
+
+# Only the thin input/output models and names, the workflow and agent stack load in the worker alone
+from temporal.modules.blog.models import BlogWorkflowInput, BlogSessionInput, BlogSessionMessage, WorkflowProgress
+from temporal.modules.blog.constants import constants
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+class IdempotencyKeyConflictError(Exception):
+    """An idempotency key was reused for a request with a different body"""
+
+    def __init__(self, workflow_id: str):
+        super().__init__(f"Idempotency key was already used for a different request ({workflow_id})")
+        self.workflow_id = workflow_id
+
 class TemporalClientManager:
     """Manager class for Temporal client operations"""
 
-    def __init__(self):
-        self.client: Optional[Client] = None
+    def __init__(self, settings: Optional[TemporalSettings] = None):
+        self.settings = settings or TemporalSettings.from_env()
+        self.clients: List[Client] = []
+        self._next_client = 0
+        # One background task connects missing clients, requests never wait on its backoff
+        self._refill_task: Optional[asyncio.Task] = None
+        # Set once the pool has a client, wakes requests that arrived while it was empty
+        self._client_ready = asyncio.Event()
+        self._last_connect_error: Optional[Exception] = None
+        # Clients dropped by the health check, counted as reconnects once replaced
+        self._dropped_clients = 0
+        self._last_health_check = time.monotonic()
+        self._health_check_task: Optional[asyncio.Task] = None
+        self.metrics: Dict[str, Any] = {
+            "connect_attempts": 0,
+            "connect_failures": 0,
+            "connections_opened": 0,
+            "reconnects": 0,
+            "health_check_failures": 0,
+            "client_requests": 0,
+            "last_connected_at": None,
+        }
 
     async def get_client(self) -> Client:
-        """Get or create Temporal client connection"""
-        if self.client is None:
-            self.client = await self._create_client()
-        return self.client
+        """Get a pooled Temporal client, connecting on first use"""
+        self._schedule_refill()
+        if not self.clients:
+            await self._wait_for_client()
+        self._schedule_health_check()
+
+        self.metrics["client_requests"] += 1
+        client = self.clients[self._next_client % len(self.clients)]
+        self._next_client += 1
+        return client
+
+    def _schedule_refill(self) -> None:
+        """Connect the pool's missing clients in the background, one refill at a time"""
+        if len(self.clients) >= self.settings.pool_size:
+            return
+        if self._refill_task is not None and not self._refill_task.done():
+            return
+        self._refill_task = asyncio.create_task(self._fill_pool())
+
+    async def _fill_pool(self) -> None:
+        missing = self.settings.pool_size - len(self.clients)
+        # Each connection retries with its own backoff, a partially filled pool already serves requests
+        results = await asyncio.gather(*(self._add_client() for _ in range(missing)), return_exceptions=True)
+        errors = [result for result in results if isinstance(result, Exception)]
+        self._last_connect_error = errors[0] if errors else None
+
+    async def _add_client(self) -> None:
+        self.clients.append(await self._create_client())
+        if self._dropped_clients:
+            self._dropped_clients -= 1
+            self.metrics["reconnects"] += 1
+        self._client_ready.set()
+
+    async def _wait_for_client(self) -> None:
+        """Wait for the refill's first connection, raising its error if nothing connected"""
+        refill = self._refill_task
+        ready = asyncio.ensure_future(self._client_ready.wait())
+        try:
+            await asyncio.wait({ready, refill}, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            ready.cancel()
+        if not self.clients:
+            raise self._last_connect_error or ConnectionError("No Temporal client connected")
 
     async def _create_client(self) -> Client:
-        """Create and configure Temporal client"""
-        try:
-            logger.info("Connecting to Temporal server at localhost:7233")
+        """Create and configure Temporal client, retrying with exponential backoff"""
+        backoff = self.settings.connect_initial_backoff_seconds
+        for attempt in range(1, self.settings.connect_max_attempts + 1):
+            self.metrics["connect_attempts"] += 1
+            try:
+                logger.info(f"Connecting to Temporal server at {self.settings.address}")
+
+                client = await Client.connect(
+                    **self.settings.connect_kwargs(),
+                    data_converter=build_data_converter(),
+                )
+
+                self.metrics["connections_opened"] += 1
+                self.metrics["last_connected_at"] = datetime.now(timezone.utc).isoformat()
+                logger.info("Temporal client connected successfully")
+                return client
+
+            except Exception as e:
+                self.metrics["connect_failures"] += 1
+                if attempt >= self.settings.connect_max_attempts:
+                    logger.error(f"Failed to connect to Temporal server: {e}")
+                    raise
+                logger.warning(f"Failed to connect to Temporal server (attempt {attempt}), retrying in {backoff:.1f}s: {e}")
+                await asyncio.sleep(backoff + random.uniform(0, backoff / 2))
+                backoff = min(backoff * 2, self.settings.connect_max_backoff_seconds)
+
+    def _schedule_health_check(self) -> None:
+        """Health-check the pool in the background at most once per interval"""
+        if time.monotonic() - self._last_health_check < self.settings.health_check_interval_seconds:
+            return
+        if self._health_check_task is not None and not self._health_check_task.done():
+            return
+        self._last_health_check = time.monotonic()
+        self._health_check_task = asyncio.create_task(self.check_health())
+
+    async def check_health(self) -> bool:
+        """
+        Health-check every pooled client, dropping those whose connection is broken and
+        reconnecting them in the background. Returns whether all clients were healthy.
+        """
+        healthy = True
+        for client in list(self.clients):
+            try:
+                # False when the server answers NOT_SERVING, the client is replaced like a broken one
+                if await client.service_client.check_health(timeout=timedelta(seconds=5)):
+                    continue
+                reason = "server is not serving"
+            except Exception as e:
+                reason = str(e)
+            healthy = False
+            self.metrics["health_check_failures"] += 1
+            logger.warning(f"Temporal health check failed, reconnecting: {reason}")
+            # Requests keep using the healthy clients meanwhile
+            self.clients.remove(client)
+            self._dropped_clients += 1
+        if not self.clients:
+            self._client_ready.clear()
+        self._schedule_refill()
+        return healthy
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Connection metrics of the client pool, without the server address or namespace"""
+        return {
+            **self.metrics,
+            "pool_size": self.settings.pool_size,
+            "open_clients": len(self.clients),
+        }
+
+    def _build_workflow_id(self, workflow_input: BlogWorkflowInput, idempotency_key: Optional[str] = None) -> str:
+        """
+        Workflow ID for a request. With an idempotency key the ID is derived from the user, the kind of
+        request and the key, so retries of the same request map to the same workflow.
+        """
+        if idempotency_key:
+            kind = "message" if workflow_input.blog_id else "create"
+            digest = hashlib.sha256(f"{workflow_input.user_id}:{kind}:{idempotency_key}".encode("utf-8")).hexdigest()
+            return f"blog-workflow-{workflow_input.user_id}-{kind}-{digest[:32]}"
+
+        workflow_id = f"blog-workflow-{workflow_input.title.replace(' ', '-').lower()}"
+        if workflow_input.blog_id:
+            workflow_id += f"-{workflow_input.blog_id}"
+
+        # Random suffix for uniqueness, two requests in the same second used to collide
+        workflow_id += f"-{uuid.uuid4().hex[:12]}"
+        return workflow_id
+
+    @staticmethod
+    def _request_fingerprint(workflow_input: BlogWorkflowInput) -> str:
+        """Hash of the request, so an idempotency key reused for a different request is detected"""
+        return hashlib.sha256(json.dumps(asdict(workflow_input), sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+    async def _start_workflow(self, workflow_input: BlogWorkflowInput, idempotency_key: Optional[str] = None) -> WorkflowHandle:
+        """Start a blog workflow and return its handle without waiting for it"""
+        client = await self.get_client()
+        workflow_id = self._build_workflow_id(workflow_input, idempotency_key)
+        fingerprint = self._request_fingerprint(workflow_input)
+
+        logger.info(f"Starting workflow with ID: {workflow_id}")
+
+        # The owner is kept in the memo so job lookups can be authorized without a DB round-trip
+        start_kwargs = dict(
+            id=workflow_id,
+            task_queue=constants.get("task_queue"),
+            memo={"user_id": workflow_input.user_id, "request_fingerprint": fingerprint},
+            result_type=dict,
+        )
+        if not idempotency_key:
+            return await client.start_workflow(constants.get("blog_workflow_name"), workflow_input, **start_kwargs)
 
-            client = await Client.connect(
-                "localhost:7233",
-                data_converter=pydantic_data_converter,
+        try:
+            # A duplicate of an in-flight request attaches to the running workflow. A completed
+            # run is never repeated, but a failed one may be retried with the same key, so errors
+            # must fail the run rather than complete it with an error result.
+            handle = await client.start_workflow(
+                constants.get("blog_workflow_name"),
+                replace(workflow_input, fail_on_error=True),
+                id_conflict_policy=WorkflowIDConflictPolicy.USE_EXISTING,
+                id_reuse_policy=WorkflowIDReusePolicy.ALLOW_DUPLICATE_FAILED_ONLY,
+                **start_kwargs,
             )
+        except WorkflowAlreadyStartedError:
+            logger.info(f"Idempotency key already completed, attaching to workflow: {workflow_id}")
+            handle = client.get_workflow_handle(workflow_id, result_type=dict)
 
-            logger.info("Temporal client connected successfully")
-            return client
-
-        except Exception as e:
-            logger.error(f"Failed to connect to Temporal server: {e}")
-            raise
+        memo = await (await handle.describe()).memo()
+        if memo.get("request_fingerprint") != fingerprint:
+            raise IdempotencyKeyConflictError(workflow_id)
+        return handle
 
-    async def start_blog_workflow(self, workflow_input: BlogWorkflowInput) -> Dict[str, Any]:
+    async def start_blog_workflow(self, workflow_input: BlogWorkflowInput, idempotency_key: Optional[str] = None) -> Dict[str, Any]:
         """
         Start a blog workflow and wait for its completion
 
         Args:
             workflow_input: Input data for the blog workflow
+            idempotency_key: Optional client key, duplicates attach to the same workflow
 
         Returns:
             Dict containing the workflow result
         """
         try:
-            client = await self.get_client()
+            handle = await self._start_workflow(workflow_input, idempotency_key)
 
-            # Generate unique workflow ID
-            workflow_id = f"blog-workflow-{workflow_input.title.replace(' ', '-').lower()}"
-            if workflow_input.blog_id:
-                workflow_id += f"-{workflow_input.blog_id}"
+            logger.info(f"Workflow started, waiting for completion: {handle.id}")
 
-            # Add timestamp for uniqueness
-            import time
-            workflow_id += f"-{int(time.time())}"
+            # Wait for workflow completion
+            try:
+                result = await handle.result()
+            except WorkflowFailureError as e:
+                # Runs started with an idempotency key fail instead of returning the error
+                logger.error(f"Workflow failed: {handle.id}: {e.cause}")
+                return {"error": str(e.cause)}
+
+            logger.info(f"Workflow completed successfully: {handle.id}")
+            return result
 
-            logger.info(f"Starting workflow with ID: {workflow_id}")
+        except Exception as e:
+            logger.error(f"Workflow execution failed: {e}")
+            raise
 
-            # Start the workflow
-            handle = await client.start_workflow(
-                BlogWorkflow.run,
-                workflow_input,
-                id=workflow_id,
-                task_queue="openai-agents-task-queue",
-            )
+    async def submit_blog_workflow(self, workflow_input: BlogWorkflowInput, idempotency_key: Optional[str] = None) -> str:
+        """
+        Start a blog workflow without waiting for its completion
 
-            logger.info(f"Workflow started, waiting for completion: {workflow_id}")
+        Args:
+            workflow_input: Input data for the blog workflow
+            idempotency_key: Optional client key, duplicates attach to the same workflow
 
-            # Wait for workflow completion
-            result = await handle.result()
+        Returns:
+            ID of the started workflow
+        """
+        try:
+            handle = await self._start_workflow(workflow_input, idempotency_key)
 
-            logger.info(f"Workflow completed successfully: {workflow_id}")
-            return result
+            logger.info(f"Workflow submitted: {handle.id}")
+            return handle.id
 
         except Exception as e:
-            logger.error(f"Workflow execution failed: {e}")
+            logger.error(f"Workflow submission failed: {e}")
             raise
 
-    async def start_blog_creation_workflow(self, blog_data: Dict[str, Any]) -> Dict[str, Any]:
+    async def send_blog_session_message(self, message_data: Dict[str, Any], revision: Optional[int], idempotency_key: Optional[str] = None) -> Dict[str, Any]:
         """
-        Start a new blog creation workflow
+        Deliver a message to the blog's session workflow as an update, starting the session
+        if it isn't running, and wait for the message's result
 
         Args:
-            blog_data: Blog creation data matching the specified format
+            message_data: Message data matching the specified format
+            revision: The blog's current revision, so the session reloads details edited elsewhere
+            idempotency_key: Optional client key, duplicates attach to the same update
+
+        Returns:
+            Dict containing the message result
+        """
+        client = await self.get_client()
+        blog_id = message_data["blog_id"]
+        workflow_id = f"blog-session-{blog_id}"
+
+        start_operation = WithStartWorkflowOperation(
+            constants.get("blog_session_workflow_name"),
+            BlogSessionInput(blog_id=blog_id, user_id=message_data["user_id"]),
+            id=workflow_id,
+            task_queue=constants.get("task_queue"),
+            id_conflict_policy=WorkflowIDConflictPolicy.USE_EXISTING,
+            memo={"user_id": message_data["user_id"]},
+        )
+
+        # Updates are de-duplicated by ID, so a retried request attaches to the original update
+        if idempotency_key:
+            update_id = "message-" + hashlib.sha256(f"{message_data['user_id']}:{idempotency_key}".encode("utf-8")).hexdigest()[:32]
+        else:
+            update_id = f"message-{uuid.uuid4().hex}"
+
+        logger.info(f"Sending message {update_id} to session workflow: {workflow_id}")
+
+        return await client.execute_update_with_start_workflow(
+            constants.get("blog_session_message_update"),
+            BlogSessionMessage(
+                user_message=message_data["user_message"],
+                user_selected_context=message_data["user_selected_context"],
+                revision=revision,
+            ),
+            start_workflow_operation=start_operation,
+            id=update_id,
+            result_type=dict,
+        )
+
+    async def describe_blog_workflow(self, workflow_id: str) -> Dict[str, Any]:
+        """
+        Describe a blog workflow execution
+
+        Args:
+            workflow_id: ID of the workflow to describe
+
+        Returns:
+            Dict containing the workflow status, owner and timestamps
+        """
+        client = await self.get_client()
+        description = await client.get_workflow_handle(workflow_id).describe()
+        memo = await description.memo()
+
+        return {
+            "workflow_id": workflow_id,
+            "status": description.status.name.lower() if description.status else "unknown",
+            "user_id": memo.get("user_id"),
+            "started_at": description.start_time,
+            "closed_at": description.close_time,
+        }
+
+    async def get_blog_workflow_result(self, workflow_id: str) -> Dict[str, Any]:
+        """
+        Fetch the result of a blog workflow, waiting for it if still running
+
+        Args:
+            workflow_id: ID of the workflow
 
         Returns:
             Dict containing the workflow result
         """
-        workflow_input = BlogWorkflowInput(
+        client = await self.get_client()
+        return await client.get_workflow_handle(workflow_id).result()
+
+    async def get_blog_workflow_progress(self, workflow_id: str, after: int = 0) -> WorkflowProgress:
+        """
+        Query the progress events recorded by a blog workflow
+
+        Args:
+            workflow_id: ID of the workflow
+            after: Only return events with a sequence number greater than this
+
+        Returns:
+            WorkflowProgress with the current stage and new events
+        """
+        client = await self.get_client()
+        return await client.get_workflow_handle(workflow_id).query(
+            constants.get("blog_workflow_progress_query"),
+            after,
+            result_type=WorkflowProgress,
+        )
+
+    def _blog_creation_input(self, blog_data: Dict[str, Any]) -> BlogWorkflowInput:
+        """Build the workflow input for a new blog"""
+        return BlogWorkflowInput(
             title=blog_data["title"],
             description=blog_data["description"],
             desired_tone=blog_data["desired_tone"],
@@ -110,19 +400,9 @@ class TemporalClientManager:
             user_message=None,
         )
 
-        return await self.start_blog_workflow(workflow_input)
-
-    async def start_message_workflow(self, message_data: Dict[str, Any]) -> Dict[str, Any]:
-        """
-        Start a message workflow for existing blog
-
-        Args:
-            message_data: Message data matching the specified format
-
-        Returns:
-            Dict containing the workflow result
-        """
-        workflow_input = BlogWorkflowInput(
+    def _message_input(self, message_data: Dict[str, Any]) -> BlogWorkflowInput:
+        """Build the workflow input for a message on an existing blog"""
+        return BlogWorkflowInput(
             title=message_data["title"],
             description=message_data["description"],
             desired_tone=message_data["desired_tone"],
@@ -136,16 +416,94 @@ class TemporalClientManager:
             user_selected_context=message_data["user_selected_context"],
         )
 
-        return await self.start_blog_workflow(workflow_input)
+    async def start_blog_creation_workflow(self, blog_data: Dict[str, Any], idempotency_key: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Start a new blog creation workflow
+
+        Args:
+            blog_data: Blog creation data matching the specified format
+            idempotency_key: Optional client key, duplicates attach to the same workflow
+
+        Returns:
+            Dict containing the workflow result
+        """
+        return await self.start_blog_workflow(self._blog_creation_input(blog_data), idempotency_key)
+
+    async def start_message_workflow(self, message_data: Dict[str, Any], idempotency_key: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Start a message workflow for existing blog
+
+        Args:
+            message_data: Message data matching the specified format
+            idempotency_key: Optional client key, duplicates attach to the same workflow
 
-# Global instance for easy access
+        Returns:
+            Dict containing the workflow result
+        """
+        return await self.start_blog_workflow(self._message_input(message_data), idempotency_key)
+
+    async def submit_blog_creation_workflow(self, blog_data: Dict[str, Any], idempotency_key: Optional[str] = None) -> str:
+        """
+        Submit a new blog creation workflow without waiting for it
+
+        Args:
+            blog_data: Blog creation data matching the specified format
+            idempotency_key: Optional client key, duplicates attach to the same workflow
+
+        Returns:
+            ID of the started workflow
+        """
+        return await self.submit_blog_workflow(self._blog_creation_input(blog_data), idempotency_key)
+
+    async def submit_message_workflow(self, message_data: Dict[str, Any], idempotency_key: Optional[str] = None) -> str:
+        """
+        Submit a message workflow for existing blog without waiting for it
+
+        Args:
+            message_data: Message data matching the specified format
+            idempotency_key: Optional client key, duplicates attach to the same workflow
+
+        Returns:
+            ID of the started workflow
+        """
+        return await self.submit_blog_workflow(self._message_input(message_data), idempotency_key)
+
+# Global instance for easy access, shared by every router in the process
 temporal_client_manager = TemporalClientManager()
 
 # Helper functions for easy use
-async def start_blog_creation_workflow(blog_data: Dict[str, Any]) -> Dict[str, Any]:
+async def start_blog_creation_workflow(blog_data: Dict[str, Any], idempotency_key: Optional[str] = None) -> Dict[str, Any]:
     """Helper function to start blog creation workflow"""
-    return await temporal_client_manager.start_blog_creation_workflow(blog_data)
+    return await temporal_client_manager.start_blog_creation_workflow(blog_data, idempotency_key)
 
-async def start_message_workflow(message_data: Dict[str, Any]) -> Dict[str, Any]:
+async def start_message_workflow(message_data: Dict[str, Any], idempotency_key: Optional[str] = None) -> Dict[str, Any]:
     """Helper function to start message workflow"""
-    return await temporal_client_manager.start_message_workflow(message_data)
+    return await temporal_client_manager.start_message_workflow(message_data, idempotency_key)
+
+async def submit_blog_creation_workflow(blog_data: Dict[str, Any], idempotency_key: Optional[str] = None) -> str:
+    """Helper function to submit blog creation workflow"""
+    return await temporal_client_manager.submit_blog_creation_workflow(blog_data, idempotency_key)
+
+async def submit_message_workflow(message_data: Dict[str, Any], idempotency_key: Optional[str] = None) -> str:
+    """Helper function to submit message workflow"""
+    return await temporal_client_manager.submit_message_workflow(message_data, idempotency_key)
+
+async def send_blog_session_message(message_data: Dict[str, Any], revision: Optional[int], idempotency_key: Optional[str] = None) -> Dict[str, Any]:
+    """Helper function to send a message to a blog's session workflow"""
+    return await temporal_client_manager.send_blog_session_message(message_data, revision, idempotency_key)
+
+async def describe_blog_workflow(workflow_id: str) -> Dict[str, Any]:
+    """Helper function to describe a blog workflow"""
+    return await temporal_client_manager.describe_blog_workflow(workflow_id)
+
+async def get_blog_workflow_result(workflow_id: str) -> Dict[str, Any]:
+    """Helper function to fetch a blog workflow result"""
+    return await temporal_client_manager.get_blog_workflow_result(workflow_id)
+
+async def get_blog_workflow_progress(workflow_id: str, after: int = 0) -> WorkflowProgress:
+    """Helper function to query blog workflow progress"""
+    return await temporal_client_manager.get_blog_workflow_progress(workflow_id, after)
+
+def get_temporal_client_metrics() -> Dict[str, Any]:
+    """Helper function to read the client pool's connection metrics"""
+    return temporal_client_manager.get_metrics()
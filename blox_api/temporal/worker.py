@@ -2,6 +2,8 @@ from __future__ import annotations
 
 import asyncio
 import logging
+import os
+import signal
 import sys
 from datetime import timedelta
 from pathlib import Path
@@ -9,6 +11,9 @@ from pathlib import Path
 # Add the parent directory to Python path to enable imports from models
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+# Use the worker's database pool settings (see common/db_settings.py)
+os.environ.setdefault("DB_PROCESS_ROLE", "worker")
+
 # Configure logging for temporal workflows
 logging.getLogger("openai").setLevel(logging.ERROR)
 logging.getLogger("openai.agents").setLevel(logging.CRITICAL)
@@ -50,22 +55,61 @@ from temporalio.client import Client
 from temporalio.common import RetryPolicy
 from temporalio.contrib.openai_agents import OpenAIAgentsPlugin, ModelActivityParameters
 
-from temporalio.contrib.pydantic import pydantic_data_converter
 from temporalio.worker import Worker
 
 from modules.blog.workflow import BlogWorkflow
+from modules.blog.session_workflow import BlogSessionWorkflow
+from modules.probe.workflow import AutoscalerProbeWorkflow, probe_hold
+from modules.blog.constants import constants
+from temporal.client_settings import TemporalSettings
+from temporal.codec import PayloadCodecPlugin
+from temporal.worker_settings import WorkerRoleSettings, selected_roles
+from temporal.sandbox import build_workflow_runner, measure_first_activations, sample_inputs
+from modules.blog.draft_stream import DraftStreamingModelProvider
 from modules.blog.activities import web_search, get_blog_details, save_blog_content, save_messages, create_new_blog
 
+# Workflows and activities each role registers, the LLM role gets the model activity from OpenAIAgentsPlugin
+WORKFLOWS = [BlogWorkflow, BlogSessionWorkflow]
+# Synthetic load for the autoscaler, runs only when started by `autoscaler.py probe`
+PROBE_WORKFLOWS = [AutoscalerProbeWorkflow]
+SEARCH_ACTIVITIES = [web_search]
+DB_ACTIVITIES = [get_blog_details, save_blog_content, save_messages, create_new_blog]
+
+def build_worker(client: Client, role_settings: WorkerRoleSettings) -> Worker:
+    """Worker for one role, polling that role's task queue with the role's concurrency limits"""
+    role = role_settings.role
+    worker_kwargs = role_settings.worker_kwargs()
+
+    if role == "workflow":
+        # Only workflow tasks, the plugin's model activity is served by the llm role
+        return Worker(
+            client,
+            task_queue=constants.get("task_queue"),
+            workflows=WORKFLOWS + PROBE_WORKFLOWS,
+            # The probe's hold runs as a local activity, inside the workflow task
+            activities=[probe_hold],
+            workflow_runner=build_workflow_runner(),
+            no_remote_activities=True,
+            **worker_kwargs,
+        )
+    if role == "llm":
+        return Worker(client, task_queue=constants.get("llm_task_queue"), **worker_kwargs)
+    if role == "search":
+        return Worker(client, task_queue=constants.get("search_task_queue"), activities=SEARCH_ACTIVITIES, **worker_kwargs)
+    return Worker(client, task_queue=constants.get("db_task_queue"), activities=DB_ACTIVITIES, **worker_kwargs)
+
 async def main():
+    temporal_settings = TemporalSettings.from_env()
+    roles = selected_roles()
+    role_settings = [WorkerRoleSettings.from_env(role) for role in roles]
+
     # Log worker startup
     temporal_logger.info(
         "Starting Temporal Worker for Blog Workflow",
         extra={
             "worker_name": "BlogWorkflowWorker",
-            "task_queue": "openai-agents-task-queue",
-            "temporal_server": "localhost:7233",
-            "workflows": ["BlogWorkflow"],
-            "activities": ["web_search", "get_blog_details", "save_blog_content", "save_messages", "create_new_blog"],
+            "roles": list(roles),
+            "temporal_server": temporal_settings.address,
         },
     )
 
@@ -75,57 +119,81 @@ async def main():
             "Connecting to Temporal server",
             extra={
                 "worker_name": "BlogWorkflowWorker",
-                "server_address": "localhost:7233",
+                "server_address": temporal_settings.address,
             },
         )
 
-        client = await Client.connect(
-            "localhost:7233",
-            plugins=[
-                OpenAIAgentsPlugin(
-                    model_params=ModelActivityParameters(
-                        start_to_close_timeout=timedelta(seconds=90),
-                        # schedule_to_close_timeout=timedelta(seconds=500),
-                        retry_policy=RetryPolicy(
-                            backoff_coefficient=2.0,
-                            # initial_interval=timedelta(seconds=1),
-                            # maximum_interval=timedelta(seconds=5),
-                            maximum_attempts=2,
-                        ),
-                    )
+        agents_plugin = OpenAIAgentsPlugin(
+            # Streams partial blog drafts to the API while the model activity runs
+            model_provider=DraftStreamingModelProvider(),
+            model_params=ModelActivityParameters(
+                # Model calls go to the llm role's queue
+                task_queue=constants.get("llm_task_queue"),
+                start_to_close_timeout=timedelta(seconds=90),
+                # schedule_to_close_timeout=timedelta(seconds=500),
+                retry_policy=RetryPolicy(
+                    backoff_coefficient=2.0,
+                    # initial_interval=timedelta(seconds=1),
+                    # maximum_interval=timedelta(seconds=5),
+                    maximum_attempts=2,
                 ),
-            ],
-            data_converter=pydantic_data_converter,
+            )
         )
-
-        temporal_logger.info(
-            "Temporal client connected successfully",
-            extra={
-                "worker_name": "BlogWorkflowWorker",
-                "server_address": "localhost:7233",
-            },
-        )
-
-        worker = Worker(
-            client,
-            task_queue="openai-agents-task-queue",
-            workflows=[
-                BlogWorkflow
-            ],
-            activities=[web_search, get_blog_details, save_blog_content, save_messages, create_new_blog],
+        client = await Client.connect(
+            **temporal_settings.connect_kwargs(),
+            # The agents plugin replaces the data converter, the codec plugin adds the codec back on top
+            plugins=[agents_plugin, PayloadCodecPlugin()],
         )
 
         temporal_logger.info(
-            "Worker initialized and starting",
+            "Temporal client connected successfully",
             extra={
                 "worker_name": "BlogWorkflowWorker",
-                "task_queue": "openai-agents-task-queue",
-                "workflow_count": 1,
-                "activity_count": 5,
+                "server_address": temporal_settings.address,
             },
         )
 
-        await worker.run()
+        workers = [build_worker(client, settings) for settings in role_settings]
+
+        for worker, settings in zip(workers, role_settings):
+            if settings.role == "workflow":
+                # Warm start: pay the sandbox imports and run each workflow's first activation on
+                # the worker's own runner before polling, so real first activations don't. Fails
+                # startup if a workflow breaks the sandbox.
+                activations = await measure_first_activations(
+                    worker.config()["workflow_runner"],
+                    WORKFLOWS,
+                    sample_inputs(),
+                    client.data_converter,
+                    plugins=[agents_plugin],
+                    task_queue=worker.task_queue,
+                )
+                temporal_logger.info(
+                    "Workflows validated in sandbox",
+                    extra={
+                        "worker_name": "BlogWorkflowWorker",
+                        "first_activation_ms": activations,
+                    },
+                )
+
+            temporal_logger.info(
+                "Worker initialized and starting",
+                extra={
+                    "worker_name": "BlogWorkflowWorker",
+                    "role": settings.role,
+                    "task_queue": worker.task_queue,
+                    "max_concurrent_activities": settings.max_concurrent_activities,
+                    "max_concurrent_workflow_tasks": settings.max_concurrent_workflow_tasks,
+                    "max_cached_workflows": settings.max_cached_workflows if settings.role == "workflow" else None,
+                },
+            )
+
+        # The launcher stops workers with SIGTERM, stop polling and let in-flight tasks finish
+        loop = asyncio.get_running_loop()
+        for signum in (signal.SIGTERM, signal.SIGINT):
+            loop.add_signal_handler(signum, lambda: [asyncio.ensure_future(worker.shutdown()) for worker in workers])
+
+        await asyncio.gather(*(worker.run() for worker in workers))
 
     except Exception as e:
         temporal_logger.error(
@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import Any, Dict, Optional
+
+# Workload classes, each polls its own task queue (see temporal/worker.py)
+WORKER_ROLES = ("workflow", "llm", "search", "db")
+
+# Defaults per role: LLM calls are slow and bound by provider rate limits, searches are
+# moderate, DB activities are quick but shouldn't outgrow the worker's connection pool
+_ROLE_DEFAULTS: Dict[str, Dict[str, int]] = {
+    "workflow": {"processes": 1, "max_concurrent_activities": 0, "max_concurrent_workflow_tasks": 100},
+    "llm": {"processes": 1, "max_concurrent_activities": 16, "max_concurrent_workflow_tasks": 0},
+    "search": {"processes": 1, "max_concurrent_activities": 8, "max_concurrent_workflow_tasks": 0},
+    "db": {"processes": 1, "max_concurrent_activities": 20, "max_concurrent_workflow_tasks": 0},
+}
+
+def _env_int(role: str, name: str) -> int:
+    return int(os.getenv(f"WORKER_{role.upper()}_{name.upper()}", str(_ROLE_DEFAULTS[role][name])))
+
+@dataclass
+class WorkerRoleSettings:
+    """Concurrency and process count of one worker role"""
+    role: str
+    # Processes the launcher starts for this role
+    processes: int
+    # 0 for roles that don't run activities / workflows
+    max_concurrent_activities: int
+    max_concurrent_workflow_tasks: int
+    # Time in-flight activities get to finish after SIGTERM
+    graceful_shutdown_seconds: float
+    # Sticky cache: runs kept in memory between activations. An evicted run is replayed from
+    # history in a new sandbox on its next activation, size it to the runs open at a time.
+    max_cached_workflows: int
+    sticky_schedule_to_start_seconds: float
+
+    @classmethod
+    def from_env(cls, role: str) -> "WorkerRoleSettings":
+        if role not in WORKER_ROLES:
+            raise ValueError(f"Unknown worker role {role!r}, expected one of {', '.join(WORKER_ROLES)}")
+        return cls(
+            role=role,
+            processes=max(0, _env_int(role, "processes")),
+            max_concurrent_activities=_env_int(role, "max_concurrent_activities"),
+            max_concurrent_workflow_tasks=_env_int(role, "max_concurrent_workflow_tasks"),
+            graceful_shutdown_seconds=float(os.getenv("WORKER_SHUTDOWN_GRACE_SECONDS", "30")),
+            max_cached_workflows=int(os.getenv("WORKER_MAX_CACHED_WORKFLOWS", "1000")),
+            sticky_schedule_to_start_seconds=float(os.getenv("WORKER_STICKY_SCHEDULE_TO_START_SECONDS", "10")),
+        )
+
+    def worker_kwargs(self) -> Dict[str, Any]:
+        """Keyword arguments for Worker limiting its concurrency"""
+        kwargs: Dict[str, Any] = {"graceful_shutdown_timeout": timedelta(seconds=self.graceful_shutdown_seconds)}
+        if self.max_concurrent_activities:
+            kwargs["max_concurrent_activities"] = self.max_concurrent_activities
+        if self.max_concurrent_workflow_tasks:
+            kwargs["max_concurrent_workflow_tasks"] = self.max_concurrent_workflow_tasks
+        if self.role == "workflow":
+            kwargs["max_cached_workflows"] = self.max_cached_workflows
+            kwargs["sticky_queue_schedule_to_start_timeout"] = timedelta(seconds=self.sticky_schedule_to_start_seconds)
+        return kwargs
+
+def selected_roles(value: Optional[str] = None) -> tuple[str, ...]:
+    """
+    Roles from a comma separated list (WORKER_ROLES env by default). "all" runs every role
+    in one process, which is the default for local development.
+    """
+    value = value if value is not None else os.getenv("WORKER_ROLES", "all")
+    if value.strip() == "all":
+        return WORKER_ROLES
+    roles = tuple(role.strip() for role in value.split(",") if role.strip())
+    for role in roles:
+        if role not in WORKER_ROLES:
+            raise ValueError(f"Unknown worker role {role!r}, expected one of {', '.join(WORKER_ROLES)} or all")
+    return roles
@@ -0,0 +1,29 @@
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+
+@pytest.fixture(scope="session")
+def db_engine():
+    """
+    Sync engine of the database configured by the DB_* env vars, migrated to head.
+    Tests using it are skipped when no database is reachable.
+    """
+    from common.db import engine
+    from common.migrations import upgrade
+
+    try:
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+    except DBAPIError as e:
+        pytest.skip(f"No database reachable: {e.orig}")
+    upgrade(engine)
+    return engine
+
+@pytest.fixture
+def client():
+    """API test client over https, so the secure session cookie is sent back"""
+    from fastapi.testclient import TestClient
+    from main import app
+
+    # Not entered as a context manager: the startup hooks connect to Temporal
+    return TestClient(app, base_url="https://testserver")
@@ -0,0 +1,58 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from jose import jwt
+from sqlmodel import Session
+
+from common.auth import ALGORITHM, SECRET_KEY
+from models.blog import Blog
+from models.checkpoint import Checkpoint
+from models.message import Message
+from models.user import User
+
+def _access_token(user_id: int) -> str:
+    now = datetime.now(timezone.utc)
+    return jwt.encode({"sub": str(user_id), "iat": now, "exp": now + timedelta(minutes=30)}, SECRET_KEY, algorithm=ALGORITHM)
+
+@pytest.fixture
+def message(db_engine, client):
+    """First message of a blog without content or revisions, with the client logged in as its owner"""
+    with Session(db_engine) as session:
+        user = User(username="checkpoint-test", email="checkpoint-test@example.com", password="-")
+        blog = Blog(title="Checkpoint test", content=None, user=user)
+        message = Message(user_message="Write it", ai_message="Sure", sequence=1, blog=blog)
+        session.add(message)
+        session.commit()
+        session.refresh(message)
+        session.refresh(user)
+        client.cookies.set("access_token", _access_token(user.id))
+        yield message
+        session.delete(user)
+        session.commit()
+
+def test_checkpoint_of_blog_without_content(client, message):
+    response = client.post(f"/blogs/checkpoint/{message.id}")
+    assert response.status_code == 200
+    checkpoint_id = response.json()["id"]
+    assert response.json()["revision_number"] == 1
+
+    response = client.get(f"/blogs/checkpoint/{checkpoint_id}")
+    assert response.status_code == 200
+    assert response.json()["content"] == ""
+
+    response = client.post(f"/blogs/checkpoint/{checkpoint_id}/restore")
+    assert response.status_code == 200
+    assert response.json()["content"] == ""
+
+def test_checkpoint_without_revision_is_a_conflict(db_engine, client, message):
+    with Session(db_engine) as session:
+        checkpoint = Checkpoint(blog_id=message.blog_id, revision_number=0)
+        session.add(checkpoint)
+        session.commit()
+        session.refresh(checkpoint)
+        checkpoint_id = checkpoint.id
+        session.get(Message, message.id).checkpoint_id = checkpoint_id
+        session.commit()
+
+    assert client.get(f"/blogs/checkpoint/{checkpoint_id}").status_code == 409
+    assert client.post(f"/blogs/checkpoint/{checkpoint_id}/restore").status_code == 409
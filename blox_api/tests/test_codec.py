@@ -0,0 +1,41 @@
+import asyncio
+import os
+import time
+from datetime import timedelta
+
+from sqlalchemy import text
+
+from temporal.codec import FilesystemBlobStore, PostgresBlobStore, collect_expired_blobs
+
+RETENTION = timedelta(days=30)
+
+def test_filesystem_gc_keeps_blobs_written_within_retention(tmp_path):
+    store = FilesystemBlobStore(str(tmp_path))
+    asyncio.run(store.put("aa-expired", b"old"))
+    asyncio.run(store.put("bb-rewritten", b"old, written again"))
+    expired = time.time() - RETENTION.total_seconds() - 60
+    for key in ("aa-expired", "bb-rewritten"):
+        os.utime(store._path(key), (expired, expired))
+    asyncio.run(store.put("bb-rewritten", b"old, written again"))
+
+    assert asyncio.run(collect_expired_blobs(store, RETENTION)) == 1
+    assert not store._path("aa-expired").exists()
+    assert asyncio.run(store.get("bb-rewritten")) == b"old, written again"
+
+def test_postgres_gc_keeps_blobs_written_within_retention(db_engine):
+    with db_engine.begin() as conn:
+        conn.execute(text("DELETE FROM payload_blobs WHERE key IN ('gc-expired', 'gc-rewritten')"))
+        conn.execute(text(
+            "INSERT INTO payload_blobs (key, data, created_at) VALUES "
+            "('gc-expired', 'old', now() - interval '31 days'), ('gc-rewritten', 'old', now() - interval '31 days')"
+        ))
+
+    async def put_and_collect():
+        store = PostgresBlobStore()
+        await store.put("gc-rewritten", b"old")
+        return await collect_expired_blobs(store, RETENTION)
+
+    assert asyncio.run(put_and_collect()) >= 1
+    with db_engine.connect() as conn:
+        keys = conn.execute(text("SELECT key FROM payload_blobs WHERE key IN ('gc-expired', 'gc-rewritten')")).scalars().all()
+    assert keys == ["gc-rewritten"]
@@ -0,0 +1,87 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from jose import jwt
+from sqlmodel import Session
+
+from common.auth import ALGORITHM, SECRET_KEY
+from models.blog import Blog
+from models.checkpoint import Checkpoint
+from models.user import User
+
+# Large enough to be compressed
+CONTENT = "Hello conditional requests. " * 200
+
+@pytest.fixture
+def blog(db_engine):
+    with Session(db_engine) as session:
+        user = User(username="etag-test", email="etag-test@example.com", password="-")
+        blog = Blog(title="ETag test", content=CONTENT, user=user)
+        session.add(blog)
+        session.commit()
+        session.refresh(blog)
+        yield blog
+        session.delete(user)
+        session.commit()
+
+@pytest.fixture
+def checkpoint(db_engine, blog):
+    with Session(db_engine) as session:
+        checkpoint = Checkpoint(blog_id=blog.id, content=CONTENT)
+        session.add(checkpoint)
+        session.commit()
+        session.refresh(checkpoint)
+        return checkpoint
+
+def _token_due_for_refresh(user_id: int) -> str:
+    now = datetime.now(timezone.utc)
+    return jwt.encode(
+        {"sub": str(user_id), "iat": now - timedelta(minutes=25), "exp": now + timedelta(minutes=5)},
+        SECRET_KEY,
+        algorithm=ALGORITHM,
+    )
+
+def test_not_modified_carries_refreshed_cookie(client, blog):
+    token = _token_due_for_refresh(blog.user_id)
+
+    client.cookies.set("access_token", token)
+    response = client.get(f"/blogs/{blog.id}")
+    assert response.status_code == 200
+    assert "access_token=" in response.headers["set-cookie"]
+    etag = response.headers["etag"]
+
+    # Revalidate with the same, still unrefreshed token
+    client.cookies.clear()
+    client.cookies.set("access_token", token)
+    response = client.get(f"/blogs/{blog.id}", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.headers["etag"] == etag
+    assert "access_token=" in response.headers["set-cookie"]
+
+def test_compressed_response_has_weak_etag(client, blog):
+    client.cookies.set("access_token", _token_due_for_refresh(blog.user_id))
+    response = client.get(f"/blogs/{blog.id}", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    etag = response.headers["etag"]
+    assert etag.startswith("W/")
+
+    response = client.get(f"/blogs/{blog.id}", headers={"Accept-Encoding": "gzip", "If-None-Match": etag})
+    assert response.status_code == 304
+
+def test_checkpoint_encodings_have_their_own_etag(client, blog, checkpoint):
+    client.cookies.set("access_token", _token_due_for_refresh(blog.user_id))
+    etags = {}
+    for encoding in ("gzip", "identity"):
+        response = client.get(f"/blogs/checkpoint/{checkpoint.id}", headers={"Accept-Encoding": encoding})
+        assert response.status_code == 200
+        assert response.json()["content"] == CONTENT
+        etags[encoding] = response.headers["etag"]
+    assert etags["gzip"] == etags["identity"][:-1] + '-gzip"'
+
+    # Each variant revalidates with its own ETag only
+    for encoding, etag in etags.items():
+        response = client.get(f"/blogs/checkpoint/{checkpoint.id}", headers={"Accept-Encoding": encoding, "If-None-Match": etag})
+        assert response.status_code == 304
+        assert response.headers["etag"] == etag
+    response = client.get(f"/blogs/checkpoint/{checkpoint.id}", headers={"Accept-Encoding": "identity", "If-None-Match": etags["gzip"]})
+    assert response.status_code == 200
@@ -0,0 +1,16 @@
+import pytest
+
+from common.import_budget import IMPORT_BUDGET_MS, api_import_ms, measure_imports, worker_only_imports
+
+@pytest.fixture(scope="module")
+def api_import_timings():
+    # Fresh interpreter importing the API entry modules, see common/import_budget.py
+    return measure_imports()
+
+def test_api_does_not_import_worker_modules(api_import_timings):
+    assert worker_only_imports(api_import_timings) == []
+
+def test_api_import_time_within_budget(api_import_timings):
+    # Wall clock, set IMPORT_BUDGET_MS for slower machines
+    total_ms = api_import_ms(api_import_timings)
+    assert total_ms <= IMPORT_BUDGET_MS, f"API imports take {total_ms:.0f} ms, budget is {IMPORT_BUDGET_MS:.0f} ms"
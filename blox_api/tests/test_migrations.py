@@ -0,0 +1,12 @@
+import pytest
+
+from common.migrations import HOT_QUERY_PLANS, verify_hot_query_plans
+
+@pytest.fixture(scope="module")
+def query_plans(db_engine):
+    return {name: (uses_index, plan) for name, uses_index, plan in verify_hot_query_plans(db_engine)}
+
+@pytest.mark.parametrize("name,index_name", [(name, index_name) for name, _, index_name in HOT_QUERY_PLANS])
+def test_hot_query_uses_index(query_plans, name, index_name):
+    uses_index, plan = query_plans[name]
+    assert uses_index, f"{name} doesn't use {index_name}:\n{plan}"
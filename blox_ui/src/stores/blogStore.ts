@@ -28,10 +28,25 @@ interface BlogDataResponse {
   blog_length_max: number;
   content: string;
   messages: MessageResponse[];
+  messages_cursor?: number | null;
   created_at: string;
   updated_at: string;
 }
 
+interface MessagePageResponse {
+  messages: MessageResponse[];
+  next_cursor?: number | null;
+}
+
+interface RestoreCheckpointResponse {
+  blog_id: number;
+  content: string | null;
+  content_hash: string;
+  updated_at: string;
+  deleted_message_ids: number[];
+  deleted_checkpoint_ids: number[];
+}
+
 interface Checkpoint {
   id: number;
   content: string;
@@ -110,14 +125,42 @@ interface BlogStore {
   createBlog: (client: AxiosInstance, data: CreateBlogRequest) => Promise<BlogDataResponse>;
   listBlogs: (client: AxiosInstance) => Promise<BlogSummary[]>;
   getBlog: (client: AxiosInstance, blogId: number) => Promise<BlogDataResponse>;
+  loadOlderMessages: (client: AxiosInstance, blogId: number, cursor: number) => Promise<void>;
   updateBlog: (client: AxiosInstance, blogId: number, data: UpdateBlogRequest) => Promise<BlogDataResponse>;
   sendMessage: (client: AxiosInstance, data: SendMessageRequest) => Promise<BlogDataResponse>;
   createCheckpoint: (client: AxiosInstance, messageId: number) => Promise<Checkpoint>;
   getCheckpoint: (client: AxiosInstance, checkpointId: number) => Promise<Checkpoint>;
-  restoreCheckpoint: (client: AxiosInstance, checkpointId: number) => Promise<BlogDataResponse>;
+  restoreCheckpoint: (client: AxiosInstance, checkpointId: number) => Promise<RestoreCheckpointResponse>;
   deleteCheckpoint: (client: AxiosInstance, checkpointId: number) => Promise<void>;
 }
 
+// Page size of GET /blogs/ (the API allows up to 200)
+const BLOG_PAGE_SIZE = 100;
+// Page size of GET /blogs/{id}/messages (the API allows up to 100)
+const MESSAGE_PAGE_SIZE = 100;
+
+// Convert API messages to UI format
+const toUiMessages = (messages: MessageResponse[]): MessageInterface[] =>
+  messages.map((msg) => ({
+    message: msg.message,
+    time: new Date(msg.timestamp).toLocaleTimeString([], { hour: '2-digit', minute: '2-digit' }),
+    type: msg.role === 'user' ? 'sent' : 'received',
+    checkpointId: msg.checkpoint_id,
+    messageId: parseInt(msg.id.split('_')[1]) || undefined,
+  }));
+
+// Extract checkpoints from messages
+const toCheckpoints = (messages: MessageResponse[], blogId: number): Checkpoint[] =>
+  messages
+    .filter((msg) => msg.checkpoint_id)
+    .map((msg) => ({
+      id: msg.checkpoint_id!,
+      content: '', // Will be fetched separately if needed
+      created_at: msg.timestamp,
+      updated_at: msg.timestamp,
+      blog_id: blogId,
+    }));
+
 export const useBlogStore = create<BlogStore>((set, get) => ({
   // State
   blogs: [],
@@ -199,9 +242,16 @@ export const useBlogStore = create<BlogStore>((set, get) => ({
 
   listBlogs: async (client) => {
     try {
-      const response = await client.get('/blogs/');
-      const blogs = response.data;
-      set({ blogs });
+      // Keyset-paginated, follow X-Next-Cursor until the last page so the sidebar lists every blog
+      let blogs: BlogSummary[] = [];
+      let cursor: string | undefined;
+      do {
+        const response = await client.get('/blogs/', { params: { limit: BLOG_PAGE_SIZE, cursor } });
+        blogs = [...blogs, ...response.data];
+        set({ blogs });
+        const nextCursor = response.headers['x-next-cursor'];
+        cursor = typeof nextCursor === 'string' && nextCursor ? nextCursor : undefined;
+      } while (cursor);
       return blogs;
     } catch (error: any) {
       throw new Error(error.response?.data?.detail || 'Failed to fetch blogs');
@@ -212,36 +262,24 @@ export const useBlogStore = create<BlogStore>((set, get) => ({
     try {
       set({ blogLoading: true, chatLoading: true });
       const response = await client.get(`/blogs/${blogId}`);
-      const blogData = response.data;
-      
-      // Convert API messages to UI format
-      const uiMessages: MessageInterface[] = blogData.messages.map((msg: MessageResponse) => ({
-        message: msg.message,
-        time: new Date(msg.timestamp).toLocaleTimeString([], { hour: '2-digit', minute: '2-digit' }),
-        type: msg.role === 'user' ? 'sent' : 'received',
-        checkpointId: msg.checkpoint_id,
-        messageId: parseInt(msg.id.split('_')[1]) || undefined,
-      }));
-      
-      // Extract checkpoints from messages
-      const checkpoints: Checkpoint[] = blogData.messages
-        .filter((msg: MessageResponse) => msg.checkpoint_id)
-        .map((msg: MessageResponse) => ({
-          id: msg.checkpoint_id!,
-          content: '', // Will be fetched separately if needed
-          created_at: msg.timestamp,
-          updated_at: msg.timestamp,
-          blog_id: blogData.id,
-        }));
-      
+      const blogData: BlogDataResponse = response.data;
+
+      // Only the latest page of messages comes with the blog
       set({
         currentBlog: blogData,
         markdown: blogData.content,
         activeBlogId: blogData.id.toString(),
-        messages: uiMessages,
-        checkpoints,
+        messages: toUiMessages(blogData.messages),
+        checkpoints: toCheckpoints(blogData.messages, blogData.id),
       });
-      
+
+      // Older history loads in the background, the blog is usable meanwhile
+      if (blogData.messages_cursor != null) {
+        get()
+          .loadOlderMessages(client, blogData.id, blogData.messages_cursor)
+          .catch((error) => console.error('Failed to load older messages:', error));
+      }
+
       return blogData;
     } catch (error: any) {
       throw new Error(error.response?.data?.detail || 'Failed to fetch blog');
@@ -250,6 +288,24 @@ export const useBlogStore = create<BlogStore>((set, get) => ({
     }
   },
 
+  loadOlderMessages: async (client, blogId, cursor) => {
+    let before: number | null | undefined = cursor;
+    while (before != null) {
+      const response = await client.get(`/blogs/${blogId}/messages`, {
+        params: { before, limit: MESSAGE_PAGE_SIZE },
+      });
+      const page: MessagePageResponse = response.data;
+
+      // Stop if another blog was opened meanwhile
+      if (get().activeBlogId !== blogId.toString()) return;
+      set((state) => ({
+        messages: [...toUiMessages(page.messages), ...state.messages],
+        checkpoints: [...toCheckpoints(page.messages, blogId), ...state.checkpoints],
+      }));
+      before = page.next_cursor;
+    }
+  },
+
   updateBlog: async (client, blogId, data) => {
     try {
       set({ workingOnBlog: true });
@@ -351,37 +407,29 @@ export const useBlogStore = create<BlogStore>((set, get) => ({
     try {
       set({ workingOnBlog: true });
       const response = await client.post(`/blogs/checkpoint/${checkpointId}/restore`);
-      const blogData = response.data;
-      
-      // Convert API messages to UI format
-      const uiMessages: MessageInterface[] = blogData.messages.map((msg: MessageResponse) => ({
-        message: msg.message,
-        time: new Date(msg.timestamp).toLocaleTimeString([], { hour: '2-digit', minute: '2-digit' }),
-        type: msg.role === 'user' ? 'sent' : 'received',
-        checkpointId: msg.checkpoint_id,
-        messageId: parseInt(msg.id.split('_')[1]) || undefined,
-      }));
-      
-      // Extract checkpoints from messages
-      const checkpoints: Checkpoint[] = blogData.messages
-        .filter((msg: MessageResponse) => msg.checkpoint_id)
-        .map((msg: MessageResponse) => ({
-          id: msg.checkpoint_id!,
-          content: '', // Will be fetched separately if needed
-          created_at: msg.timestamp,
-          updated_at: msg.timestamp,
-          blog_id: blogData.id,
-        }));
-      
+      const restoreData: RestoreCheckpointResponse = response.data;
+
+      // Drop the conversation after the restored checkpoint's message
+      const currentMessages = get().messages;
+      const restoredIndex = currentMessages.findIndex((msg) => msg.checkpointId === checkpointId);
+      const uiMessages = restoredIndex >= 0 ? currentMessages.slice(0, restoredIndex + 1) : currentMessages;
+
+      const checkpoints = get().checkpoints.filter(
+        (cp) => !restoreData.deleted_checkpoint_ids.includes(cp.id)
+      );
+      const currentBlog = get().currentBlog;
+
       set({
-        currentBlog: blogData,
-        markdown: blogData.content,
+        currentBlog: currentBlog
+          ? { ...currentBlog, content: restoreData.content ?? '', updated_at: restoreData.updated_at }
+          : currentBlog,
+        markdown: restoreData.content ?? '',
         messages: uiMessages,
         checkpoints,
         workingOnBlog: false,
       });
-      
-      return blogData;
+
+      return restoreData;
     } catch (error: any) {
       set({ workingOnBlog: false });
       throw new Error(error.response?.data?.detail || 'Failed to restore checkpoint');